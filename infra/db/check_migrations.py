@@ -13,6 +13,7 @@ REQUIRED_TABLES: set[str] = {
     "execution",
     "position",
     "pnl_minute",
+    "pnl_rollup",
     "model_artifact",
     "config",
     "alert",
@@ -45,6 +46,16 @@ def main() -> None:
         assert "fk_order__account" in fks
         assert "fk_order__instrument" in fks
 
+        # order.signal_id -> partitioned signal is enforced by constraint triggers
+        cur.execute(
+            "SELECT tgname FROM pg_trigger "
+            "WHERE tgname IN ('trg_order__signal_ref', 'trg_signal__order_ref')"
+        )
+        assert {row[0] for row in cur.fetchall()} == {
+            "trg_order__signal_ref",
+            "trg_signal__order_ref",
+        }
+
         cur.execute(
             """
             SELECT constraint_name FROM information_schema.table_constraints
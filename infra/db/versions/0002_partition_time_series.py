@@ -0,0 +1,232 @@
+"""Range-partition signal, pnl_minute and audit_event by ts.
+
+Each table is rebuilt as a partitioned parent with a DEFAULT partition plus the current
+(and next few) periods; existing rows are copied over. Indexes, foreign keys and the audit
+triggers are defined on the parent, so Postgres clones them onto every partition.
+Ongoing creation/expiry of partitions lives in packages/common/db/partitions.py.
+
+Postgres requires unique constraints on a partitioned table to include the partition key:
+primary keys become (id, ts) and uq_audit_event__hash becomes (hash, ts). execution stays
+a plain table so uq_execution__trade_id keeps fills unique by trade_id alone.
+
+fk_order__signal cannot reference a partitioned signal table by id alone, and a foreign
+key to (id, ts) would stop expired signal partitions from being dropped. It is replaced by
+constraint triggers with the same rule: an order's signal_id must name an existing signal
+(locked FOR KEY SHARE while the order is written) and a referenced signal cannot be
+deleted. Dropping an expired partition fires no row triggers, so retention still applies.
+"""
+
+from datetime import UTC, date, datetime, timedelta
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0002_partition_time_series"
+down_revision = "0001_baseline_schema"
+branch_labels = None
+depends_on = None
+
+# table -> (interval, sequence or None, constraints/indexes for the partitioned layout)
+TABLES = {
+    "signal": (
+        "day",
+        None,
+        [
+            "ALTER TABLE signal ADD CONSTRAINT signal_pkey PRIMARY KEY (id, ts)",
+            "ALTER TABLE signal ADD CONSTRAINT fk_signal__instrument "
+            "FOREIGN KEY (instrument_id) REFERENCES instrument (id)",
+            "ALTER TABLE signal ADD CONSTRAINT fk_signal__model_artifact "
+            "FOREIGN KEY (model_artifact_id) REFERENCES model_artifact (id)",
+            "CREATE INDEX ix_signal__instrument_id_ts_desc ON signal (instrument_id, ts DESC)",
+            "CREATE INDEX ix_signal__ts_desc ON signal (ts DESC)",
+        ],
+    ),
+    "pnl_minute": (
+        "day",
+        "pnl_minute_id_seq",
+        [
+            "ALTER TABLE pnl_minute ADD CONSTRAINT pnl_minute_pkey PRIMARY KEY (id, ts)",
+            "ALTER TABLE pnl_minute ADD CONSTRAINT uq_pnl_minute__ts_instrument_id "
+            "UNIQUE (ts, instrument_id)",
+            "ALTER TABLE pnl_minute ADD CONSTRAINT fk_pnl_minute__instrument "
+            "FOREIGN KEY (instrument_id) REFERENCES instrument (id)",
+            "CREATE INDEX ix_pnl_minute__ts ON pnl_minute (ts)",
+            "CREATE INDEX ix_pnl_minute__instrument_id_ts ON pnl_minute (instrument_id, ts)",
+        ],
+    ),
+    "audit_event": (
+        "month",
+        "audit_event_id_seq",
+        [
+            "ALTER TABLE audit_event ADD CONSTRAINT audit_event_pkey PRIMARY KEY (id, ts)",
+            "ALTER TABLE audit_event ADD CONSTRAINT uq_audit_event__hash UNIQUE (hash, ts)",
+            "ALTER TABLE audit_event ADD CONSTRAINT fk_audit_event__account "
+            "FOREIGN KEY (actor_id) REFERENCES account (id)",
+            "CREATE INDEX ix_audit_event__ts_desc ON audit_event (ts DESC)",
+            "CREATE INDEX ix_audit_event__entity_type_entity_id_ts_desc "
+            "ON audit_event (entity_type, entity_id, ts DESC)",
+        ],
+    ),
+}
+
+# The baseline (unpartitioned) definitions, restored on downgrade.
+BASELINE = {
+    "signal": [
+        "ALTER TABLE signal ADD CONSTRAINT signal_pkey PRIMARY KEY (id)",
+        "ALTER TABLE signal ADD CONSTRAINT fk_signal__instrument "
+        "FOREIGN KEY (instrument_id) REFERENCES instrument (id)",
+        "ALTER TABLE signal ADD CONSTRAINT fk_signal__model_artifact "
+        "FOREIGN KEY (model_artifact_id) REFERENCES model_artifact (id)",
+        "CREATE INDEX ix_signal__instrument_id_ts_desc ON signal (instrument_id, ts DESC)",
+        "CREATE INDEX ix_signal__ts_desc ON signal (ts DESC)",
+    ],
+    "pnl_minute": [
+        "ALTER TABLE pnl_minute ADD CONSTRAINT pnl_minute_pkey PRIMARY KEY (id)",
+        "ALTER TABLE pnl_minute ADD CONSTRAINT uq_pnl_minute__ts_instrument_id "
+        "UNIQUE (ts, instrument_id)",
+        "ALTER TABLE pnl_minute ADD CONSTRAINT fk_pnl_minute__instrument "
+        "FOREIGN KEY (instrument_id) REFERENCES instrument (id)",
+        "CREATE INDEX ix_pnl_minute__ts ON pnl_minute (ts)",
+        "CREATE INDEX ix_pnl_minute__instrument_id_ts ON pnl_minute (instrument_id, ts)",
+    ],
+    "audit_event": [
+        "ALTER TABLE audit_event ADD CONSTRAINT audit_event_pkey PRIMARY KEY (id)",
+        "ALTER TABLE audit_event ADD CONSTRAINT uq_audit_event__hash UNIQUE (hash)",
+        "ALTER TABLE audit_event ADD CONSTRAINT fk_audit_event__account "
+        "FOREIGN KEY (actor_id) REFERENCES account (id)",
+        "CREATE INDEX ix_audit_event__ts_desc ON audit_event (ts DESC)",
+        "CREATE INDEX ix_audit_event__entity_type_entity_id_ts_desc "
+        "ON audit_event (entity_type, entity_id, ts DESC)",
+    ],
+}
+
+AUDIT_TRIGGERS = [
+    """
+    CREATE TRIGGER trg_audit_event_no_change
+    BEFORE UPDATE OR DELETE ON audit_event
+    FOR EACH ROW EXECUTE FUNCTION audit_raise_on_change();
+    """,
+    """
+    CREATE TRIGGER trg_audit_event_compute_hash
+    BEFORE INSERT ON audit_event
+    FOR EACH ROW EXECUTE FUNCTION audit_compute_hash();
+    """,
+]
+
+# order.signal_id -> signal.id, checked from both sides (see module docstring).
+SIGNAL_REF_FNS = [
+    r"""
+    CREATE OR REPLACE FUNCTION order_check_signal() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF NEW.signal_id IS NOT NULL THEN
+            PERFORM 1 FROM signal WHERE id = NEW.signal_id FOR KEY SHARE;
+            IF NOT FOUND THEN
+                RAISE EXCEPTION 'insert or update on table "order" violates fk_order__signal'
+                    USING ERRCODE = 'foreign_key_violation',
+                          DETAIL = format('Key (signal_id)=(%s) is not present in table "signal".',
+                                          NEW.signal_id);
+            END IF;
+        END IF;
+        RETURN NULL;
+    END;
+    $$;
+    """,
+    r"""
+    CREATE OR REPLACE FUNCTION signal_check_order() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF EXISTS (SELECT 1 FROM "order" WHERE signal_id = OLD.id)
+           AND NOT EXISTS (SELECT 1 FROM signal WHERE id = OLD.id) THEN
+            RAISE EXCEPTION 'update or delete on table "signal" violates fk_order__signal'
+                USING ERRCODE = 'foreign_key_violation',
+                      DETAIL = format('Key (id)=(%s) is still referenced from table "order".',
+                                      OLD.id);
+        END IF;
+        RETURN NULL;
+    END;
+    $$;
+    """,
+]
+
+SIGNAL_REF_TRIGGERS = [
+    """
+    CREATE CONSTRAINT TRIGGER trg_order__signal_ref
+    AFTER INSERT OR UPDATE OF signal_id ON "order"
+    FOR EACH ROW EXECUTE FUNCTION order_check_signal();
+    """,
+    """
+    CREATE CONSTRAINT TRIGGER trg_signal__order_ref
+    AFTER UPDATE OF id OR DELETE ON signal
+    FOR EACH ROW EXECUTE FUNCTION signal_check_order();
+    """,
+]
+
+PREMAKE = {"day": 7, "month": 1}  # future periods created up front
+
+
+def _periods(interval: str, today: date) -> list[tuple[str, date, date]]:
+    """(name suffix, start, end) for today's period and the PREMAKE following ones."""
+    out = []
+    if interval == "day":
+        for i in range(PREMAKE["day"] + 1):
+            start = today + timedelta(days=i)
+            out.append((start.strftime("%Y%m%d"), start, start + timedelta(days=1)))
+    else:
+        start = today.replace(day=1)
+        for _ in range(PREMAKE["month"] + 1):
+            end = (start + timedelta(days=32)).replace(day=1)
+            out.append((start.strftime("%Y%m"), start, end))
+            start = end
+    return out
+
+
+def _rebuild(table: str, ddl: list[str], partitioned: bool) -> None:
+    interval, sequence, _ = TABLES[table]
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+    suffix = " PARTITION BY RANGE (ts)" if partitioned else ""
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {table}_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS)" + suffix
+    )
+    if partitioned:
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        for name, start, end in _periods(interval, datetime.now(UTC).date()):
+            op.execute(
+                f"CREATE TABLE {table}_p{name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start} 00:00:00+00') TO ('{end} 00:00:00+00')"
+            )
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_old")
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+    op.execute(f"DROP TABLE {table}_old")
+    for stmt in ddl:
+        op.execute(stmt)
+
+
+def upgrade() -> None:
+    op.execute('ALTER TABLE "order" DROP CONSTRAINT IF EXISTS fk_order__signal')
+    for table, (_, _, ddl) in TABLES.items():
+        _rebuild(table, ddl, partitioned=True)
+    for trigger in AUDIT_TRIGGERS:
+        op.execute(trigger)
+    op.execute(
+        'CREATE INDEX ix_order__signal_id ON "order" (signal_id) WHERE signal_id IS NOT NULL'
+    )
+    for stmt in SIGNAL_REF_FNS + SIGNAL_REF_TRIGGERS:
+        op.execute(stmt)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_signal__order_ref ON signal")
+    op.execute('DROP TRIGGER IF EXISTS trg_order__signal_ref ON "order"')
+    op.execute("DROP FUNCTION IF EXISTS signal_check_order()")
+    op.execute("DROP FUNCTION IF EXISTS order_check_signal()")
+    op.execute("DROP INDEX IF EXISTS ix_order__signal_id")
+    for table, ddl in BASELINE.items():
+        _rebuild(table, ddl, partitioned=False)
+    for trigger in AUDIT_TRIGGERS:
+        op.execute(trigger)
+    op.execute(
+        'ALTER TABLE "order" ADD CONSTRAINT fk_order__signal '
+        "FOREIGN KEY (signal_id) REFERENCES signal (id)"
+    )
@@ -0,0 +1,71 @@
+"""NOTIFY on config and instrument changes for in-process cache invalidation.
+
+Every committed INSERT/UPDATE/DELETE on config or instrument sends a JSON payload on the
+`vt_cache_invalidate` channel: {"table": ..., "keys": [...]}, where keys are the cache
+keys touched (config.key, instrument.symbol; old and new value on UPDATE). TRUNCATE sends
+"keys": null, meaning "drop everything cached for this table".
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0003_cache_invalidation_notify"
+down_revision = "0002_partition_time_series"
+branch_labels = None
+depends_on = None
+
+CHANNEL = "vt_cache_invalidate"
+TABLES = {"config": "key", "instrument": "symbol"}  # table -> cache key column
+
+
+def upgrade() -> None:
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION notify_cache_invalidation() RETURNS trigger AS $$
+        DECLARE
+            keys jsonb;
+        BEGIN
+            IF TG_LEVEL = 'STATEMENT' THEN
+                keys := NULL;
+            ELSIF TG_OP = 'INSERT' THEN
+                keys := jsonb_build_array(to_jsonb(NEW) ->> TG_ARGV[0]);
+            ELSIF TG_OP = 'DELETE' THEN
+                keys := jsonb_build_array(to_jsonb(OLD) ->> TG_ARGV[0]);
+            ELSIF (to_jsonb(OLD) ->> TG_ARGV[0]) = (to_jsonb(NEW) ->> TG_ARGV[0]) THEN
+                keys := jsonb_build_array(to_jsonb(NEW) ->> TG_ARGV[0]);
+            ELSE
+                keys := jsonb_build_array(
+                    to_jsonb(OLD) ->> TG_ARGV[0], to_jsonb(NEW) ->> TG_ARGV[0]
+                );
+            END IF;
+            PERFORM pg_notify(
+                '{CHANNEL}',
+                jsonb_build_object('table', TG_TABLE_NAME, 'keys', keys)::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    for table, key in TABLES.items():
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_notify_cache
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation('{key}');
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_notify_cache_truncate
+            AFTER TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_cache_invalidation('{key}');
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_notify_cache_truncate ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_notify_cache ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_cache_invalidation")
@@ -0,0 +1,33 @@
+"""audit_checkpoint: progress of incremental audit_event hash verification.
+
+One row per verifier name: the highest audit_event.id verified so far plus running totals.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004_audit_checkpoint"
+down_revision = "0003_cache_invalidation_notify"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_checkpoint",
+        sa.Column("name", sa.Text(), primary_key=True),
+        sa.Column("last_id", sa.BigInteger(), nullable=False),
+        sa.Column("rows_checked", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("mismatches", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("audit_checkpoint")
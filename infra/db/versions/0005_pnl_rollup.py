@@ -0,0 +1,214 @@
+"""pnl_rollup: 5m / 1h / 1d PnL buckets kept current from pnl_minute.
+
+One row per (resolution, instrument_id, bucket); instrument_id 0 is the account-wide total
+of every pnl_minute row, including those without an instrument. Buckets are aligned to
+exchange time (IST). realized/fees/turnover are summed over the bucket; unrealized is the
+value at the bucket's last minute.
+
+pnl_rollup_refresh(lo, hi, instruments, keep_older) recomputes every bucket overlapping
+[lo, hi) from the level below (5m from pnl_minute, 1h from 5m, 1d from 1h). Statement-level
+triggers on pnl_minute call it for exactly the range and instruments each statement
+touched, including rows a DELETE removed. The backfill command calls it with keep_older,
+which never goes below the oldest pnl_minute row, so rollups outlive the raw minutes'
+partition retention (dropping a partition fires no triggers).
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0005_pnl_rollup"
+down_revision = "0004_audit_checkpoint"
+branch_labels = None
+depends_on = None
+
+
+REFRESH_FN = r"""
+CREATE OR REPLACE FUNCTION pnl_rollup_refresh(
+    p_lo timestamptz,
+    p_hi timestamptz,
+    p_instruments bigint[] DEFAULT NULL,
+    p_keep_older boolean DEFAULT true
+) RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+    -- IST midnight; IST has no DST, so fixed-width bins stay aligned to exchange time
+    origin CONSTANT timestamptz := '2000-01-01 00:00:00+05:30';
+    ids bigint[] := CASE WHEN p_instruments IS NULL THEN NULL ELSE p_instruments || 0::bigint END;
+    oldest timestamptz;
+    lvl record;
+    lo timestamptz;
+    hi timestamptz;
+    n integer := 0;
+    k integer;
+BEGIN
+    -- one refresh at a time: concurrent delete + insert of the same buckets would collide
+    PERFORM pg_advisory_xact_lock(hashtext('pnl_rollup'));
+    IF p_keep_older THEN
+        -- buckets before the oldest raw minute are all that is left of expired partitions
+        SELECT min(ts) INTO oldest FROM pnl_minute;
+        IF oldest IS NULL THEN
+            RETURN 0;
+        END IF;
+        p_lo := greatest(p_lo, oldest);
+    END IF;
+    -- an unbounded end stops at the data on either side
+    IF NOT isfinite(p_lo) THEN
+        p_lo := least((SELECT min(ts) FROM pnl_minute), (SELECT min(bucket) FROM pnl_rollup));
+    END IF;
+    IF NOT isfinite(p_hi) THEN
+        p_hi := greatest((SELECT max(ts) FROM pnl_minute), (SELECT max(last_ts) FROM pnl_rollup))
+            + interval '1 microsecond';
+    END IF;
+    IF p_lo IS NULL OR p_hi IS NULL OR p_hi <= p_lo THEN
+        RETURN 0;
+    END IF;
+
+    FOR lvl IN
+        SELECT * FROM (VALUES
+            ('5m', interval '5 minutes', NULL),
+            ('1h', interval '1 hour', '5m'),
+            ('1d', interval '1 day', '1h')
+        ) AS v(resolution, width, source)
+    LOOP
+        lo := date_bin(lvl.width, p_lo, origin);
+        hi := date_bin(lvl.width, p_hi - interval '1 microsecond', origin) + lvl.width;
+        DELETE FROM pnl_rollup r
+        WHERE r.resolution = lvl.resolution AND r.bucket >= lo AND r.bucket < hi
+          AND (ids IS NULL OR r.instrument_id = ANY (ids));
+
+        IF lvl.source IS NULL THEN
+            INSERT INTO pnl_rollup (
+                resolution, instrument_id, bucket,
+                realized, unrealized, fees, turnover, minutes, last_ts
+            )
+            SELECT lvl.resolution, m.instrument_id, date_bin(lvl.width, m.ts, origin),
+                   sum(m.realized), (array_agg(m.unrealized ORDER BY m.ts DESC))[1],
+                   sum(m.fees), sum(m.turnover), count(*), max(m.ts)
+            FROM (
+                SELECT p.ts, p.instrument_id, sum(p.realized) AS realized,
+                       sum(p.unrealized) AS unrealized, sum(p.fees) AS fees,
+                       sum(p.turnover) AS turnover
+                FROM pnl_minute p
+                WHERE p.ts >= lo AND p.ts < hi AND p.instrument_id IS NOT NULL
+                  AND (ids IS NULL OR p.instrument_id = ANY (ids))
+                GROUP BY p.ts, p.instrument_id
+                UNION ALL
+                SELECT p.ts, 0, sum(p.realized), sum(p.unrealized), sum(p.fees),
+                       sum(p.turnover)
+                FROM pnl_minute p
+                WHERE p.ts >= lo AND p.ts < hi
+                GROUP BY p.ts
+            ) m
+            GROUP BY m.instrument_id, date_bin(lvl.width, m.ts, origin);
+        ELSE
+            INSERT INTO pnl_rollup (
+                resolution, instrument_id, bucket,
+                realized, unrealized, fees, turnover, minutes, last_ts
+            )
+            SELECT lvl.resolution, r.instrument_id, date_bin(lvl.width, r.bucket, origin),
+                   sum(r.realized), (array_agg(r.unrealized ORDER BY r.last_ts DESC))[1],
+                   sum(r.fees), sum(r.turnover), sum(r.minutes), max(r.last_ts)
+            FROM pnl_rollup r
+            WHERE r.resolution = lvl.source AND r.bucket >= lo AND r.bucket < hi
+              AND (ids IS NULL OR r.instrument_id = ANY (ids))
+            GROUP BY r.instrument_id, date_bin(lvl.width, r.bucket, origin);
+        END IF;
+        GET DIAGNOSTICS k = ROW_COUNT;
+        n := n + k;
+    END LOOP;
+    RETURN n;
+END;
+$$;
+"""
+
+# Transition tables are per event, so INSERT/DELETE share one function and UPDATE (old and
+# new rows, in case ts or instrument_id moved) has its own.
+CHANGED_FN = r"""
+CREATE OR REPLACE FUNCTION pnl_minute_rollup_changed() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pnl_rollup_refresh(
+        min(ts), max(ts) + interval '1 microsecond',
+        coalesce(array_agg(DISTINCT instrument_id) FILTER (WHERE instrument_id IS NOT NULL), '{}'),
+        false
+    )
+    FROM changed_rows
+    HAVING count(*) > 0;
+    RETURN NULL;
+END;
+$$;
+"""
+
+UPDATED_FN = r"""
+CREATE OR REPLACE FUNCTION pnl_minute_rollup_updated() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pnl_rollup_refresh(
+        min(ts), max(ts) + interval '1 microsecond',
+        coalesce(array_agg(DISTINCT instrument_id) FILTER (WHERE instrument_id IS NOT NULL), '{}'),
+        false
+    )
+    FROM (SELECT ts, instrument_id FROM old_rows
+          UNION ALL SELECT ts, instrument_id FROM changed_rows) t
+    HAVING count(*) > 0;
+    RETURN NULL;
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pnl_rollup",
+        sa.Column("resolution", sa.Text(), nullable=False),
+        sa.Column("instrument_id", sa.BigInteger(), nullable=False),  # 0 = account total
+        sa.Column("bucket", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("realized", sa.Numeric(18, 6), nullable=False),
+        sa.Column("unrealized", sa.Numeric(18, 6), nullable=False),
+        sa.Column("fees", sa.Numeric(18, 6), nullable=False),
+        sa.Column("turnover", sa.Numeric(18, 6), nullable=False),
+        sa.Column("minutes", sa.Integer(), nullable=False),
+        sa.Column("last_ts", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("resolution", "instrument_id", "bucket", name="pnl_rollup_pkey"),
+        sa.CheckConstraint("resolution IN ('5m', '1h', '1d')", name="ck_pnl_rollup__resolution"),
+    )
+    op.execute(REFRESH_FN)
+    op.execute(CHANGED_FN)
+    op.execute(UPDATED_FN)
+    op.execute(
+        """
+        CREATE TRIGGER trg_pnl_minute__rollup_insert
+        AFTER INSERT ON pnl_minute REFERENCING NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION pnl_minute_rollup_changed()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_pnl_minute__rollup_delete
+        AFTER DELETE ON pnl_minute REFERENCING OLD TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION pnl_minute_rollup_changed()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_pnl_minute__rollup_update
+        AFTER UPDATE ON pnl_minute
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION pnl_minute_rollup_updated()
+        """
+    )
+    # existing minutes
+    op.execute("SELECT pnl_rollup_refresh('-infinity', 'infinity')")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_pnl_minute__rollup_update ON pnl_minute")
+    op.execute("DROP TRIGGER IF EXISTS trg_pnl_minute__rollup_delete ON pnl_minute")
+    op.execute("DROP TRIGGER IF EXISTS trg_pnl_minute__rollup_insert ON pnl_minute")
+    op.execute("DROP FUNCTION IF EXISTS pnl_minute_rollup_updated()")
+    op.execute("DROP FUNCTION IF EXISTS pnl_minute_rollup_changed()")
+    op.execute(
+        "DROP FUNCTION IF EXISTS pnl_rollup_refresh(timestamptz, timestamptz, bigint[], boolean)"
+    )
+    op.drop_table("pnl_rollup")
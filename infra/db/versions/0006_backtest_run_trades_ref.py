@@ -0,0 +1,42 @@
+"""backtest_run: trades move to a columnar artifact; the row keeps a reference and summary.
+
+trades_ref is the artifact URI (file:// or s3://), trades_count the number of trades and
+summary small per-column stats, so listings never read the trades. The trades JSONB
+column stays for rows written before this revision until they are externalized
+(BacktestRunRepository.externalize_trades).
+
+Downgrade refuses while any row keeps its trades only in the artifact store; copy them
+back first with BacktestRunRepository.internalize_trades.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0006_backtest_run_trades_ref"
+down_revision = "0005_pnl_rollup"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("backtest_run", sa.Column("trades_ref", sa.Text()))
+    op.add_column("backtest_run", sa.Column("trades_count", sa.Integer()))
+    op.add_column("backtest_run", sa.Column("summary", postgresql.JSONB()))
+
+
+def downgrade() -> None:
+    externalized: int = (
+        op.get_bind()
+        .execute(sa.text("SELECT count(*) FROM backtest_run WHERE trades_ref IS NOT NULL"))
+        .scalar_one()
+    )
+    if externalized:
+        raise RuntimeError(
+            f"{externalized} backtest_run rows keep their trades only in the artifact "
+            "store; run BacktestRunRepository.internalize_trades() before downgrading"
+        )
+    op.drop_column("backtest_run", "summary")
+    op.drop_column("backtest_run", "trades_count")
+    op.drop_column("backtest_run", "trades_ref")
@@ -0,0 +1,34 @@
+"""Tiny timing harness shared by the benchmark scripts (run them directly with python)."""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+ROOT = Path(__file__).resolve().parents[3]  # repo root, for `packages.common.db`
+for path in (SRC, ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+def bench(name: str, fn: Callable[[], object], items: int = 1, repeat: int = 5) -> float:
+    """Run `fn` `repeat` times and print the best per-item latency; returns items/sec."""
+    fn()  # warm-up
+    best: Optional[float] = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None or dt < best else best
+    assert best is not None
+    return report(name, best, items)
+
+
+def report(name: str, seconds: float, items: int) -> float:
+    """Print one result line in the shared format; returns items/sec."""
+    rate = items / seconds
+    print(f"{name:<48} {seconds / items * 1e6:10.2f} us/item {rate:14,.0f} items/s")
+    return rate
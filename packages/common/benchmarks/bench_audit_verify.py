@@ -0,0 +1,60 @@
+"""
+audit_event hash verification throughput: one worker process vs the full pool.
+
+Needs DATABASE_URL pointing at a migrated database. Rows are COPYed in (the hash trigger
+fires per row) and the run is rolled back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator
+
+import _harness
+from _harness import report
+from sqlalchemy import text
+
+from packages.common.db.audit_verify import verify_audit_log
+from packages.common.db.metadata_reflect import reflect_all
+from packages.common.db.repositories.base import BaseRepository
+from packages.common.db.session import create_engine, create_sessionmaker
+
+N = 200_000
+T0 = datetime.now(timezone.utc) - timedelta(days=1)
+
+
+def rows(n: int) -> Iterator[Dict[str, Any]]:
+    for i in range(n):
+        yield {
+            "ts": T0 + timedelta(milliseconds=i),
+            "actor_type": "system",
+            "action": "order.update",
+            "entity_type": "order",
+            "entity_id": str(i),
+            "reason": "risk check passed",
+            "after": '{"status": "OPEN", "qty": %d, "limit_price": 101.25}' % i,
+        }
+
+
+async def main() -> None:
+    assert _harness.ROOT.exists()
+    engine = create_engine()
+    md = await reflect_all(engine, only=["audit_event"])
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        res = await conn.execute(text("SELECT coalesce(max(id), 0) FROM audit_event"))
+        start = res.scalar_one()
+        async with create_sessionmaker(engine)(bind=conn) as session:
+            await BaseRepository(session, md.tables["audit_event"]).copy_in(rows(N))
+        for workers in sorted({1, os.cpu_count() or 1}):
+            r = await verify_audit_log(conn, after_id=start, workers=workers)
+            assert r.ok and r.checked == N
+            report(f"verify_audit_log workers={workers}", r.elapsed_s, N)
+        await trans.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
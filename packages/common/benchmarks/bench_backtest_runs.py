@@ -0,0 +1,93 @@
+"""
+Listing walk-forward runs: rows with trades in JSONB vs rows that reference columnar
+trade artifacts, plus a lazy single-column load of one run's trades.
+
+Needs DATABASE_URL pointing at a migrated database; rows are rolled back and artifacts
+are written to a temporary directory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import _harness
+from _harness import report
+from sqlalchemy import select
+
+from packages.common.db.artifacts import LocalArtifactStore
+from packages.common.db.metadata_reflect import reflect_all
+from packages.common.db.repositories.backtest_run import BacktestRunRepository
+from packages.common.db.session import create_engine, create_sessionmaker
+
+RUNS = 300
+TRADES = 2_000
+REPEAT = 5
+T0 = datetime(2025, 1, 1, 3, 45, tzinfo=timezone.utc)
+
+
+def trades(seed: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "ts": T0 + timedelta(minutes=i),
+            "symbol": ("TCS", "INFY", "SBIN", "RELIANCE")[(i + seed) % 4],
+            "side": "BUY" if i % 2 else "SELL",
+            "qty": 10 + i % 7,
+            "entry": 100.0 + i % 13,
+            "exit": 100.5 + i % 11,
+            "r": ((i * 7 + seed) % 9 - 4) / 4,
+        }
+        for i in range(TRADES)
+    ]
+
+
+async def main() -> None:
+    assert _harness.ROOT.exists()
+    engine = create_engine()
+    md = await reflect_all(engine, only=["backtest_run"])
+    table = md.tables["backtest_run"]
+    with tempfile.TemporaryDirectory() as root:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            async with create_sessionmaker(engine)(bind=conn) as session:
+                repo = BacktestRunRepository(session, table, LocalArtifactStore(root))
+                for i in range(RUNS):
+                    t = trades(i)
+                    legacy = [{**r, "ts": r["ts"].isoformat()} for r in t]
+                    await repo.create(
+                        {"metrics": {"fold": i}, "tag": f"json-{i}", "trades": legacy}
+                    )
+                    await repo.create_run({"metrics": {"fold": i}, "tag": f"wf-{i}"}, t)
+
+                async def jsonb() -> int:
+                    stmt = select(table).where(table.c.tag.startswith("json-"))
+                    return len((await session.execute(stmt)).all())
+
+                async def columnar() -> int:
+                    return len(await repo.list_runs(limit=RUNS, tag_prefix="wf-"))
+
+                for name, fn in (("trades in JSONB", jsonb), ("trades_ref + summary", columnar)):
+                    best = float("inf")
+                    for _ in range(REPEAT):
+                        t0 = time.perf_counter()
+                        assert await fn() == RUNS
+                        best = min(best, time.perf_counter() - t0)
+                    report(f"list {RUNS} runs, {name}", best, 1)
+
+                run = (await repo.list_runs(limit=1, tag_prefix="wf-"))[0]
+                t0 = time.perf_counter()
+                for _ in range(REPEAT):
+                    r = repo.trades(run).load(columns=["r"], where={"symbol": "TCS"})
+                report(
+                    "lazy load r where symbol=TCS (one run)", (time.perf_counter() - t0) / REPEAT, 1
+                )
+                assert len(r) == TRADES // 4
+            await trans.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
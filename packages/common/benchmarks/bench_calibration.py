@@ -0,0 +1,45 @@
+"""Calibrator cold start: compiling ModelArtifact.calib vs loading the .npz sidecar."""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+import _harness
+from _harness import bench
+
+from vaayutrade_common import ModelArtifact
+from vaayutrade_common.calibration import calibrator_for, clear_cache, sidecar_path
+
+SIZES = (50, 1_000, 10_000)
+
+
+def main() -> None:
+    assert _harness.SRC.exists()
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            xs = np.sort(rng.normal(0, 2, n))
+            calib = {repr(float(x)): float(p) for x, p in zip(xs, np.linspace(0.01, 0.99, n))}
+            artifact = ModelArtifact(
+                version="1", path=str(Path(tmp) / f"m{n}.onnx"), schema_hash="h", calib=calib
+            )
+            sidecar = sidecar_path(artifact)
+
+            def compile_cold(a: ModelArtifact = artifact) -> None:
+                clear_cache()
+                calibrator_for(a)
+
+            def sidecar_cold(a: ModelArtifact = artifact, s: Path = sidecar) -> None:
+                clear_cache()
+                calibrator_for(a, s)
+
+            sidecar_cold()  # writes the sidecar
+            bench(f"cold start, compile ({n} points)", compile_cold)
+            bench(f"cold start, sidecar ({n} points)", sidecar_cold)
+
+
+if __name__ == "__main__":
+    main()
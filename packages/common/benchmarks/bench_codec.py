@@ -0,0 +1,59 @@
+"""Binary codec vs pydantic JSON for the event-bus models."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import _harness
+from _harness import bench
+
+from vaayutrade_common import (
+    BookSide,
+    Execution,
+    Order,
+    OrderSide,
+    PnLMinute,
+    Signal,
+    TickSnapshot,
+    codec,
+)
+
+N = 10_000
+NOW = datetime.now(timezone.utc)
+DEPTH = BookSide.from_levels([(100.0 + i * 0.05, 10 * (i + 1)) for i in range(5)])
+
+SAMPLES = [
+    TickSnapshot(ts=NOW, symbol="RELIANCE", bids=DEPTH, asks=DEPTH, last=100.0, volume=123456),
+    Signal(symbol="RELIANCE", score=0.72, side=OrderSide.BUY, conf=0.66),
+    Order(client_id="cid-1", symbol="RELIANCE", side=OrderSide.BUY, qty=10, limit_price=100.5),
+    Execution(order_id=uuid4(), qty=5, price=100.0, liquidity_flag="T"),
+    PnLMinute(ts=NOW, realized=10.0, unrealized=-2.0, fees=0.5, turnover=100000),
+]
+
+
+def main() -> None:
+    assert _harness.SRC.exists()
+    for obj in SAMPLES:
+        name = obj.__class__.__name__
+        model = obj.__class__
+        raw_json = obj.model_dump_json()
+        raw_bin = codec.encode(obj)
+        print(f"{name}: json {len(raw_json)} bytes, binary {len(raw_bin)} bytes")
+        bench(f"  {name} json encode", lambda o=obj: [o.model_dump_json() for _ in range(N)], N)
+        bench(f"  {name} binary encode", lambda o=obj: [codec.encode(o) for _ in range(N)], N)
+        bench(
+            f"  {name} json decode",
+            lambda m=model, r=raw_json: [m.model_validate_json(r) for _ in range(N)],
+            N,
+        )
+        bench(f"  {name} binary decode", lambda r=raw_bin: [codec.decode(r) for _ in range(N)], N)
+
+    batch = SAMPLES * (N // len(SAMPLES))
+    frame = codec.encode_batch(batch)
+    bench("batch encode (mixed)", lambda: codec.encode_batch(batch), len(batch))
+    bench("batch decode (mixed)", lambda: codec.decode_batch(frame), len(batch))
+
+
+if __name__ == "__main__":
+    main()
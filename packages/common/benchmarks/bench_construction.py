@@ -0,0 +1,67 @@
+"""Validated vs trusted construction of hot-path domain models."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import _harness
+from _harness import bench
+
+from vaayutrade_common import BookSide, Order, Signal, TickSnapshot, trusted_mode
+
+N = 20_000
+NOW = datetime.now(timezone.utc)
+
+ORDER_ROWS = [
+    {
+        "client_id": f"cid-{i}",
+        "symbol": "TCS",
+        "side": "BUY",
+        "qty": 10,
+        "type": "LIMIT",
+        "limit_price": 100.5,
+    }
+    for i in range(N)
+]
+SIGNAL_ROWS = [{"symbol": "TCS", "score": 0.7, "side": "SELL", "ts": NOW} for _ in range(N)]
+LEVELS = BookSide.from_levels([(100.0 + i * 0.05, 10) for i in range(5)])
+TICK_ROWS = [
+    {"ts": NOW, "symbol": "TCS", "bids": LEVELS, "asks": LEVELS, "last": 100.0, "volume": i}
+    for i in range(N)
+]
+
+
+def main() -> None:
+    assert _harness.SRC.exists()
+    for model, rows in ((Order, ORDER_ROWS), (Signal, SIGNAL_ROWS), (TickSnapshot, TICK_ROWS)):
+        name = model.__name__
+        bench(f"{name}(**row)", lambda m=model, r=rows: [m(**x) for x in r], N)
+        bench(f"{name}.validate_many(rows)", lambda m=model, r=rows: m.validate_many(r), N)
+        bench(
+            f"{name}.construct_trusted(**row)",
+            lambda m=model, r=rows: [m.construct_trusted(**x) for x in r],
+            N,
+        )
+
+        def in_trusted_mode(m=model, r=rows):
+            with trusted_mode(m) as new:
+                return [new(**x) for x in r]
+
+        bench(f"{name} via trusted_mode()", in_trusted_mode, N)
+
+    order = Order(**ORDER_ROWS[0])
+
+    def assign_validated():
+        for i in range(N):
+            order.qty = i + 1
+
+    def assign_trusted():
+        for i in range(N):
+            order.assign_trusted(qty=i + 1)
+
+    bench("Order.qty = x", assign_validated, N)
+    bench("Order.assign_trusted(qty=x)", assign_trusted, N)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Signal inserts against a local Postgres: per-row create() vs create_many() vs copy_in().
+
+Needs DATABASE_URL pointing at a migrated database. Every run is rolled back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List
+
+import _harness
+from _harness import report
+
+from packages.common.db.metadata_reflect import reflect_all
+from packages.common.db.repositories.base import BaseRepository
+from packages.common.db.session import create_engine, create_sessionmaker
+
+N = 20_000
+T0 = datetime(2025, 8, 1, 3, 45, tzinfo=timezone.utc)
+
+
+def rows(instrument_id: int, n: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "ts": T0 + timedelta(milliseconds=i),
+            "instrument_id": instrument_id,
+            "side": "LONG",
+            "horizon_seconds": 600,
+            "score": 0.5,
+        }
+        for i in range(n)
+    ]
+
+
+async def main() -> None:
+    assert _harness.ROOT.exists()
+    engine = create_engine()
+    md = await reflect_all(engine, only=["instrument", "signal"])
+    sessionmaker = create_sessionmaker(engine)
+
+    async def timed(name: str, n: int, fn: Callable[[BaseRepository, int], Awaitable[Any]]) -> None:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            async with sessionmaker(bind=conn) as session:
+                inst = await BaseRepository(session, md.tables["instrument"]).create(
+                    {"token": 987654321, "symbol": "BENCH", "tick_size": "0.05"}
+                )
+                repo = BaseRepository(session, md.tables["signal"])
+                t0 = time.perf_counter()
+                await fn(repo, inst["id"])
+                report(name, time.perf_counter() - t0, n)
+            await trans.rollback()
+
+    async def per_row(repo: BaseRepository, iid: int) -> None:
+        for row in rows(iid, N // 10):
+            await repo.create(row)
+
+    await timed("create() per row", N // 10, per_row)
+    await timed("create_many() RETURNING", N, lambda repo, iid: repo.create_many(rows(iid, N)))
+    await timed("copy_in() binary COPY", N, lambda repo, iid: repo.copy_in(rows(iid, N)))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
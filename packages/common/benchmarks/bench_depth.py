@@ -0,0 +1,50 @@
+"""Depth representation: List[PriceLevel] vs fixed (5, 2) BookSide."""
+
+from __future__ import annotations
+
+import tracemalloc
+from datetime import datetime, timezone
+
+import _harness
+from _harness import bench
+
+from vaayutrade_common import BookSide, PriceLevel, TickSnapshot
+
+N = 20_000
+NOW = datetime.now(timezone.utc)
+PAIRS = [(100.0 + i * 0.05, 10 * (i + 1)) for i in range(5)]
+RAW = [{"price": p, "qty": q} for p, q in PAIRS]
+
+
+def price_levels():
+    return [[PriceLevel(price=p, qty=q) for p, q in PAIRS] for _ in range(N)]
+
+
+def book_sides():
+    return [BookSide.from_levels(PAIRS) for _ in range(N)]
+
+
+def retained_bytes(fn) -> int:
+    tracemalloc.start()
+    keep = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return size
+
+
+def main() -> None:
+    assert _harness.SRC.exists()
+    bench("List[PriceLevel] (5 levels)", price_levels, N)
+    bench("BookSide.from_levels (5 levels)", book_sides, N)
+    bench(
+        "TickSnapshot from raw dict levels",
+        lambda: [TickSnapshot(ts=NOW, symbol="TCS", bids=RAW, asks=RAW) for _ in range(N)],
+        N,
+    )
+    for name, fn in (("List[PriceLevel]", price_levels), ("BookSide", book_sides)):
+        print(f"{name:<48} {retained_bytes(fn) / N:10.0f} bytes/side")
+
+
+if __name__ == "__main__":
+    main()
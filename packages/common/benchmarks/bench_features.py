@@ -0,0 +1,67 @@
+"""FeatureEngine: per-tick updates vs one vectorized update per universe batch."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+import _harness
+from _harness import bench
+
+from vaayutrade_common import BookSide, SymbolTable, TickBatch, TickSnapshot
+from vaayutrade_common.features import FeatureEngine
+
+SYMBOLS = [f"SYM{i:03d}" for i in range(100)]
+ROUNDS = 50
+T0 = datetime(2025, 8, 1, 3, 45, tzinfo=timezone.utc)
+BIDS = BookSide.from_levels([(100.0 - 0.05 * i, 10 * (i + 1)) for i in range(5)])
+ASKS = BookSide.from_levels([(100.05 + 0.05 * i, 10 * (i + 1)) for i in range(5)])
+
+
+def make_ticks():
+    rng = np.random.default_rng(0)
+    px = 100.0 + np.cumsum(rng.normal(0, 0.05, (ROUNDS, len(SYMBOLS))), axis=0)
+    return [
+        TickSnapshot.construct_trusted(
+            ts=T0 + timedelta(milliseconds=250 * r),
+            symbol=sym,
+            bids=BIDS,
+            asks=ASKS,
+            last=float(px[r, j]),
+            volume=None,
+        )
+        for r in range(ROUNDS)
+        for j, sym in enumerate(SYMBOLS)
+    ]
+
+
+def main() -> None:
+    assert _harness.SRC.exists()
+    ticks = make_ticks()
+    table = SymbolTable(SYMBOLS)
+    batches = [
+        TickBatch.from_snapshots(ticks[i : i + len(SYMBOLS)], table)
+        for i in range(0, len(ticks), len(SYMBOLS))
+    ]
+
+    def per_tick():
+        engine = FeatureEngine()
+        for t in ticks:
+            engine.on_tick(t)
+
+    def per_batch():
+        engine = FeatureEngine(symbols=table)
+        for b in batches:
+            engine.on_batch(b)
+
+    bench("on_tick (10 operators)", per_tick, len(ticks))
+    bench(f"on_batch ({len(SYMBOLS)} symbols per batch)", per_batch, len(ticks))
+    engine = FeatureEngine(symbols=table)
+    for b in batches:
+        engine.on_batch(b)
+    bench("snapshots() for the universe", lambda: engine.snapshots(), len(SYMBOLS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Open-burst ingestion: unbounded asyncio.Queue of every tick vs TickConflator drains."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import _harness
+from _harness import bench
+
+from vaayutrade_common import TickConflator, TickSnapshot
+
+SYMBOLS = 500
+PER_SYMBOL = 40  # ticks per symbol in the burst
+T0 = datetime(2025, 8, 1, 3, 45, tzinfo=timezone.utc)
+TICKS = [
+    TickSnapshot(
+        ts=T0 + timedelta(milliseconds=10 * i),
+        symbol=f"S{s}",
+        bids=[],
+        asks=[],
+        last=100.0 + i,
+        volume=1000 + i,
+    )
+    for i in range(PER_SYMBOL)
+    for s in range(SYMBOLS)
+]
+N = len(TICKS)
+
+
+def queue_burst() -> int:
+    q: asyncio.Queue[TickSnapshot] = asyncio.Queue()
+    for t in TICKS:
+        q.put_nowait(t)
+    handed = 0
+    while not q.empty():
+        q.get_nowait()
+        handed += 1
+    return handed
+
+
+def conflator_burst() -> int:
+    q = TickConflator(max_age_s=60)
+    q.put_many(TICKS)
+    return len(q.drain())
+
+
+def main() -> None:
+    assert _harness.SRC.exists()
+    print(f"burst: {N} ticks over {SYMBOLS} symbols")
+    print(f"{'asyncio.Queue entries handed to features':<48} {queue_burst():10d}")
+    print(f"{'TickConflator entries handed to features':<48} {conflator_burst():10d}")
+    bench("asyncio.Queue put + get (per tick)", queue_burst, N)
+    bench("TickConflator put + drain (per tick)", conflator_burst, N)
+
+
+if __name__ == "__main__":
+    main()
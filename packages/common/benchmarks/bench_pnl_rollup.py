@@ -0,0 +1,80 @@
+"""
+12-month dashboard PnL query: daily series from pnl_rollup vs re-aggregating pnl_minute.
+
+Needs DATABASE_URL pointing at a migrated database. A year of minutes for a few
+instruments is COPYed in (the rollup trigger runs once for the COPY) and rolled back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator
+
+import _harness
+from _harness import report
+from sqlalchemy import text
+
+from packages.common.db.metadata_reflect import reflect_all
+from packages.common.db.pnl_rollup import pnl_series
+from packages.common.db.repositories.base import BaseRepository
+from packages.common.db.session import create_engine, create_sessionmaker
+
+DAYS = 250  # trading days
+MINUTES = 375  # 09:15-15:30 IST
+INSTRUMENTS = 4
+T0 = datetime(2032, 1, 1, 3, 45, tzinfo=timezone.utc)
+REPEAT = 5
+
+
+def rows(instrument_ids: list[int]) -> Iterator[Dict[str, Any]]:
+    for d in range(DAYS):
+        for m in range(MINUTES):
+            ts = T0 + timedelta(days=d * 365 // DAYS, minutes=m)
+            for iid in instrument_ids:
+                yield {"ts": ts, "instrument_id": iid, "realized": 1, "unrealized": m, "fees": 0}
+
+
+async def main() -> None:
+    assert _harness.ROOT.exists()
+    engine = create_engine()
+    md = await reflect_all(engine, only=["instrument", "pnl_minute"])
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        async with create_sessionmaker(engine)(bind=conn) as session:
+            ids = []
+            for i in range(INSTRUMENTS):
+                inst = await BaseRepository(session, md.tables["instrument"]).create(
+                    {"token": 990_000 + i, "symbol": f"BENCH{i}", "tick_size": "0.05"}
+                )
+                ids.append(inst["id"])
+            t0 = time.perf_counter()
+            n = await BaseRepository(session, md.tables["pnl_minute"]).copy_in(rows(ids))
+            report("copy_in pnl_minute (+ rollup trigger)", time.perf_counter() - t0, n)
+
+            end = T0 + timedelta(days=366)
+            for name, step in (("rollup 1d", timedelta(days=1)), ("raw minutes", None)):
+                best = float("inf")
+                for _ in range(REPEAT):
+                    t0 = time.perf_counter()
+                    if step is None:
+                        res = await session.execute(
+                            text(
+                                "SELECT date_trunc('day', ts), sum(realized) FROM pnl_minute"
+                                " WHERE ts >= :lo AND ts < :hi GROUP BY 1 ORDER BY 1"
+                            ),
+                            {"lo": T0, "hi": end},
+                        )
+                        points = len(res.all())
+                    else:
+                        points = len(await pnl_series(session, T0, end, step))
+                    best = min(best, time.perf_counter() - t0)
+                assert points == DAYS
+                report(f"12-month daily series per query, {name}", best, 1)
+        await trans.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,35 @@
+"""Scoring 100 symbols: one SignalStage call on a matrix vs one call per symbol."""
+
+from __future__ import annotations
+
+import numpy as np
+
+import _harness
+from _harness import bench
+
+from vaayutrade_common import FeatureMatrix, FeatureSchema
+from vaayutrade_common.scoring import LinearModel, SignalStage
+
+N_SYMBOLS = 100
+SCHEMA = FeatureSchema([f"f{i}" for i in range(32)])
+
+
+def main() -> None:
+    assert _harness.SRC.exists()
+    rng = np.random.default_rng(0)
+    symbols = [f"SYM{i:03d}" for i in range(N_SYMBOLS)]
+    ts = np.full(N_SYMBOLS, 1_754_020_800_000_000_000, dtype=np.int64)
+    values = rng.normal(0, 1, (N_SYMBOLS, len(SCHEMA)))
+    matrix = FeatureMatrix(SCHEMA, symbols, ts, values)
+    rows = [
+        FeatureMatrix(SCHEMA, [s], ts[i : i + 1], values[i : i + 1]) for i, s in enumerate(symbols)
+    ]
+    stage = SignalStage(LinearModel(rng.normal(0, 0.1, len(SCHEMA)), SCHEMA.hash))
+
+    bench("score() one matrix of 100 symbols", lambda: stage.score(matrix), N_SYMBOLS)
+    bench("score() 100 single-row matrices", lambda: [stage.score(r) for r in rows], N_SYMBOLS)
+    bench("signals() one matrix (incl. Signal build)", lambda: stage.signals(matrix), N_SYMBOLS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import io
+import os
+import tempfile
+from pathlib import Path
+from typing import IO, Any, Protocol
+
+
+class ArtifactStore(Protocol):
+    """
+    Blob storage for run artifacts. `put` returns the URI that is stored in the
+    database; `open` and `delete` take that URI back.
+    """
+
+    def put(self, key: str, data: bytes) -> str: ...
+
+    def open(self, uri: str) -> IO[bytes]: ...
+
+    def delete(self, uri: str) -> None: ...
+
+
+class LocalArtifactStore:
+    """Files under `root`; URIs are file:// paths. Writes are atomic (temp file + rename)."""
+
+    scheme = "file://"
+
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self.root = Path(root).resolve()
+
+    def put(self, key: str, data: bytes) -> str:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return self.scheme + str(path)
+
+    def open(self, uri: str) -> IO[bytes]:
+        return self._from_uri(uri).open("rb")
+
+    def delete(self, uri: str) -> None:
+        self._from_uri(uri).unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root):
+            raise ValueError(f"artifact key escapes the store root: {key!r}")
+        return path
+
+    def _from_uri(self, uri: str) -> Path:
+        if not uri.startswith(self.scheme):
+            raise ValueError(f"not a {self.scheme} artifact URI: {uri!r}")
+        return self._path(os.path.relpath(uri[len(self.scheme) :], self.root))
+
+
+class S3ArtifactStore:
+    """
+    Objects in an S3-compatible bucket (AWS, MinIO, R2, ...); URIs are s3://bucket/key.
+    `client` is anything with boto3's put_object / get_object / delete_object, e.g.
+    `boto3.client("s3", endpoint_url=...)`. Calls are blocking; run them off the event
+    loop (the repositories use `asyncio.to_thread`).
+    """
+
+    def __init__(self, client: Any, bucket: str, prefix: str = "") -> None:
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+
+    def put(self, key: str, data: bytes) -> str:
+        full = f"{self.prefix}/{key}" if self.prefix else key
+        self.client.put_object(Bucket=self.bucket, Key=full, Body=data)
+        return f"s3://{self.bucket}/{full}"
+
+    def open(self, uri: str) -> IO[bytes]:
+        obj = self.client.get_object(Bucket=self.bucket, Key=self._key(uri))
+        return io.BytesIO(obj["Body"].read())
+
+    def delete(self, uri: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(uri))
+
+    def _key(self, uri: str) -> str:
+        head = f"s3://{self.bucket}/"
+        if not uri.startswith(head):
+            raise ValueError(f"not an artifact URI of bucket {self.bucket!r}: {uri!r}")
+        return uri[len(head) :]
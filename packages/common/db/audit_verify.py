@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Deque, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+# The exact canonical form audit_compute_hash() digests (baseline migration). Postgres
+# renders it, so key order, number and timestamp formatting match byte for byte; only
+# the SHA-256 is recomputed here. Timestamps render in the session TimeZone, so verify
+# with the TimeZone the rows were written under (see `timezone` below).
+_CANONICAL = text(
+    """
+    SELECT id, hash, jsonb_build_object(
+        'ts', ts,
+        'actor_type', actor_type,
+        'actor_id', actor_id,
+        'action', action,
+        'entity_type', entity_type,
+        'entity_id', entity_id,
+        'reason', reason,
+        'before', before,
+        'after', after
+    )::text
+    FROM audit_event
+    WHERE id > :lo AND id <= :hi
+    ORDER BY id
+    """
+)
+
+
+@dataclass(frozen=True)
+class Mismatch:
+    id: int
+    stored: str
+    computed: str
+
+
+@dataclass
+class AuditReport:
+    """Outcome of verifying audit_event ids in (after_id, upto_id]."""
+
+    after_id: int
+    upto_id: int
+    checked: int = 0
+    mismatches: List[Mismatch] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.checked / self.elapsed_s if self.elapsed_s else 0.0
+
+
+def _check_chunk(rows: Sequence[Tuple[int, str, str]]) -> List[Tuple[int, str, str]]:
+    """Runs in a worker process: (id, stored, computed) for every row that does not match."""
+    bad = []
+    for id_, stored, canonical in rows:
+        computed = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        if computed != stored:
+            bad.append((id_, stored, computed))
+    return bad
+
+
+async def verify_audit_log(
+    conn: AsyncConnection,
+    after_id: int = 0,
+    upto_id: Optional[int] = None,
+    range_size: int = 100_000,
+    fetch_size: int = 10_000,
+    workers: Optional[int] = None,
+    timezone: Optional[str] = None,
+    executor: Optional[Executor] = None,
+) -> AuditReport:
+    """
+    Recompute the hash of every audit_event with id in (after_id, upto_id] (default: up
+    to the current max id).
+
+    Ids are read `range_size` at a time through a server-side cursor, and every fetch of
+    `fetch_size` rows is hashed in a process pool (`workers` processes, or `executor`),
+    with up to two chunks per worker in flight while the next fetch streams in.
+    `timezone` sets the session TimeZone for the run (default: the server's).
+    """
+    t0 = time.perf_counter()
+    if timezone is not None:
+        await conn.execute(text("SELECT set_config('TimeZone', :tz, true)"), {"tz": timezone})
+    if upto_id is None:
+        res = await conn.execute(
+            text("SELECT max(id) FROM audit_event WHERE id > :lo"), {"lo": after_id}
+        )
+        upto_id = res.scalar_one_or_none() or after_id
+    report = AuditReport(after_id, upto_id)
+
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    in_flight = 2 * (workers or os.cpu_count() or 1)
+    loop = asyncio.get_running_loop()
+    pending: Deque[asyncio.Future[List[Tuple[int, str, str]]]] = deque()
+
+    def collect(bad: List[Tuple[int, str, str]]) -> None:
+        report.mismatches.extend(Mismatch(*b) for b in bad)
+
+    try:
+        for lo in range(after_id, upto_id, range_size):
+            hi = min(lo + range_size, upto_id)
+            stmt = _CANONICAL.bindparams(lo=lo, hi=hi).execution_options(yield_per=fetch_size)
+            cursor = await conn.stream(stmt)
+            async for part in cursor.partitions(fetch_size):
+                chunk: List[Tuple[int, str, str]] = [(r[0], r[1], r[2]) for r in part]
+                pending.append(loop.run_in_executor(pool, _check_chunk, chunk))
+                report.checked += len(chunk)
+                while len(pending) >= in_flight:
+                    collect(await pending.popleft())
+        while pending:
+            collect(await pending.popleft())
+    finally:
+        if executor is None:
+            pool.shutdown(cancel_futures=True)
+    report.mismatches.sort(key=lambda m: m.id)
+    report.elapsed_s = time.perf_counter() - t0
+    return report
+
+
+# --- incremental runs ---
+
+
+async def load_checkpoint(conn: AsyncConnection, name: str = "nightly") -> int:
+    res = await conn.execute(
+        text("SELECT last_id FROM audit_checkpoint WHERE name = :name"), {"name": name}
+    )
+    last: Optional[int] = res.scalar_one_or_none()
+    return last or 0
+
+
+async def save_checkpoint(conn: AsyncConnection, name: str, report: AuditReport) -> None:
+    await conn.execute(
+        text(
+            """
+            INSERT INTO audit_checkpoint (name, last_id, rows_checked, mismatches)
+            VALUES (:name, :last_id, :checked, :mismatches)
+            ON CONFLICT (name) DO UPDATE SET
+                last_id = EXCLUDED.last_id,
+                rows_checked = audit_checkpoint.rows_checked + EXCLUDED.rows_checked,
+                mismatches = audit_checkpoint.mismatches + EXCLUDED.mismatches,
+                updated_at = now()
+            """
+        ),
+        {
+            "name": name,
+            "last_id": report.upto_id,
+            "checked": report.checked,
+            "mismatches": len(report.mismatches),
+        },
+    )
+
+
+async def verify_incremental(
+    conn: AsyncConnection,
+    name: str = "nightly",
+    settle: timedelta = timedelta(minutes=5),
+    **kwargs: Any,
+) -> AuditReport:
+    """
+    Verify the rows added since checkpoint `name`, then advance it.
+
+    Ids are allocated at insert but become visible at commit, so the run stops below the
+    first row younger than `settle`: rows from transactions still open are not skipped
+    by the checkpoint moving past them.
+    """
+    after = await load_checkpoint(conn, name)
+    res = await conn.execute(
+        text(
+            "SELECT coalesce(min(id) - 1, (SELECT max(id) FROM audit_event WHERE id > :lo)) "
+            "FROM audit_event WHERE id > :lo AND ts >= now() - CAST(:settle AS interval)"
+        ),
+        {"lo": after, "settle": settle},
+    )
+    upto = res.scalar_one_or_none() or after
+    report = await verify_audit_log(conn, after, max(upto, after), **kwargs)
+    await save_checkpoint(conn, name, report)
+    return report
+
+
+async def run_nightly(engine: AsyncEngine, name: str = "nightly", **kwargs: Any) -> AuditReport:
+    """`verify_incremental` in its own transaction, committing the new checkpoint."""
+    async with engine.begin() as conn:
+        return await verify_incremental(conn, name, **kwargs)
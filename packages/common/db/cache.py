@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker
+
+from .repositories.config import ConfigRepository
+from .repositories.instrument import InstrumentRepository
+
+# Channel the 0003 migration's triggers notify on.
+INVALIDATION_CHANNEL = "vt_cache_invalidate"
+
+CachedRow = Optional[Dict[str, Any]]
+
+
+@dataclass
+class CacheStats:
+    """
+    `stale` counts entries the fallback poll found out of date, i.e. changes whose
+    notification was missed; it should stay at 0 while LISTEN is healthy.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    stale: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "stale": self.stale,
+        }
+
+
+class ReadThroughCache(ABC):
+    """
+    TTL + LRU cache of rows keyed by one column, loaded through a repository on a miss.
+
+    Misses are cached too (as None), so repeated lookups of an unknown key stay local;
+    NOTIFY on insert clears them. A load that races with an invalidation is returned to
+    its caller but not stored, so a stale row is never cached past its notification.
+    """
+
+    table_name: str = ""
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        table: Table,
+        ttl_s: float = 300.0,
+        maxsize: int = 1024,
+    ) -> None:
+        self.sessionmaker = sessionmaker
+        self.table = table
+        self.ttl_s = ttl_s
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, Tuple[float, CachedRow]] = OrderedDict()
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def peek(self, key: str) -> CachedRow:
+        """Cached row for `key` without touching the database (None if not cached)."""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() >= entry[0]:
+            return None
+        return entry[1]
+
+    async def get(self, key: str) -> CachedRow:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if time.monotonic() < entry[0]:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry[1]
+            del self._entries[key]
+            self.stats.expired += 1
+        self.stats.misses += 1
+        generation = self._generation
+        async with self.sessionmaker() as session:
+            row = await self._load(session, key)
+        if generation == self._generation:
+            self._store(key, row)
+        return row
+
+    def invalidate(self, keys: Optional[Iterable[str]] = None) -> int:
+        """Drop `keys` (all entries when None); returns how many were cached."""
+        self._generation += 1
+        if keys is None:
+            n = len(self._entries)
+            self._entries.clear()
+        else:
+            n = sum(self._entries.pop(k, None) is not None for k in keys)
+        self.stats.invalidations += n
+        return n
+
+    async def poll(self) -> int:
+        """
+        Re-read every cached key in one query and replace entries that changed since
+        they were loaded. Returns the number of stale entries found.
+        """
+        keys = list(self._entries)
+        if not keys:
+            return 0
+        generation = self._generation
+        async with self.sessionmaker() as session:
+            fresh = await self._load_many(session, keys)
+        if generation != self._generation:
+            return 0  # a notification arrived meanwhile; it has already done the work
+        stale = 0
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] != fresh.get(key):
+                self._entries[key] = (entry[0], fresh.get(key))
+                stale += 1
+        self.stats.stale += stale
+        return stale
+
+    def _store(self, key: str, row: CachedRow) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_s, row)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    @abstractmethod
+    async def _load(self, session: AsyncSession, key: str) -> CachedRow: ...
+
+    @abstractmethod
+    async def _load_many(
+        self, session: AsyncSession, keys: Sequence[str]
+    ) -> Dict[str, CachedRow]: ...
+
+
+class ConfigCache(ReadThroughCache):
+    """Active config per key, as returned by `ConfigRepository.get_active`."""
+
+    table_name = "config"
+
+    async def get_active(self, key: str = "trading") -> CachedRow:
+        return await self.get(key)
+
+    async def _load(self, session: AsyncSession, key: str) -> CachedRow:
+        row = await ConfigRepository(session, self.table).get_active(key)
+        return dict(row) if row else None
+
+    async def _load_many(self, session: AsyncSession, keys: Sequence[str]) -> Dict[str, CachedRow]:
+        t = self.table
+        stmt = select(t).where(t.c.key.in_(keys) & t.c.is_active.is_(True))
+        res = await session.execute(stmt)
+        return {m["key"]: dict(m) for m in res.mappings().all()}
+
+
+class InstrumentCache(ReadThroughCache):
+    """Instrument rows by symbol, as returned by `InstrumentRepository.get_by_symbol`."""
+
+    table_name = "instrument"
+
+    async def get_by_symbol(self, symbol: str) -> CachedRow:
+        return await self.get(symbol)
+
+    async def _load(self, session: AsyncSession, key: str) -> CachedRow:
+        row = await InstrumentRepository(session, self.table).get_by_symbol(key)
+        return dict(row) if row else None
+
+    async def _load_many(self, session: AsyncSession, keys: Sequence[str]) -> Dict[str, CachedRow]:
+        t = self.table
+        res = await session.execute(select(t).where(t.c.symbol.in_(keys)).order_by(t.c.id))
+        out: Dict[str, CachedRow] = {}
+        for m in res.mappings().all():
+            out.setdefault(m["symbol"], dict(m))  # first match, like get_by_symbol
+        return out
+
+
+class CacheInvalidator:
+    """
+    Keeps caches coherent: a dedicated connection LISTENs for the migration's NOTIFY
+    payloads and drops exactly the keys named, and every `poll_interval_s` each cache is
+    re-checked against the database to catch anything missed. If the LISTEN connection
+    is lost it is reopened and the caches are cleared, since notifications sent while
+    it was down are gone.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        caches: Iterable[ReadThroughCache],
+        poll_interval_s: float = 30.0,
+        channel: str = INVALIDATION_CHANNEL,
+    ) -> None:
+        self.engine = engine
+        self.channel = channel
+        self.poll_interval_s = poll_interval_s
+        self.caches: Dict[str, List[ReadThroughCache]] = {}
+        for cache in caches:
+            self.caches.setdefault(cache.table_name, []).append(cache)
+        self.notifications = 0
+        self.reconnects = 0
+        self.failures = 0  # background polls that raised; the loop keeps going
+        self.last_error: Optional[str] = None
+        self._conn: Optional[AsyncConnection] = None
+        self._driver: Any = None
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def start(self) -> None:
+        await self._listen()
+        self._task = asyncio.get_running_loop().create_task(self._poll_loop())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._unlisten()
+
+    async def __aenter__(self) -> CacheInvalidator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    @property
+    def listening(self) -> bool:
+        return self._driver is not None and not self._driver.is_closed()
+
+    async def poll_once(self) -> int:
+        """Reconnect LISTEN if needed, then poll every cache; returns stale entries found."""
+        if not self.listening:
+            await self._unlisten()
+            await self._listen()
+            self.reconnects += 1
+            for caches in self.caches.values():
+                for cache in caches:
+                    cache.invalidate()
+        stale = 0
+        for caches in self.caches.values():
+            for cache in caches:
+                stale += await cache.poll()
+        return stale
+
+    def handle(self, payload: str) -> None:
+        """Apply one NOTIFY payload: {"table": ..., "keys": [...] | null}."""
+        msg: Mapping[str, Any] = json.loads(payload)
+        self.notifications += 1
+        keys = msg.get("keys")
+        for cache in self.caches.get(str(msg.get("table")), ()):
+            cache.invalidate(None if keys is None else [str(k) for k in keys])
+
+    async def _poll_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval_s)
+            try:
+                await self.poll_once()
+            except Exception as exc:  # a failed poll must not end the loop; the next one retries
+                self.failures += 1
+                self.last_error = f"{type(exc).__name__}: {exc}"
+
+    def _on_notify(self, _conn: Any, _pid: int, _channel: str, payload: str) -> None:
+        self.handle(payload)
+
+    async def _listen(self) -> None:
+        conn = await self.engine.connect()
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        if driver is None or not hasattr(driver, "add_listener"):
+            await conn.close()
+            raise RuntimeError("cache invalidation requires the asyncpg driver")
+        await driver.add_listener(self.channel, self._on_notify)
+        self._conn, self._driver = conn, driver
+
+    async def _unlisten(self) -> None:
+        conn, driver = self._conn, self._driver
+        self._conn = self._driver = None
+        if conn is None:
+            return
+        if driver is not None and not driver.is_closed():
+            await driver.remove_listener(self.channel, self._on_notify)
+            await conn.close()
+        else:
+            await conn.invalidate()
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import io
+import json
+import math
+from datetime import datetime, timezone
+from typing import IO, Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from .artifacts import ArtifactStore
+
+FORMAT_VERSION = 1
+
+# Row filter: column -> value (equality), collection of values (membership) or a
+# function from the column array to a boolean mask.
+Where = Mapping[str, Union[Any, Callable[[npt.NDArray[Any]], npt.NDArray[np.bool_]]]]
+
+
+def _kind(values: Iterable[Any]) -> str:
+    kinds = set()
+    for v in values:
+        if v is None:
+            continue
+        if isinstance(v, bool):
+            kinds.add("bool")
+        elif isinstance(v, int):
+            kinds.add("int")
+        elif isinstance(v, float):
+            kinds.add("float")
+        elif isinstance(v, datetime):
+            kinds.add("datetime")
+        elif isinstance(v, str):
+            kinds.add("str")
+        else:
+            return "json"
+    if not kinds:
+        return "float"  # an all-NULL column
+    if kinds <= {"int", "float"}:
+        return "float" if "float" in kinds else "int"
+    return kinds.pop() if len(kinds) == 1 else "json"
+
+
+def _encode(kind: str, values: Sequence[Any]) -> npt.NDArray[Any]:
+    if kind == "bool":
+        return np.array([bool(v) for v in values], dtype=np.bool_)
+    if kind == "int":
+        return np.array([0 if v is None else v for v in values], dtype=np.int64)
+    if kind == "float":
+        return np.array([math.nan if v is None else v for v in values], dtype=np.float64)
+    if kind == "datetime":
+        return np.array(
+            [
+                (
+                    np.datetime64("NaT")
+                    if v is None
+                    else np.datetime64(
+                        (v.astimezone(timezone.utc) if v.tzinfo else v).replace(tzinfo=None), "us"
+                    )
+                )
+                for v in values
+            ],
+            dtype="datetime64[us]",
+        )
+    if kind == "str":
+        return np.array(["" if v is None else v for v in values], dtype=np.str_)
+    return np.array(
+        ["" if v is None else json.dumps(v, default=str) for v in values], dtype=np.str_
+    )
+
+
+def _decode(kind: str, array: npt.NDArray[Any]) -> List[Any]:
+    if kind == "datetime":
+        return [None if v is None else v.replace(tzinfo=timezone.utc) for v in array.tolist()]
+    if kind == "json":
+        return [json.loads(v) if v else None for v in array.tolist()]
+    values: List[Any] = array.tolist()
+    return values
+
+
+class TradeTable:
+    """
+    Trades as one NumPy array per column. Kinds are inferred per column (bool, int,
+    float, datetime, str, json for anything else); datetimes are stored as UTC
+    datetime64[us]. NULLs are tracked in a separate mask, so `rows()` returns exactly
+    the values that went in (datetimes come back timezone-aware UTC).
+    """
+
+    __slots__ = ("columns", "kinds", "nulls", "_len")
+
+    def __init__(
+        self,
+        columns: Dict[str, npt.NDArray[Any]],
+        kinds: Dict[str, str],
+        nulls: Optional[Dict[str, npt.NDArray[np.bool_]]] = None,
+        length: Optional[int] = None,
+    ) -> None:
+        self.columns = columns
+        self.kinds = kinds
+        self.nulls = nulls or {}
+        self._len = length if length is not None else len(next(iter(columns.values()), ()))
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Mapping[str, Any]]) -> TradeTable:
+        names: Dict[str, None] = {}
+        for row in rows:
+            names.update(dict.fromkeys(row))
+        columns: Dict[str, npt.NDArray[Any]] = {}
+        kinds: Dict[str, str] = {}
+        nulls: Dict[str, npt.NDArray[np.bool_]] = {}
+        for name in names:
+            values = [row.get(name) for row in rows]
+            kinds[name] = kind = _kind(values)
+            columns[name] = _encode(kind, values)
+            null = np.array([v is None for v in values], dtype=np.bool_)
+            if null.any():
+                nulls[name] = null
+        return cls(columns, kinds, nulls, len(rows))
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.columns)
+
+    def __getitem__(self, name: str) -> npt.NDArray[Any]:
+        return self.columns[name]
+
+    def is_null(self, name: str) -> npt.NDArray[np.bool_]:
+        null = self.nulls.get(name)
+        return np.zeros(len(self), dtype=np.bool_) if null is None else null
+
+    def take(self, mask: npt.NDArray[Any]) -> TradeTable:
+        """Rows selected by a boolean mask or an index array."""
+        nulls = {k: v[mask] for k, v in self.nulls.items()}
+        columns = {k: v[mask] for k, v in self.columns.items()}
+        n = int(np.count_nonzero(mask)) if mask.dtype == np.bool_ else len(mask)
+        return TradeTable(columns, dict(self.kinds), nulls, n)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        names = self.names
+        cols = []
+        for name in names:
+            values = _decode(self.kinds[name], self.columns[name])
+            null = self.nulls.get(name)
+            if null is not None:
+                for i in np.flatnonzero(null).tolist():
+                    values[i] = None
+            cols.append(values)
+        return [dict(zip(names, vals)) for vals in zip(*cols)]
+
+    # --- file format ---
+
+    def to_bytes(self) -> bytes:
+        """Compressed .npz: one member per column (and NULL mask) plus a JSON schema."""
+        schema = {
+            "version": FORMAT_VERSION,
+            "rows": len(self),
+            "columns": [[name, self.kinds[name], name in self.nulls] for name in self.columns],
+        }
+        arrays: Dict[str, npt.NDArray[Any]] = {"schema": np.array(json.dumps(schema))}
+        for i, name in enumerate(self.columns):
+            arrays[f"c{i}"] = self.columns[name]
+            if name in self.nulls:
+                arrays[f"n{i}"] = self.nulls[name]
+        buf = io.BytesIO()
+        np.savez_compressed(buf, **arrays)  # type: ignore[arg-type]
+        return buf.getvalue()
+
+    @classmethod
+    def read(
+        cls,
+        f: IO[bytes],
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[Where] = None,
+    ) -> TradeTable:
+        """
+        Read `columns` (default: all) of the rows matching `where`. Only the members for
+        the projected and filtered columns are decompressed.
+        """
+        with np.load(f, allow_pickle=False) as npz:
+            schema = json.loads(str(npz["schema"]))
+            if schema["version"] != FORMAT_VERSION:
+                raise ValueError(f"unsupported trades format version {schema['version']}")
+            slot = {
+                name: (i, kind, has_null)
+                for i, (name, kind, has_null) in enumerate(schema["columns"])
+            }
+            wanted = list(columns) if columns is not None else list(slot)
+            unknown = [c for c in [*wanted, *(where or {})] if c not in slot]
+            if unknown:
+                raise KeyError(f"no trade columns {unknown}")
+
+            kinds: Dict[str, str] = {}
+            arrays: Dict[str, npt.NDArray[Any]] = {}
+            nulls: Dict[str, npt.NDArray[np.bool_]] = {}
+            for name in dict.fromkeys([*wanted, *(where or {})]):
+                i, kinds[name], has_null = slot[name]
+                arrays[name] = npz[f"c{i}"]
+                if has_null:
+                    nulls[name] = npz[f"n{i}"]
+        return cls(arrays, kinds, nulls, schema["rows"]).project(wanted, where)
+
+    def project(
+        self, columns: Optional[Sequence[str]] = None, where: Optional[Where] = None
+    ) -> TradeTable:
+        """`columns` (default: all) of the rows matching `where`; NULLs never match."""
+        names = self.names if columns is None else list(columns)
+        table = TradeTable(
+            {n: self.columns[n] for n in names},
+            {n: self.kinds[n] for n in names},
+            {n: self.nulls[n] for n in names if n in self.nulls},
+            len(self),
+        )
+        if not where:
+            return table
+        mask = np.ones(len(self), dtype=np.bool_)
+        for name, cond in where.items():
+            mask &= _match(self.columns[name], cond) & ~self.is_null(name)
+        return table.take(mask)
+
+
+def _match(array: npt.NDArray[Any], cond: Any) -> npt.NDArray[np.bool_]:
+    if callable(cond):
+        return np.asarray(cond(array), dtype=np.bool_)
+    if isinstance(cond, (list, tuple, set, frozenset)):
+        return np.isin(array, list(cond))
+    return np.asarray(array == cond, dtype=np.bool_)
+
+
+def summarize(table: TradeTable) -> Dict[str, Any]:
+    """Small JSON summary kept in the database: trade count, columns and, for each
+    numeric column, sum / mean / min / max and the fraction of positive values."""
+    stats: Dict[str, Dict[str, Optional[float]]] = {}
+    for name, kind in table.kinds.items():
+        if kind not in ("int", "float"):
+            continue
+        values = table[name][~table.is_null(name)].astype(np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            continue
+        stats[name] = {
+            "sum": float(values.sum()),
+            "mean": float(values.mean()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "positive": float((values > 0).mean()),
+        }
+    return {"n_trades": len(table), "columns": table.names, "stats": stats}
+
+
+class LazyTrades:
+    """
+    Handle to a run's stored trades; nothing is read until `load`. `len()` is the
+    count recorded with the run, so listings never open the artifact.
+    """
+
+    def __init__(self, store: ArtifactStore, uri: str, count: Optional[int] = None) -> None:
+        self.store = store
+        self.uri = uri
+        self.count = count
+
+    def __len__(self) -> int:
+        if self.count is None:
+            self.count = len(self.load(columns=[]))
+        return self.count
+
+    def load(
+        self, columns: Optional[Sequence[str]] = None, where: Optional[Where] = None
+    ) -> TradeTable:
+        with self.store.open(self.uri) as f:
+            return TradeTable.read(f, columns, where)
+
+    def rows(
+        self, columns: Optional[Sequence[str]] = None, where: Optional[Where] = None
+    ) -> List[Dict[str, Any]]:
+        return self.load(columns, where).rows()
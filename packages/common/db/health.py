@@ -1,62 +1,86 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Tuple
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from .instrumentation import PROBE_MS, MetricsSink, get_metrics_sink
+
+REQUIRED_TABLES = {
+    "account",
+    "instrument",
+    "order",
+    "execution",
+    "position",
+    "signal",
+    "config",
+}
 
 
 @dataclass(frozen=True)
 class DBHealth:
     ok: bool
     checks: List[Tuple[str, bool, str]]
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+
+
+async def _alembic(conn: AsyncConnection) -> Tuple[bool, str]:
+    res = await conn.execute(text("SELECT version_num FROM alembic_version"))
+    return True, str(res.scalar_one())
+
+
+async def _tables(conn: AsyncConnection) -> Tuple[bool, str]:
+    res = await conn.execute(
+        text(
+            """
+            SELECT table_name FROM information_schema.tables
+            WHERE table_schema='public'
+            """
+        )
+    )
+    have = {r[0] for r in res}
+    missing = sorted(REQUIRED_TABLES - have)
+    return not missing, "missing: " + ",".join(missing) if missing else "ok"
 
 
-async def check_db(engine: AsyncEngine) -> DBHealth:
+async def check_db(engine: AsyncEngine, sink: Optional[MetricsSink] = None) -> DBHealth:
+    """
+    Run the connect / alembic / tables probes over a single connection. Each probe's
+    latency is returned and reported to `sink` (default: the installed metrics sink);
+    "connect" includes acquiring the connection.
+    """
+    sink = sink or get_metrics_sink()
     checks: List[Tuple[str, bool, str]] = []
+    latency: Dict[str, float] = {}
 
-    # connectivity
+    def record(name: str, t0: float, ok: bool, detail: str) -> None:
+        ms = (time.perf_counter() - t0) * 1e3
+        checks.append((name, ok, detail))
+        latency[name] = ms
+        sink.observe(PROBE_MS, ms, {"probe": name})
+
+    t0 = time.perf_counter()
     try:
         async with engine.connect() as conn:
             await conn.execute(text("SELECT 1"))
-        checks.append(("connect", True, "ok"))
+            record("connect", t0, True, "ok")
+            for name, probe in (("alembic", _alembic), ("tables", _tables)):
+                t0 = time.perf_counter()
+                try:
+                    # a savepoint per probe, so one failure does not abort the others
+                    async with conn.begin_nested():
+                        ok, detail = await probe(conn)
+                    record(name, t0, ok, detail)
+                except Exception as e:
+                    record(name, t0, False, str(e))
     except Exception as e:  # pragma: no cover
-        checks.append(("connect", False, str(e)))
-
-    # alembic head
-    try:
-        async with engine.connect() as conn:
-            res = await conn.execute(text("SELECT version_num FROM alembic_version"))
-            head = res.scalar_one()
-        checks.append(("alembic", True, head))
-    except Exception as e:
-        checks.append(("alembic", False, str(e)))
-
-    required = {
-        "account",
-        "instrument",
-        "order",
-        "execution",
-        "position",
-        "signal",
-        "config",
-    }
-    try:
-        async with engine.connect() as conn:
-            res = await conn.execute(
-                text(
-                    """
-                    SELECT table_name FROM information_schema.tables
-                    WHERE table_schema='public'
-                    """
-                )
-            )
-            have = {r[0] for r in res}
-        missing = sorted(required - have)
-        checks.append(("tables", not missing, "missing: " + ",".join(missing) if missing else "ok"))
-    except Exception as e:
-        checks.append(("tables", False, str(e)))
+        done = {name for name, _, _ in checks}
+        for name in ("connect", "alembic", "tables"):
+            if name not in done:
+                record(name, t0, False, str(e))
 
     overall = all(ok for _, ok, _ in checks)
-    return DBHealth(ok=overall, checks=checks)
+    return DBHealth(ok=overall, checks=checks, latency_ms=latency)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class InstrumentIndex:
+    """
+    Immutable in-process view of the instrument table.
+
+    Each instrument gets a dense id 0..n-1; `token`, `db_id`, `tick_size`, `lot_size` and
+    `is_tradable` are parallel arrays indexed by it. Symbol and token lookups are dict
+    hits; a whole batch of tokens resolves with one `searchsorted`.
+    """
+
+    __slots__ = (
+        "symbols",
+        "token",
+        "db_id",
+        "tick_size",
+        "lot_size",
+        "is_tradable",
+        "_by_symbol",
+        "_by_token",
+        "_token_order",
+    )
+
+    def __init__(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        self.symbols: tuple[str, ...] = tuple(str(r["symbol"]) for r in rows)
+        self.token: npt.NDArray[np.int64] = np.array([r["token"] for r in rows], dtype=np.int64)
+        self.db_id: npt.NDArray[np.int64] = np.array([r["id"] for r in rows], dtype=np.int64)
+        self.tick_size: npt.NDArray[np.float64] = np.array(
+            [float(r["tick_size"]) for r in rows], dtype=np.float64
+        )
+        self.lot_size: npt.NDArray[np.int32] = np.array(
+            [r["lot_size"] for r in rows], dtype=np.int32
+        )
+        self.is_tradable: npt.NDArray[np.bool_] = np.array(
+            [bool(r["is_tradable"]) for r in rows], dtype=np.bool_
+        )
+        self._by_symbol: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
+        self._by_token: Dict[int, int] = {int(t): i for i, t in enumerate(self.token.tolist())}
+        if len(self._by_symbol) != len(rows) or len(self._by_token) != len(rows):
+            raise ValueError("instrument rows must have unique symbols and tokens")
+        self._token_order: npt.NDArray[np.intp] = np.argsort(self.token, kind="stable")
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._by_symbol
+
+    # --- scalar lookups ---
+
+    def id_of(self, symbol: str) -> Optional[int]:
+        return self._by_symbol.get(symbol)
+
+    def id_of_token(self, token: int) -> Optional[int]:
+        return self._by_token.get(token)
+
+    def symbol_of_token(self, token: int) -> Optional[str]:
+        i = self._by_token.get(token)
+        return None if i is None else self.symbols[i]
+
+    def token_of(self, symbol: str) -> Optional[int]:
+        i = self._by_symbol.get(symbol)
+        return None if i is None else int(self.token[i])
+
+    # --- vectorized lookups ---
+
+    def ids_of_tokens(self, tokens: npt.ArrayLike) -> npt.NDArray[np.intp]:
+        """Dense ids for a batch of tokens; unknown tokens map to -1."""
+        t = np.asarray(tokens, dtype=np.int64)
+        if not len(self):
+            return np.full(t.shape, -1, dtype=np.intp)
+        sorted_tokens = self.token[self._token_order]
+        pos = np.minimum(np.searchsorted(sorted_tokens, t), len(self) - 1)
+        ids = self._token_order[pos]
+        return np.where(sorted_tokens[pos] == t, ids, -1).astype(np.intp)
+
+    def ids_of(self, symbols: Iterable[str]) -> npt.NDArray[np.intp]:
+        """Dense ids for symbols (e.g. `Universe.symbols`); unknown symbols map to -1."""
+        get = self._by_symbol.get
+        return np.array([get(s, -1) for s in symbols], dtype=np.intp)
+
+    def mask(self, symbols: Iterable[str]) -> npt.NDArray[np.bool_]:
+        """Boolean array over dense ids that is True for the given symbols."""
+        out = np.zeros(len(self), dtype=np.bool_)
+        ids = self.ids_of(symbols)
+        out[ids[ids >= 0]] = True
+        return out
+
+    def tradable(self, universe: Iterable[str], ban_list: Iterable[str] = ()) -> List[str]:
+        """Universe members that exist, are tradable and are not banned, in index order."""
+        ok = self.mask(universe) & self.is_tradable & ~self.mask(ban_list)
+        return [self.symbols[i] for i in np.flatnonzero(ok).tolist()]
+
+
+async def load_instrument_index(
+    session: AsyncSession, instrument: Table, exchange: str = "NSE"
+) -> InstrumentIndex:
+    """Build an index from one bulk query, ordered by token so ids are reproducible."""
+    t = instrument
+    stmt = (
+        select(t.c.id, t.c.token, t.c.symbol, t.c.tick_size, t.c.lot_size, t.c.is_tradable)
+        .where(t.c.exchange == exchange)
+        .order_by(t.c.token)
+    )
+    res = await session.execute(stmt)
+    return InstrumentIndex([dict(m) for m in res.mappings().all()])
+
+
+class InstrumentIndexHolder:
+    """
+    Publishes the current index. `refresh` builds a complete new index and then swaps
+    the reference, so readers holding `current` never see a partial state or wait.
+    """
+
+    def __init__(self, instrument: Table, exchange: str = "NSE") -> None:
+        self.instrument = instrument
+        self.exchange = exchange
+        self.current = InstrumentIndex([])
+
+    async def refresh(self, session: AsyncSession) -> InstrumentIndex:
+        index = await load_instrument_index(session, self.instrument, self.exchange)
+        self.current = index
+        return index
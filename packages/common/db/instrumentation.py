@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import bisect
+import contextvars
+import functools
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Concatenate,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    ParamSpec,
+    Sized,
+    Tuple,
+    TypeVar,
+)
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Metric names
+STATEMENT_MS = "db.statement.ms"  # one cursor execute, labelled repository/operation
+STATEMENT_ROWS = "db.statement.rows"
+OPERATION_MS = "db.operation.ms"  # one repository call (may span several statements)
+OPERATION_ROWS = "db.operation.rows"
+POOL_WAIT_MS = "db.pool.wait_ms"
+PROBE_MS = "db.health.probe_ms"
+
+UNLABELLED = {"repository": "-", "operation": "-"}
+
+# Upper bounds in ms; the last bucket is open-ended.
+BUCKETS_MS: Tuple[float, ...] = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000
+)  # fmt: skip
+
+
+class Histogram:
+    """Fixed-bucket histogram; quantiles are reported as the containing bucket's bound."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: Tuple[float, ...] = BUCKETS_MS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "max": self.max,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+@dataclass(frozen=True)
+class SlowQuery:
+    at: datetime
+    ms: float
+    statement: str
+    params: Any  # redacted
+    labels: Dict[str, str]
+
+
+class MetricsSink:
+    """
+    Receives DB metrics. The base class drops everything; subclass it to forward to
+    Prometheus/StatsD/etc., or use `InMemorySink`. Statements taking at least `slow_ms`
+    are also passed to `slow_query`.
+    """
+
+    slow_ms: float = 100.0
+
+    def observe(self, name: str, value: float, labels: Mapping[str, str]) -> None:
+        pass
+
+    def slow_query(self, record: SlowQuery) -> None:
+        pass
+
+
+class InMemorySink(MetricsSink):
+    """Keeps a histogram per (metric, labels) and the last `slow_log_size` slow queries."""
+
+    def __init__(self, slow_ms: float = 100.0, slow_log_size: int = 100) -> None:
+        self.slow_ms = slow_ms
+        self.histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+        self.slow_log: Deque[SlowQuery] = deque(maxlen=slow_log_size)
+
+    def observe(self, name: str, value: float, labels: Mapping[str, str]) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        h = self.histograms.get(key)
+        if h is None:
+            h = self.histograms[key] = Histogram()
+        h.observe(value)
+
+    def slow_query(self, record: SlowQuery) -> None:
+        self.slow_log.append(record)
+
+    def histogram(self, name: str, **labels: str) -> Optional[Histogram]:
+        return self.histograms.get((name, tuple(sorted(labels.items()))))
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """{'name{k=v,...}': {count, sum, max, p50, p95, p99}}"""
+        out = {}
+        for (name, labels), h in self.histograms.items():
+            tag = ",".join(f"{k}={v}" for k, v in labels)
+            out[f"{name}{{{tag}}}"] = h.snapshot()
+        return out
+
+
+_sink: MetricsSink = MetricsSink()
+
+
+def get_metrics_sink() -> MetricsSink:
+    return _sink
+
+
+def set_metrics_sink(sink: MetricsSink) -> MetricsSink:
+    """Install the process-wide sink; returns the previous one."""
+    global _sink
+    previous, _sink = _sink, sink
+    return previous
+
+
+# --- labels ---
+
+_labels: contextvars.ContextVar[Optional[Dict[str, str]]] = contextvars.ContextVar(
+    "vt_db_query_labels", default=None
+)
+
+
+@contextmanager
+def query_labels(**labels: str) -> Iterator[None]:
+    """Label every statement executed inside the block (e.g. repository/operation)."""
+    token = _labels.set(labels)
+    try:
+        yield
+    finally:
+        _labels.reset(token)
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def _rows_of(result: object) -> Optional[int]:
+    if result is None:
+        return 0
+    if isinstance(result, int) and not isinstance(result, bool):
+        return result
+    if isinstance(result, Mapping):
+        return 1
+    rows = getattr(result, "rows", None)  # e.g. repositories.base.Page
+    if isinstance(rows, list):
+        return len(rows)
+    return len(result) if isinstance(result, Sized) else None
+
+
+def instrumented(
+    operation: str,
+) -> Callable[
+    [Callable[Concatenate[Any, P], Awaitable[R]]], Callable[Concatenate[Any, P], Awaitable[R]]
+]:
+    """
+    Decorate an async repository method: its statements are labelled with the
+    repository's `name` and `operation`, and the whole call's latency and row count
+    are recorded as OPERATION_MS / OPERATION_ROWS.
+    """
+
+    def wrap(
+        fn: Callable[Concatenate[Any, P], Awaitable[R]],
+    ) -> Callable[Concatenate[Any, P], Awaitable[R]]:
+        @functools.wraps(fn)
+        async def inner(self: Any, *args: P.args, **kwargs: P.kwargs) -> R:
+            labels = {"repository": self.name, "operation": operation}
+            token = _labels.set(labels)
+            t0 = time.perf_counter()
+            try:
+                result = await fn(self, *args, **kwargs)
+            finally:
+                _labels.reset(token)
+                _sink.observe(OPERATION_MS, (time.perf_counter() - t0) * 1e3, labels)
+            rows = _rows_of(result)
+            if rows is not None:
+                _sink.observe(OPERATION_ROWS, rows, labels)
+            return result
+
+        return inner
+
+    return wrap
+
+
+# --- parameter redaction ---
+
+
+def redact_params(params: Any) -> Any:
+    """Replace bound values with their type names, keeping keys and row counts."""
+    if params is None:
+        return None
+    if isinstance(params, Mapping):
+        return {k: _redact_value(v) for k, v in params.items()}
+    if isinstance(params, (list, tuple)):
+        if params and isinstance(params[0], (Mapping, list, tuple)):  # executemany
+            return [redact_params(params[0]), f"... {len(params)} rows"]
+        return tuple(_redact_value(v) for v in params)
+    return _redact_value(params)
+
+
+def _redact_value(value: Any) -> Any:
+    return None if value is None else f"<{type(value).__name__}>"
+
+
+# --- engine hooks ---
+
+_T0_KEY = "vt_statement_t0"
+
+
+def instrument_engine(
+    engine: AsyncEngine,
+    sink: Optional[MetricsSink] = None,
+    redact: Callable[[Any], Any] = redact_params,
+) -> None:
+    """
+    Time every statement on `engine` and report it to `sink` (default: whatever
+    `set_metrics_sink` installed at the time of the statement). Pool checkout waits are
+    reported too when the pool keeps `PoolMetrics` (see session.create_engine).
+    Call once per engine; `create_engine` already does.
+    """
+    sync = engine.sync_engine
+
+    def current() -> MetricsSink:
+        return sink if sink is not None else _sink
+
+    @event.listens_for(sync, "before_cursor_execute")
+    def before(conn: Connection, *_: Any) -> None:
+        conn.info.setdefault(_T0_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(sync, "after_cursor_execute")
+    def after(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        stack: List[float] = conn.info.get(_T0_KEY) or []
+        if not stack:
+            return
+        ms = (time.perf_counter() - stack.pop()) * 1e3
+        labels = _labels.get() or UNLABELLED
+        s = current()
+        s.observe(STATEMENT_MS, ms, labels)
+        rowcount = getattr(cursor, "rowcount", -1)
+        if isinstance(rowcount, int) and rowcount >= 0:
+            s.observe(STATEMENT_ROWS, rowcount, labels)
+        if ms >= s.slow_ms:
+            s.slow_query(
+                SlowQuery(datetime.now(timezone.utc), ms, statement, redact(parameters), labels)
+            )
+
+    @event.listens_for(sync, "handle_error")
+    def on_error(ctx: ExceptionContext) -> None:
+        conn = ctx.connection
+        if conn is not None:
+            stack = conn.info.get(_T0_KEY)
+            if stack:
+                stack.pop()
+
+    metrics = getattr(sync.pool, "metrics", None)
+    listeners = getattr(metrics, "wait_listeners", None)
+    if isinstance(listeners, list):
+        profile = getattr(getattr(metrics, "profile", None), "name", "-")
+
+        def on_wait(seconds: float) -> None:
+            current().observe(POOL_WAIT_MS, seconds * 1e3, {"profile": profile})
+
+        listeners.append(on_wait)
@@ -1,9 +1,31 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, Optional, Union
+import hashlib
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
-from sqlalchemy import MetaData
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    DefaultClause,
+    ForeignKeyConstraint,
+    Index,
+    MetaData,
+    PrimaryKeyConstraint,
+    Table,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.sql import operators, sqltypes
+from sqlalchemy.sql.elements import TextClause, UnaryExpression
+from sqlalchemy.types import TypeEngine
 
 TABLES = (
     "account",
@@ -41,3 +63,325 @@ async def reflect_all(
         await _do_reflect(engine)
 
     return md
+
+
+# --- on-disk cache ---
+#
+# The cache is a JSON description of the reflected tables, rebuilt with the column types
+# below; nothing in it is executed. Anything this format cannot describe (other types,
+# expression indexes, computed/identity columns) is simply not cached.
+
+CACHE_FORMAT = 1
+
+_TYPES: Dict[str, Tuple[Callable[..., TypeEngine[Any]], Tuple[str, ...]]] = {
+    "BIGINT": (sqltypes.BIGINT, ()),
+    "BOOLEAN": (sqltypes.BOOLEAN, ()),
+    "DATE": (sqltypes.DATE, ()),
+    "DOUBLE_PRECISION": (sqltypes.DOUBLE_PRECISION, ("precision",)),
+    "INTEGER": (sqltypes.INTEGER, ()),
+    "NUMERIC": (sqltypes.NUMERIC, ("precision", "scale")),
+    "REAL": (sqltypes.REAL, ("precision",)),
+    "SMALLINT": (sqltypes.SMALLINT, ()),
+    "TEXT": (sqltypes.TEXT, ()),
+    "UUID": (sqltypes.UUID, ("as_uuid",)),
+    "VARCHAR": (sqltypes.VARCHAR, ("length",)),
+    "BYTEA": (postgresql.BYTEA, ()),
+    "INTERVAL": (postgresql.INTERVAL, ("precision", "fields")),
+    "JSON": (postgresql.JSON, ()),
+    "JSONB": (postgresql.JSONB, ()),
+    "TIME": (postgresql.TIME, ("timezone", "precision")),
+    "TIMESTAMP": (postgresql.TIMESTAMP, ("timezone", "precision")),
+}
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _describe_type(type_: TypeEngine[Any]) -> Dict[str, Any]:
+    if isinstance(type_, postgresql.ENUM):
+        return {"kind": "ENUM", "name": type_.name, "enums": list(type_.enums)}
+    kind = type(type_).__name__
+    spec = _TYPES.get(kind)
+    if spec is None or type(type_) is not spec[0]:
+        raise _Unsupported(f"column type {type_!r}")
+    return {"kind": kind, **{arg: getattr(type_, arg) for arg in spec[1]}}
+
+
+def _build_type(desc: Mapping[str, Any]) -> TypeEngine[Any]:
+    args = dict(desc)
+    kind = args.pop("kind")
+    if kind == "ENUM":
+        return postgresql.ENUM(*args["enums"], name=args["name"], create_type=False)
+    return _TYPES[kind][0](**args)
+
+
+def _index_element(expr: Any) -> Dict[str, Any]:
+    if isinstance(expr, Column):
+        return {"column": expr.name}
+    if isinstance(expr, UnaryExpression) and isinstance(expr.element, Column):
+        if expr.modifier is operators.desc_op:
+            return {"column": expr.element.name, "sort": "desc"}
+        if expr.modifier is operators.asc_op:
+            return {"column": expr.element.name, "sort": "asc"}
+    raise _Unsupported(f"index expression {expr!r}")
+
+
+def _describe_table(table: Table) -> Dict[str, Any]:
+    columns = []
+    for col in table.c:
+        if col.computed is not None or col.identity is not None:
+            raise _Unsupported(f"generated column {table.name}.{col.name}")
+        default: Optional[str] = None
+        if col.server_default is not None:
+            clause = col.server_default
+            if not (isinstance(clause, DefaultClause) and isinstance(clause.arg, TextClause)):
+                raise _Unsupported(f"server default of {table.name}.{col.name}")
+            default = clause.arg.text
+        columns.append(
+            {
+                "name": col.name,
+                "type": _describe_type(col.type),
+                "nullable": col.nullable,
+                "default": default,
+                "autoincrement": col.autoincrement,
+                "comment": col.comment,
+            }
+        )
+    constraints: List[Dict[str, Any]] = []
+    for con in sorted(table.constraints, key=lambda c: (type(c).__name__, str(c.name))):
+        cols = [c.name for c in getattr(con, "columns", ())]
+        if isinstance(con, PrimaryKeyConstraint):
+            constraints.append({"kind": "primary_key", "name": con.name, "columns": cols})
+        elif isinstance(con, ForeignKeyConstraint):
+            constraints.append(
+                {
+                    "kind": "foreign_key",
+                    "name": con.name,
+                    "columns": cols,
+                    "refcolumns": [fk.target_fullname for fk in con.elements],
+                    "ondelete": con.ondelete,
+                    "onupdate": con.onupdate,
+                    "deferrable": con.deferrable,
+                    "initially": con.initially,
+                    "match": con.match,
+                }
+            )
+        elif isinstance(con, UniqueConstraint):
+            constraints.append(
+                {
+                    "kind": "unique",
+                    "name": con.name,
+                    "columns": cols,
+                    "nulls_not_distinct": con.dialect_options["postgresql"]["nulls_not_distinct"],
+                }
+            )
+        elif isinstance(con, CheckConstraint):
+            constraints.append({"kind": "check", "name": con.name, "sqltext": str(con.sqltext)})
+        else:
+            raise _Unsupported(f"constraint {con!r}")
+    indexes = []
+    for ix in sorted(table.indexes, key=lambda i: str(i.name)):
+        pg = ix.dialect_options["postgresql"]
+        where = pg.get("where")
+        if where is not None and not isinstance(where, str):
+            raise _Unsupported(f"index predicate of {ix.name}")
+        indexes.append(
+            {
+                "name": ix.name,
+                "unique": ix.unique,
+                "elements": [_index_element(e) for e in ix.expressions],
+                "where": where,
+                "include": list(pg.get("include") or []),
+                "nulls_not_distinct": pg.get("nulls_not_distinct"),
+            }
+        )
+    return {
+        "name": table.name,
+        "comment": table.comment,
+        "columns": columns,
+        "constraints": constraints,
+        "indexes": indexes,
+    }
+
+
+def _build_table(md: MetaData, desc: Mapping[str, Any]) -> Table:
+    table = Table(
+        desc["name"],
+        md,
+        *(
+            Column(
+                c["name"],
+                _build_type(c["type"]),
+                nullable=c["nullable"],
+                server_default=None if c["default"] is None else text(c["default"]),
+                autoincrement=c["autoincrement"],
+                comment=c["comment"],
+            )
+            for c in desc["columns"]
+        ),
+        comment=desc["comment"],
+    )
+    for con in desc["constraints"]:
+        kind = con["kind"]
+        if kind == "primary_key":
+            table.append_constraint(PrimaryKeyConstraint(*con["columns"], name=con["name"]))
+        elif kind == "foreign_key":
+            table.append_constraint(
+                ForeignKeyConstraint(
+                    con["columns"],
+                    con["refcolumns"],
+                    name=con["name"],
+                    ondelete=con["ondelete"],
+                    onupdate=con["onupdate"],
+                    deferrable=con["deferrable"],
+                    initially=con["initially"],
+                    match=con["match"],
+                )
+            )
+        elif kind == "unique":
+            table.append_constraint(
+                UniqueConstraint(
+                    *con["columns"],
+                    name=con["name"],
+                    postgresql_nulls_not_distinct=con["nulls_not_distinct"],
+                )
+            )
+        elif kind == "check":
+            table.append_constraint(CheckConstraint(text(con["sqltext"]), name=con["name"]))
+        else:
+            raise ValueError(f"unknown constraint kind {kind!r}")
+    for ix in desc["indexes"]:
+        elements: List[Any] = []
+        for el in ix["elements"]:
+            col = table.c[el["column"]]
+            sort = el.get("sort")
+            elements.append(col.desc() if sort == "desc" else col.asc() if sort else col)
+        Index(
+            ix["name"],
+            *elements,
+            unique=ix["unique"],
+            postgresql_where=ix["where"],
+            postgresql_include=ix["include"],
+            postgresql_nulls_not_distinct=ix["nulls_not_distinct"],
+        )
+    return table
+
+
+def dump_metadata(md: MetaData) -> Dict[str, Any]:
+    """JSON-serializable description of `md`; raises ValueError if it cannot be described."""
+    try:
+        tables = [_describe_table(md.tables[name]) for name in sorted(md.tables)]
+    except _Unsupported as exc:
+        raise ValueError(f"cannot cache metadata: {exc}") from None
+    return {"format": CACHE_FORMAT, "tables": tables}
+
+
+def restore_metadata(data: Mapping[str, Any]) -> MetaData:
+    """Inverse of `dump_metadata`."""
+    if data.get("format") != CACHE_FORMAT:
+        raise ValueError(f"unsupported metadata cache format {data.get('format')!r}")
+    md = MetaData()
+    for desc in data["tables"]:
+        _build_table(md, desc)
+    return md
+
+
+def default_cache_dir() -> Path:
+    """VT_METADATA_CACHE_DIR, else a per-user directory under XDG_CACHE_HOME (~/.cache)."""
+    env = os.getenv("VT_METADATA_CACHE_DIR")
+    if env:
+        return Path(env)
+    base = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "vaayutrade" / "metadata"
+
+
+def cache_path(cache_dir: Path, head: str, only: Iterable[str]) -> Path:
+    tables = hashlib.sha256(",".join(sorted(only)).encode()).hexdigest()[:12]
+    return cache_dir / f"metadata-{head}-{tables}.json"
+
+
+def _private(st: os.stat_result, mask: int) -> bool:
+    """Owned by this user, with none of the `mask` permission bits set."""
+    owner = st.st_uid == os.geteuid() if hasattr(os, "geteuid") else True
+    return owner and not st.st_mode & mask
+
+
+def _cache_dir_ready(directory: Path) -> bool:
+    """
+    Create `directory` as 0700 if needed; True only if it is a directory owned by this
+    user that nobody else can write to, so no one else can plant a cache file in it.
+    """
+    try:
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = os.stat(directory, follow_symlinks=False)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and _private(st, 0o022)
+
+
+def _read_cache(path: Path) -> Optional[MetaData]:
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    except OSError:
+        return None
+    with os.fdopen(fd, "rb") as fh:
+        if not _private(os.fstat(fh.fileno()), 0o022):
+            return None
+        try:
+            return restore_metadata(json.load(fh))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+
+def _write_cache(path: Path, md: MetaData) -> None:
+    try:
+        data = json.dumps(dump_metadata(md))
+    except ValueError:
+        return  # not describable: reflect every time instead
+    try:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")  # 0600
+        with os.fdopen(fd, "w") as fh:
+            fh.write(data)
+        os.replace(tmp, path)  # atomic: concurrent starters never read a partial file
+    except OSError:
+        pass  # a read-only cache dir only costs the reflection next time
+
+
+async def _alembic_head(conn: AsyncConnection) -> Optional[str]:
+    try:
+        async with conn.begin_nested():
+            res = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            head: Optional[str] = res.scalar_one_or_none()
+            return head
+    except DBAPIError:
+        return None
+
+
+async def load_metadata(
+    engine: AsyncEngine,
+    only: Optional[Iterable[str]] = None,
+    cache_dir: Optional[Union[str, Path]] = None,
+) -> MetaData:
+    """
+    Reflected metadata, cached on disk per Alembic head. A cache hit costs one query
+    (the head) plus parsing a JSON table description; any other head re-reflects and
+    rewrites the cache. Without an alembic_version row it falls back to plain
+    reflection. The cache is only used from a directory owned by the current user and
+    not writable by anyone else (created 0700 if missing); otherwise every call reflects.
+    """
+    tables = list(only) if only else list(TABLES)
+    directory = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    async with engine.begin() as conn:
+        head = await _alembic_head(conn)
+        if head is None:
+            return await reflect_all(conn, tables)
+        path = cache_path(directory, head, tables)
+        usable = _cache_dir_ready(directory)
+        cached = _read_cache(path) if usable else None
+        if cached is not None:
+            return cached
+        md = await reflect_all(conn, tables)
+    if usable:
+        _write_cache(path, md)
+    return md
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Same predicate as the partial index ix_order__open.
+OPEN_STATUSES = frozenset({"OPEN", "PENDING", "TRIGGER_PENDING", "PARTIALLY_FILLED"})
+
+OrderRow = Dict[str, Any]
+
+
+def _plain(v: Any) -> Any:
+    return getattr(v, "value", v)  # OrderStatus and friends are str enums
+
+
+def is_open(status: Any) -> bool:
+    return _plain(status) in OPEN_STATUSES
+
+
+@dataclass
+class BookDiff:
+    """How the book differs from the database: ids only in one side, or in both but unequal."""
+
+    missing: List[UUID] = field(default_factory=list)  # open in the DB, absent from the book
+    extra: List[UUID] = field(default_factory=list)  # in the book, not open in the DB
+    changed: Dict[UUID, Dict[str, Any]] = field(default_factory=dict)  # id -> {col: (book, db)}
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.extra or self.changed)
+
+
+class OpenOrderBook:
+    """
+    In-process mirror of the open orders (statuses in OPEN_STATUSES), indexed by id,
+    client_id, broker_order_id, symbol and parent_id.
+
+    Build it with `load_open_order_book` at startup, then feed every order change to
+    `apply`: orders entering an open status are added, updates are merged in place and
+    orders reaching any other status are dropped. Lookups are plain dict hits and return
+    the stored row dicts, which must be treated as read-only. Not thread-safe; use it
+    from the event loop that applies the updates.
+    """
+
+    def __init__(
+        self, rows: Iterable[Mapping[str, Any]] = (), symbols: Optional[Mapping[int, str]] = None
+    ) -> None:
+        self._by_id: Dict[UUID, OrderRow] = {}
+        self._by_client_id: Dict[str, UUID] = {}
+        self._by_broker_id: Dict[str, UUID] = {}
+        self._by_symbol: Dict[str, Dict[UUID, OrderRow]] = {}
+        self._by_parent: Dict[UUID, Dict[UUID, OrderRow]] = {}
+        self._symbols: Dict[int, str] = dict(symbols or {})
+        for row in rows:
+            self.apply(row)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, order_id: object) -> bool:
+        return order_id in self._by_id
+
+    # --- lookups ---
+
+    def get(self, order_id: UUID) -> Optional[OrderRow]:
+        return self._by_id.get(order_id)
+
+    def by_client_id(self, client_id: str) -> Optional[OrderRow]:
+        i = self._by_client_id.get(client_id)
+        return None if i is None else self._by_id[i]
+
+    def by_broker_order_id(self, broker_order_id: str) -> Optional[OrderRow]:
+        i = self._by_broker_id.get(broker_order_id)
+        return None if i is None else self._by_id[i]
+
+    def for_symbol(self, symbol: str) -> List[OrderRow]:
+        """Open orders of `symbol`, in placement order (orders applied later come last)."""
+        return list(self._by_symbol.get(symbol, {}).values())
+
+    def children(self, parent_id: UUID) -> List[OrderRow]:
+        """Open orders linked to `parent_id` (bracket / OCO legs)."""
+        return list(self._by_parent.get(parent_id, {}).values())
+
+    def symbols(self) -> List[str]:
+        return list(self._by_symbol)
+
+    def rows(self) -> List[OrderRow]:
+        return list(self._by_id.values())
+
+    # --- updates ---
+
+    def apply(self, change: Mapping[str, Any]) -> bool:
+        """
+        Merge one order change (at least `id`; a full row for orders new to the book,
+        e.g. a repository's returned row) and return whether the book changed. Rows need
+        a `symbol`, or an `instrument_id` whose symbol the book already knows.
+        """
+        order_id = change["id"]
+        current = self._by_id.get(order_id)
+        status = _plain(change.get("status", current["status"] if current else None))
+        if not is_open(status):
+            return self.discard(order_id)
+        if current is None:
+            row = {k: _plain(v) for k, v in change.items()}
+        else:
+            row = {**current, **{k: _plain(v) for k, v in change.items()}}
+            if row == current:
+                return False
+            self._unindex(current)
+        if "symbol" not in row:
+            symbol = self._symbols.get(row.get("instrument_id", -1))
+            if symbol is None:
+                raise ValueError(
+                    f"order {order_id}: no symbol for instrument {row.get('instrument_id')}"
+                )
+            row["symbol"] = symbol
+        self._index(row)
+        return True
+
+    def apply_many(self, changes: Iterable[Mapping[str, Any]]) -> int:
+        """Apply changes in order; returns how many changed the book."""
+        return sum(self.apply(c) for c in changes)
+
+    def discard(self, order_id: UUID) -> bool:
+        row = self._by_id.get(order_id)
+        if row is None:
+            return False
+        self._unindex(row)
+        return True
+
+    def _index(self, row: OrderRow) -> None:
+        order_id = row["id"]
+        self._by_id[order_id] = row
+        self._by_client_id[row["client_id"]] = order_id
+        if row.get("broker_order_id") is not None:
+            self._by_broker_id[row["broker_order_id"]] = order_id
+        self._by_symbol.setdefault(row["symbol"], {})[order_id] = row
+        if row.get("instrument_id") is not None:
+            self._symbols[row["instrument_id"]] = row["symbol"]
+        if row.get("parent_id") is not None:
+            self._by_parent.setdefault(row["parent_id"], {})[order_id] = row
+
+    def _unindex(self, row: OrderRow) -> None:
+        order_id = row["id"]
+        del self._by_id[order_id]
+        self._by_client_id.pop(row["client_id"], None)
+        if row.get("broker_order_id") is not None:
+            self._by_broker_id.pop(row["broker_order_id"], None)
+        _remove(self._by_symbol, row["symbol"], order_id)
+        if row.get("parent_id") is not None:
+            _remove(self._by_parent, row["parent_id"], order_id)
+
+    # --- consistency ---
+
+    def diff(self, db_rows: Sequence[Mapping[str, Any]]) -> BookDiff:
+        """Compare against the open orders as read from the database (see `open_orders`)."""
+        out = BookDiff()
+        seen = set()
+        for db_row in db_rows:
+            order_id = db_row["id"]
+            seen.add(order_id)
+            mine = self._by_id.get(order_id)
+            if mine is None:
+                out.missing.append(order_id)
+                continue
+            delta = {
+                k: (mine.get(k), _plain(v)) for k, v in db_row.items() if mine.get(k) != _plain(v)
+            }
+            if delta:
+                out.changed[order_id] = delta
+        out.extra = sorted(set(self._by_id) - seen)
+        out.missing.sort()
+        return out
+
+
+def _remove(index: Dict[Any, Dict[UUID, OrderRow]], key: Any, order_id: UUID) -> None:
+    bucket = index.get(key)
+    if bucket is not None:
+        bucket.pop(order_id, None)
+        if not bucket:
+            del index[key]
+
+
+async def open_orders(session: AsyncSession, order: Table, instrument: Table) -> List[OrderRow]:
+    """All open orders with their instrument symbol, oldest first (one query, served by
+    ix_order__open)."""
+    stmt = (
+        select(order, instrument.c.symbol)
+        .join(instrument, instrument.c.id == order.c.instrument_id)
+        .where(order.c.status.in_(sorted(OPEN_STATUSES)))
+        .order_by(order.c.placed_at, order.c.id)
+    )
+    res = await session.execute(stmt)
+    return [dict(m) for m in res.mappings().all()]
+
+
+async def load_open_order_book(
+    session: AsyncSession, order: Table, instrument: Table
+) -> OpenOrderBook:
+    return OpenOrderBook(await open_orders(session, order, instrument))
+
+
+async def verify_open_order_book(
+    book: OpenOrderBook, session: AsyncSession, order: Table, instrument: Table
+) -> BookDiff:
+    """
+    Diff `book` against the database. Changes applied to the book but not yet committed
+    (or committed but not yet applied) show up too, so run it when updates are quiet or
+    re-check the reported ids.
+    """
+    return book.diff(await open_orders(session, order, instrument))
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from typing import Dict, List, Literal, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+Interval = Literal["day", "month"]
+OnExpire = Literal["drop", "detach"]
+
+
+@dataclass(frozen=True)
+class PartitionPolicy:
+    """
+    How one ts-range-partitioned table is maintained.
+
+    Partitions cover whole UTC days (`<table>_pYYYYMMDD`) or months (`<table>_pYYYYMM`);
+    a UTC day holds a full NSE session. `premake` future periods are kept ahead of today,
+    and partitions ending on or before `today - retention_days` are dropped or detached
+    (detached tables stay around as plain tables for archiving).
+    """
+
+    table: str
+    interval: Interval
+    retention_days: int
+    premake: int
+    on_expire: OnExpire = "drop"
+
+    @property
+    def default_partition(self) -> str:
+        return f"{self.table}_default"
+
+    def period(self, day: date) -> Tuple[str, datetime, datetime]:
+        """(partition name, start, end) of the period containing `day`."""
+        if self.interval == "day":
+            start = day
+            end = day + timedelta(days=1)
+            suffix = start.strftime("%Y%m%d")
+        else:
+            start = day.replace(day=1)
+            end = (start + timedelta(days=32)).replace(day=1)
+            suffix = start.strftime("%Y%m")
+        return f"{self.table}_p{suffix}", _midnight(start), _midnight(end)
+
+    def periods(self, today: date) -> List[Tuple[str, datetime, datetime]]:
+        """Today's period followed by the `premake` next ones."""
+        out = [self.period(today)]
+        for _ in range(self.premake):
+            out.append(self.period(out[-1][2].date()))
+        return out
+
+
+POLICIES: Dict[str, PartitionPolicy] = {
+    "signal": PartitionPolicy("signal", "day", retention_days=30, premake=7),
+    "pnl_minute": PartitionPolicy("pnl_minute", "day", retention_days=90, premake=7),
+    "audit_event": PartitionPolicy(
+        "audit_event", "month", retention_days=365, premake=1, on_expire="detach"
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    start: Optional[datetime]  # None for the DEFAULT partition
+    end: Optional[datetime]
+
+    @property
+    def is_default(self) -> bool:
+        return self.start is None
+
+
+_BOUND = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+def _midnight(d: date) -> datetime:
+    return datetime(d.year, d.month, d.day, tzinfo=UTC)
+
+
+async def list_partitions(conn: AsyncConnection, table: str) -> List[Partition]:
+    """Attached partitions of `table`, ordered by start (DEFAULT last)."""
+    res = await conn.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": table},
+    )
+    out: List[Partition] = []
+    for name, bound in res.all():
+        m = _BOUND.search(str(bound or ""))
+        if m:
+            start, end = (datetime.fromisoformat(v) for v in m.groups())
+            out.append(Partition(str(name), start.astimezone(UTC), end.astimezone(UTC)))
+        else:
+            out.append(Partition(str(name), None, None))
+    far = datetime.max.replace(tzinfo=UTC)
+    return sorted(out, key=lambda p: p.start or far)
+
+
+async def ensure_partitions(
+    conn: AsyncConnection, policy: PartitionPolicy, today: Optional[date] = None
+) -> List[str]:
+    """
+    Create missing partitions for today and the premake window; returns the new names.
+
+    A new partition is built as a standalone table and then attached, which holds a
+    weaker lock on the parent than CREATE ... PARTITION OF. Rows already sitting in the
+    DEFAULT partition for that range are moved in first (ATTACH would fail otherwise);
+    the default's user triggers are disabled for the move so audit immutability does not
+    block it and stored hashes are kept as-is.
+    """
+    today = today or datetime.now(UTC).date()
+    q = conn.dialect.identifier_preparer.quote
+    parent, default = q(policy.table), q(policy.default_partition)
+    existing = [
+        (p.start, p.end)
+        for p in await list_partitions(conn, policy.table)
+        if p.start is not None and p.end is not None
+    ]
+    created: List[str] = []
+    for name, start, end in policy.periods(today):
+        if any(lo < end and start < hi for lo, hi in existing):
+            continue
+        part = q(name)
+        bounds = {"start": start, "end": end}
+        await conn.execute(
+            text(f"CREATE TABLE {part} (LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        )
+        res = await conn.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE ts >= :start AND ts < :end)"),
+            bounds,
+        )
+        if bool(res.scalar_one()):
+            await conn.execute(text(f"ALTER TABLE {default} DISABLE TRIGGER USER"))
+            await conn.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {default} WHERE ts >= :start AND ts < :end "
+                    f"RETURNING *) INSERT INTO {part} SELECT * FROM moved"
+                ),
+                bounds,
+            )
+            await conn.execute(text(f"ALTER TABLE {default} ENABLE TRIGGER USER"))
+        await conn.execute(
+            text(
+                f"ALTER TABLE {parent} ATTACH PARTITION {part} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+async def expire_partitions(
+    conn: AsyncConnection, policy: PartitionPolicy, today: Optional[date] = None
+) -> List[str]:
+    """Drop or detach partitions that end on or before the retention cutoff."""
+    today = today or datetime.now(UTC).date()
+    cutoff = _midnight(today - timedelta(days=policy.retention_days))
+    q = conn.dialect.identifier_preparer.quote
+    expired: List[str] = []
+    for p in await list_partitions(conn, policy.table):
+        if p.end is None or p.end > cutoff:
+            continue
+        if policy.on_expire == "drop":
+            await conn.execute(text(f"DROP TABLE {q(p.name)}"))
+        else:
+            await conn.execute(text(f"ALTER TABLE {q(policy.table)} DETACH PARTITION {q(p.name)}"))
+        expired.append(p.name)
+    return expired
+
+
+async def run_maintenance(
+    engine: AsyncEngine,
+    policies: Optional[Sequence[PartitionPolicy]] = None,
+    today: Optional[date] = None,
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Apply every policy, each table in its own transaction. Meant to run daily (before
+    the session opens) so the next days' partitions always exist ahead of the writers.
+    """
+    out: Dict[str, Dict[str, List[str]]] = {}
+    for policy in policies if policies is not None else POLICIES.values():
+        async with engine.begin() as conn:
+            created = await ensure_partitions(conn, policy, today)
+            expired = await expire_partitions(conn, policy, today)
+        out[policy.table] = {"created": created, "expired": expired}
+    return out
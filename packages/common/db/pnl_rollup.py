@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+ACCOUNT = 0  # pnl_rollup.instrument_id of the account-wide total
+
+# Bucket origin used by the 0005 migration: IST midnight.
+IST = timezone(timedelta(hours=5, minutes=30))
+ORIGIN = datetime(2000, 1, 1, tzinfo=IST)
+
+# Rollup levels, coarsest first.
+ROLLUPS: Tuple[Tuple[str, timedelta], ...] = (
+    ("1d", timedelta(days=1)),
+    ("1h", timedelta(hours=1)),
+    ("5m", timedelta(minutes=5)),
+)
+
+# Chart steps `pnl_series` chooses from when none is given.
+STEPS: Tuple[timedelta, ...] = (
+    timedelta(minutes=1),
+    timedelta(minutes=5),
+    timedelta(minutes=15),
+    timedelta(minutes=30),
+    timedelta(hours=1),
+    timedelta(hours=2),
+    timedelta(days=1),
+    timedelta(days=7),
+)
+
+_FROM_ROLLUP = text(
+    """
+    SELECT date_bin(:step, bucket, :origin) AS bucket,
+           sum(realized) AS realized,
+           (array_agg(unrealized ORDER BY last_ts DESC))[1] AS unrealized,
+           sum(fees) AS fees,
+           sum(turnover) AS turnover,
+           sum(minutes) AS minutes,
+           max(last_ts) AS last_ts
+    FROM pnl_rollup
+    WHERE resolution = :resolution AND instrument_id = :instrument_id
+      AND bucket >= date_bin(:step, :start, :origin) AND bucket < :end
+    GROUP BY 1
+    ORDER BY 1
+    """
+)
+
+_FROM_MINUTES = text(
+    """
+    SELECT date_bin(:step, ts, :origin) AS bucket,
+           sum(realized) AS realized,
+           (array_agg(unrealized ORDER BY ts DESC))[1] AS unrealized,
+           sum(fees) AS fees,
+           sum(turnover) AS turnover,
+           count(*) AS minutes,
+           max(ts) AS last_ts
+    FROM (
+        SELECT ts, sum(realized) AS realized, sum(unrealized) AS unrealized,
+               sum(fees) AS fees, sum(turnover) AS turnover
+        FROM pnl_minute
+        WHERE ts >= date_bin(:step, :start, :origin) AND ts < :end
+          AND (CAST(:instrument_id AS bigint) = 0 OR instrument_id = :instrument_id)
+        GROUP BY ts
+    ) m
+    GROUP BY 1
+    ORDER BY 1
+    """
+)
+
+
+def pick_step(start: datetime, end: datetime, max_points: int = 1000) -> timedelta:
+    """The finest of STEPS that keeps (end - start) within `max_points` buckets."""
+    span = end - start
+    for step in STEPS:
+        if span / step <= max_points:
+            return step
+    return STEPS[-1]
+
+
+def source_for(step: timedelta) -> Optional[str]:
+    """Coarsest rollup whose buckets tile `step` exactly; None means raw pnl_minute."""
+    for resolution, width in ROLLUPS:
+        if step >= width and step % width == timedelta(0):
+            return resolution
+    return None
+
+
+async def pnl_series(
+    session: AsyncSession | AsyncConnection,
+    start: datetime,
+    end: datetime,
+    step: Optional[timedelta] = None,
+    instrument_id: Optional[int] = None,
+    max_points: int = 1000,
+) -> List[Dict[str, Any]]:
+    """
+    PnL per `step` bucket over [start, end) for one instrument, or the account when
+    `instrument_id` is None. Without `step`, one is picked so at most `max_points`
+    buckets come back. Buckets are aligned to IST; the first one starts at or before
+    `start`. Reads the coarsest rollup that tiles `step`, so a 12-month daily chart
+    reads about 365 rows per series instead of every minute.
+    """
+    if end <= start:
+        return []
+    step = step or pick_step(start, end, max_points)
+    if step < timedelta(minutes=1):
+        raise ValueError("step must be at least one minute")
+    params: Dict[str, Any] = {
+        "step": step,
+        "origin": ORIGIN,
+        "start": start,
+        "end": end,
+        "instrument_id": ACCOUNT if instrument_id is None else instrument_id,
+    }
+    resolution = source_for(step)
+    if resolution is None:
+        res = await session.execute(_FROM_MINUTES, params)
+    else:
+        res = await session.execute(_FROM_ROLLUP, {**params, "resolution": resolution})
+    return [dict(m) for m in res.mappings().all()]
+
+
+# --- backfill / repair ---
+
+
+async def refresh_rollups(
+    conn: AsyncSession | AsyncConnection,
+    start: datetime,
+    end: datetime,
+    instrument_ids: Optional[Sequence[int]] = None,
+) -> int:
+    """
+    Recompute every rollup bucket overlapping [start, end) from pnl_minute, for the
+    given instruments (default: all) and the account total; returns rows written.
+    Buckets older than the oldest pnl_minute row are left alone.
+    """
+    res = await conn.execute(
+        text("SELECT pnl_rollup_refresh(:lo, :hi, :ids)"),
+        {"lo": start, "hi": end, "ids": list(instrument_ids) if instrument_ids else None},
+    )
+    return int(res.scalar_one())
+
+
+async def backfill(
+    engine: AsyncEngine,
+    start: date,
+    end: date,
+    instrument_ids: Optional[Sequence[int]] = None,
+) -> int:
+    """`refresh_rollups` over the IST days [start, end), committing one day at a time."""
+    total = 0
+    day = start
+    while day < end:
+        lo = datetime.combine(day, time(), IST)
+        async with engine.begin() as conn:
+            total += await refresh_rollups(conn, lo, lo + timedelta(days=1), instrument_ids)
+        day += timedelta(days=1)
+    return total
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from .session import create_engine
+
+    parser = argparse.ArgumentParser(description="Backfill or repair pnl_rollup from pnl_minute")
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="first IST day")
+    parser.add_argument("--end", type=date.fromisoformat, required=True, help="day after last")
+    parser.add_argument("--instrument", type=int, action="append", help="repeatable")
+    args = parser.parse_args(argv)
+
+    async def run() -> int:
+        engine = create_engine()
+        try:
+            return await backfill(engine, args.start, args.end, args.instrument)
+        finally:
+            await engine.dispose()
+
+    print(f"pnl_rollup: {asyncio.run(run())} rows written")
+
+
+if __name__ == "__main__":
+    main()
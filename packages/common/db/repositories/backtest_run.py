@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime
+from typing import Any, List, Mapping, Optional, Sequence, Union
+from uuid import UUID, uuid4
+
+from sqlalchemy import Table, null, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..artifacts import ArtifactStore
+from ..columnar import LazyTrades, TradeTable, Where, summarize
+from ..instrumentation import instrumented
+from .base import BaseRepository
+
+# Everything but the legacy trades JSONB.
+LISTING_COLUMNS = (
+    "id",
+    "created_at",
+    "config_id",
+    "seed",
+    "tag",
+    "artifact_path",
+    "metrics",
+    "summary",
+    "trades_ref",
+    "trades_count",
+)
+
+
+class BacktestRunRepository(BaseRepository):
+    """
+    backtest_run rows with their trades kept as columnar artifacts in `store` (see
+    `columnar.TradeTable`); the row holds the artifact URI, trade count and a summary.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        backtest_run: Table,
+        store: ArtifactStore,
+        prefix: str = "backtest_runs",
+    ) -> None:
+        super().__init__(session, backtest_run, id_column="id")
+        self.store = store
+        self.prefix = prefix
+
+    @instrumented("create_run")
+    async def create_run(
+        self, values: Mapping[str, Any], trades: Sequence[Mapping[str, Any]]
+    ) -> Mapping[str, Any]:
+        """
+        Write `trades` to the store, then insert the run (`values`, which needs metrics)
+        pointing at them. The artifact is removed again if the insert fails; one left
+        behind by a later rollback is harmless, since nothing references it.
+        """
+        values = dict(values)
+        run_id = values.setdefault("id", uuid4())
+        table = TradeTable.from_rows(trades)
+        uri = await asyncio.to_thread(
+            self.store.put, f"{self.prefix}/{run_id}/trades.npz", table.to_bytes()
+        )
+        try:
+            return await self.create(
+                {
+                    **values,
+                    "trades": null(),  # SQL NULL, not JSON null
+                    "trades_ref": uri,
+                    "trades_count": len(table),
+                    "summary": summarize(table),
+                }
+            )
+        except BaseException:
+            await asyncio.to_thread(self.store.delete, uri)
+            raise
+
+    @instrumented("list_runs")
+    async def list_runs(
+        self,
+        limit: int = 500,
+        ids: Optional[Sequence[UUID]] = None,
+        tag_prefix: Optional[str] = None,
+    ) -> List[Mapping[str, Any]]:
+        """Newest runs first, without trades: metrics, summary and the trades reference."""
+        t = self.table
+        stmt = select(*(t.c[c] for c in LISTING_COLUMNS))
+        if ids is not None:
+            stmt = stmt.where(t.c.id.in_(list(ids)))
+        if tag_prefix is not None:
+            stmt = stmt.where(t.c.tag.startswith(tag_prefix, autoescape=True))
+        stmt = stmt.order_by(t.c.created_at.desc(), t.c.id.desc()).limit(limit)
+        res = await self.session.execute(stmt)
+        return [dict(m) for m in res.mappings().all()]
+
+    def trades(self, run: Mapping[str, Any]) -> LazyTrades:
+        """Lazy handle to a listed run's trades (needs `trades_ref`)."""
+        if run.get("trades_ref") is None:
+            raise ValueError(f"backtest run {run.get('id')} has no trades artifact")
+        return LazyTrades(self.store, run["trades_ref"], run.get("trades_count"))
+
+    @instrumented("load_trades")
+    async def load_trades(
+        self,
+        run: Union[UUID, Mapping[str, Any]],
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[Where] = None,
+    ) -> TradeTable:
+        """
+        A run's trades (by id or listed row), projected to `columns` and filtered by
+        `where`. Runs not yet externalized are read from the trades JSONB instead.
+        """
+        if not isinstance(run, Mapping) or "trades_ref" not in run:
+            t = self.table
+            run_id = run["id"] if isinstance(run, Mapping) else run
+            res = await self.session.execute(
+                select(t.c.id, t.c.trades_ref, t.c.trades_count).where(t.c.id == run_id)
+            )
+            row = res.mappings().one()
+            run = dict(row)
+        if run["trades_ref"] is not None:
+            return await asyncio.to_thread(self.trades(run).load, columns, where)
+        res = await self.session.execute(
+            select(self.table.c.trades).where(self.table.c.id == run["id"])
+        )
+        legacy: Optional[List[Mapping[str, Any]]] = res.scalar_one()
+        return TradeTable.from_rows(legacy or []).project(columns, where)
+
+    @instrumented("externalize_trades")
+    async def externalize_trades(self, batch_size: int = 50) -> int:
+        """Move trades of rows written before the artifact store out of the JSONB column;
+        returns how many runs were moved."""
+        t = self.table
+        moved = 0
+        while True:
+            res = await self.session.execute(
+                select(t.c.id, t.c.trades)
+                .where(t.c.trades_ref.is_(None), t.c.trades.is_not(None))
+                .order_by(t.c.id)
+                .limit(batch_size)
+            )
+            rows = res.mappings().all()
+            if not rows:
+                return moved
+            for row in rows:
+                run_id = row["id"]
+                table = TradeTable.from_rows(row["trades"] or [])
+                uri = await asyncio.to_thread(
+                    self.store.put, f"{self.prefix}/{run_id}/trades.npz", table.to_bytes()
+                )
+                await self.session.execute(
+                    update(t)
+                    .where(t.c.id == run_id)
+                    .values(
+                        trades=null(),
+                        trades_ref=uri,
+                        trades_count=len(table),
+                        summary=summarize(table),
+                    )
+                )
+                moved += 1
+
+    @instrumented("internalize_trades")
+    async def internalize_trades(self, batch_size: int = 50) -> int:
+        """Copy externalized trades back into the JSONB column and clear the reference
+        (needed before downgrading past 0006); returns how many runs were copied. The
+        artifacts are left in the store."""
+        t = self.table
+        copied = 0
+        while True:
+            res = await self.session.execute(
+                select(t.c.id, t.c.trades_ref, t.c.trades_count)
+                .where(t.c.trades_ref.is_not(None))
+                .order_by(t.c.id)
+                .limit(batch_size)
+            )
+            rows = res.mappings().all()
+            if not rows:
+                return copied
+            for row in rows:
+                trades = await asyncio.to_thread(self.trades(dict(row)).rows)
+                await self.session.execute(
+                    update(t)
+                    .where(t.c.id == row["id"])
+                    .values(
+                        trades=[_json_trade(trade) for trade in trades],
+                        trades_ref=None,
+                        trades_count=None,
+                        summary=None,
+                    )
+                )
+                copied += 1
+
+
+def _json_trade(trade: Mapping[str, Any]) -> dict[str, Any]:
+    return {k: v.isoformat() if isinstance(v, (datetime, date)) else v for k, v in trade.items()}
@@ -1,35 +1,86 @@
 from __future__ import annotations
 
-from typing import Any, List, Mapping, Optional
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-from sqlalchemy import Table, delete, insert, select, update
+from pydantic import BaseModel
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    Table,
+    delete,
+    insert,
+    literal_column,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..instrumentation import instrumented, query_labels
+from .upsert import Merge, Outcome, UpsertResult, conflict_target, fold_duplicates, replace
+
+Row = Union[Mapping[str, Any], BaseModel]
+Rows = Union[Iterable[Row], AsyncIterable[Row]]
+
+# asyncpg caps a statement at 32767 bind parameters
+MAX_BIND_PARAMS = 32767
+
+
+@dataclass(frozen=True)
+class Page:
+    """One keyset page; pass `next_after` back as `after` to continue (None = last page)."""
+
+    rows: List[Mapping[str, Any]]
+    next_after: Optional[Tuple[Any, ...]]
+
 
 class BaseRepository:
-    """Generic CRUD operations using SQLAlchemy Core."""
+    """
+    Generic CRUD operations using SQLAlchemy Core. Calls are timed and their statements
+    labelled with `name` (the table name) and the operation, see `instrumentation`.
+    """
 
     def __init__(self, session: AsyncSession, table: Table, id_column: str = "id") -> None:
         self.session = session
         self.table = table
+        self.name = table.name
         self.id_col = self.table.c[id_column]
 
+    @instrumented("create")
     async def create(self, values: Mapping[str, Any]) -> Mapping[str, Any]:
         stmt = insert(self.table).values(**dict(values)).returning(self.table)
         res = await self.session.execute(stmt)
         return dict(res.mappings().one())
 
+    @instrumented("get")
     async def get(self, id_: Any) -> Optional[Mapping[str, Any]]:
         stmt = select(self.table).where(self.id_col == id_)
         res = await self.session.execute(stmt)
         row = res.mappings().first()
         return dict(row) if row else None
 
+    @instrumented("list")
     async def list(self, limit: int = 100, offset: int = 0) -> List[Mapping[str, Any]]:
         stmt = select(self.table).limit(limit).offset(offset)
         res = await self.session.execute(stmt)
         return [dict(m) for m in res.mappings().all()]
 
+    @instrumented("update")
     async def update(self, id_: Any, values: Mapping[str, Any]) -> Optional[Mapping[str, Any]]:
         stmt = (
             update(self.table)
@@ -41,7 +92,261 @@ class BaseRepository:
         row = res.mappings().first()
         return dict(row) if row else None
 
+    @instrumented("delete")
     async def delete(self, id_: Any) -> int:
         stmt = delete(self.table).where(self.id_col == id_)
         res = await self.session.execute(stmt)
         return res.rowcount or 0
+
+    # --- large reads ---
+
+    def _ordered(
+        self,
+        order_by: Optional[Sequence[str]],
+        descending: bool,
+        where: Optional[ColumnElement[bool]],
+    ) -> Tuple[Select[Any], List[Any]]:
+        keys = [self.table.c[name] for name in order_by] if order_by else [self.id_col]
+        stmt = select(self.table)
+        if where is not None:
+            stmt = stmt.where(where)
+        return stmt.order_by(*(k.desc() if descending else k.asc() for k in keys)), keys
+
+    @instrumented("page")
+    async def page(
+        self,
+        limit: int = 100,
+        after: Optional[Sequence[Any]] = None,
+        order_by: Optional[Sequence[str]] = None,
+        descending: bool = False,
+        where: Optional[ColumnElement[bool]] = None,
+    ) -> Page:
+        """
+        Keyset pagination: rows strictly after the `after` key in `order_by` order (default:
+        the id column). Cost is independent of page depth when an index covers the keys.
+        End `order_by` with a unique column, e.g. ("ts", "id"), so ties are not skipped.
+        """
+        stmt, keys = self._ordered(order_by, descending, where)
+        if after is not None:
+            if len(after) != len(keys):
+                raise ValueError(f"after must have {len(keys)} values, got {len(after)}")
+            lhs, rhs = tuple_(*keys), tuple_(*after)
+            stmt = stmt.where(lhs < rhs if descending else lhs > rhs)
+        res = await self.session.execute(stmt.limit(limit))
+        rows: List[Mapping[str, Any]] = [dict(m) for m in res.mappings().all()]
+        next_after = None
+        if len(rows) == limit and rows:
+            next_after = tuple(rows[-1][k.name] for k in keys)
+        return Page(rows, next_after)
+
+    async def stream(
+        self,
+        fetch_size: int = 1000,
+        order_by: Optional[Sequence[str]] = None,
+        descending: bool = False,
+        where: Optional[ColumnElement[bool]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield rows one at a time from a server-side cursor, `fetch_size` rows per fetch."""
+        async for part in self._partitions(fetch_size, order_by, descending, where):
+            for m in part:
+                yield dict(m)
+
+    async def stream_columns(
+        self,
+        fetch_size: int = 1000,
+        order_by: Optional[Sequence[str]] = None,
+        descending: bool = False,
+        where: Optional[ColumnElement[bool]] = None,
+    ) -> AsyncIterator[Dict[str, List[Any]]]:
+        """Like `stream`, but yields each fetch as {column: [values]} without row dicts."""
+        names = [c.name for c in self.table.c]
+        async for part in self._partitions(fetch_size, order_by, descending, where, raw=True):
+            yield dict(zip(names, (list(col) for col in zip(*part))))
+
+    async def _partitions(
+        self,
+        fetch_size: int,
+        order_by: Optional[Sequence[str]],
+        descending: bool,
+        where: Optional[ColumnElement[bool]],
+        raw: bool = False,
+    ) -> AsyncIterator[Sequence[Any]]:
+        stmt, _ = self._ordered(order_by, descending, where)
+        with query_labels(repository=self.name, operation="stream"):
+            res = await self.session.stream(stmt.execution_options(yield_per=fetch_size))
+        source = res if raw else res.mappings()
+        async for part in source.partitions(fetch_size):
+            yield part
+
+    # --- bulk writes ---
+
+    @instrumented("create_many")
+    async def create_many(
+        self, rows: Rows, chunk_size: int = 1000, returning: bool = True
+    ) -> List[Mapping[str, Any]]:
+        """
+        Multi-row INSERT ... RETURNING, for bulk writes that need generated ids/defaults
+        back. Chunks are capped so a statement stays under asyncpg's parameter limit.
+        With `returning=False` nothing is sent back and an empty list is returned.
+        """
+        out: List[Mapping[str, Any]] = []
+        async for columns, chunk in self._chunks(rows, chunk_size, per_row_params=True):
+            stmt = insert(self.table).values([dict(zip(columns, r)) for r in chunk])
+            if not returning:
+                await self.session.execute(stmt)
+                continue
+            res = await self.session.execute(stmt.returning(self.table))
+            out.extend(dict(m) for m in res.mappings().all())
+        return out
+
+    @instrumented("copy_in")
+    async def copy_in(self, rows: Rows, chunk_size: int = 10_000) -> int:
+        """
+        Stream rows into the table with asyncpg's binary COPY on the session's connection
+        (same transaction). Returns the row count; nothing is returned per row, so use
+        `create_many` when generated ids are needed. Columns left out take their defaults.
+        """
+        conn = await self.session.connection()
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        if driver is None or not hasattr(driver, "copy_records_to_table"):
+            raise RuntimeError("copy_in requires the asyncpg driver")
+        total = 0
+        async for columns, chunk in self._chunks(rows, chunk_size, per_row_params=False):
+            await driver.copy_records_to_table(
+                self.table.name,
+                records=chunk,
+                columns=list(columns),
+                schema_name=self.table.schema,
+            )
+            total += len(chunk)
+        return total
+
+    @instrumented("upsert_many")
+    async def upsert_many(
+        self,
+        rows: Rows,
+        conflict: str,
+        merge: Optional[Mapping[str, Merge]] = None,
+        on_conflict: Literal["update", "nothing"] = "update",
+        chunk_size: int = 1000,
+    ) -> UpsertResult:
+        """
+        Idempotent bulk write: INSERT ... ON CONFLICT against the unique constraint,
+        primary key or unique (partial) index named `conflict`, one statement per chunk.
+
+        With on_conflict="update", each non-key column is combined with the stored row
+        by its `merge` rule (default `replace`), and a row whose merge changes nothing
+        is not rewritten. Rows repeating a key within the batch are folded first with
+        the same rules. The result reports, per input row, whether it was "inserted",
+        "updated" or "skipped" (conflict left the stored row as it was); rows folded
+        together share their group's outcome. Key values are matched back to RETURNING,
+        so pass them in the column's Python type (int, datetime, ...).
+        """
+        target = conflict_target(self.table, conflict)
+        key = target.columns
+        rules = dict(merge or {})
+        unknown = [c for c in rules if c not in self.table.c]
+        if unknown:
+            raise ValueError(f"{self.table.name} has no columns {unknown}")
+
+        columns: Sequence[str] = ()
+        given: List[Dict[str, Any]] = []
+        async for columns, chunk in self._chunks(rows, chunk_size, per_row_params=True):
+            given.extend(dict(zip(columns, r)) for r in chunk)
+        if not given:
+            return UpsertResult()
+        missing = [c for c in key if c not in columns]
+        if missing:
+            raise ValueError(f"rows must carry the {conflict} columns {missing}")
+
+        folded, group = fold_duplicates(given, key, rules)
+        limit = max(1, min(chunk_size, MAX_BIND_PARAMS // len(columns)))
+        outcome: Dict[Tuple[Any, ...], Outcome] = {}
+        result = UpsertResult()
+        for i in range(0, len(folded), limit):
+            stmt = postgresql.insert(self.table).values(folded[i : i + limit])
+            updates = {
+                c: rules.get(c, replace()).sql(self.table, stmt.excluded, c)
+                for c in columns
+                if c not in key
+            }
+            if on_conflict == "nothing" or not updates:
+                stmt = stmt.on_conflict_do_nothing(**target.on_conflict_kwargs())
+                res = await self.session.execute(stmt.returning(self.table))
+                written = [(dict(m), False) for m in res.mappings().all()]
+            else:
+                stored = tuple_(*(self.table.c[c] for c in updates))
+                stmt = stmt.on_conflict_do_update(
+                    set_=updates,
+                    where=stored.is_distinct_from(tuple_(*updates.values())),
+                    **target.on_conflict_kwargs(),
+                )
+                # The outer SELECT sees the table as it was before the INSERT, so a
+                # returned key that already existed there was updated. (xmax = 0 would
+                # tell the same, but cannot be returned from partitioned tables.)
+                upserted = stmt.returning(self.table).cte("upserted")
+                prior = self.table.alias("prior")
+                existed = (
+                    select(literal_column("1"))
+                    .where(*(prior.c[c] == upserted.c[c] for c in key))
+                    .exists()
+                )
+                res = await self.session.execute(select(upserted, existed.label("vt_existed")))
+                written = []
+                for m in res.mappings().all():
+                    row = dict(m)
+                    written.append((row, bool(row.pop("vt_existed"))))
+            for row, existed_before in written:
+                outcome[tuple(row[c] for c in key)] = "updated" if existed_before else "inserted"
+                result.rows.append(row)
+
+        for slot in group:
+            k = tuple(folded[slot][c] for c in key)
+            if any(v is None for v in k):  # NULL keys never conflict
+                result.outcomes.append("inserted")
+            else:
+                result.outcomes.append(outcome.get(k, "skipped"))
+        return result
+
+    async def _chunks(
+        self, rows: Rows, chunk_size: int, per_row_params: bool
+    ) -> AsyncIterable[Tuple[Sequence[str], List[Tuple[Any, ...]]]]:
+        """
+        Normalize rows to value tuples in a fixed column order (taken from the first row;
+        every row must carry the same keys) and yield them in chunks.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        columns: Optional[Tuple[str, ...]] = None
+        limit = chunk_size
+        chunk: List[Tuple[Any, ...]] = []
+        async for row in _aiter(rows):
+            values = row.model_dump() if isinstance(row, BaseModel) else row
+            if columns is None:
+                columns = tuple(values)
+                unknown = [c for c in columns if c not in self.table.c]
+                if unknown:
+                    raise ValueError(f"{self.table.name} has no columns {unknown}")
+                if per_row_params:
+                    limit = max(1, min(chunk_size, MAX_BIND_PARAMS // max(len(columns), 1)))
+            elif len(values) != len(columns):
+                raise ValueError(f"all rows must have the columns {list(columns)}")
+            try:
+                chunk.append(tuple(values[c] for c in columns))
+            except KeyError as exc:
+                raise ValueError(f"all rows must have the columns {list(columns)}") from exc
+            if len(chunk) >= limit:
+                yield columns, chunk
+                chunk = []
+        if chunk and columns is not None:
+            yield columns, chunk
+
+
+async def _aiter(rows: Rows) -> AsyncIterable[Row]:
+    if isinstance(rows, AsyncIterable):
+        async for row in rows:
+            yield row
+    else:
+        for row in rows:
+            yield row
@@ -5,6 +5,7 @@ from typing import Any, Mapping, Optional
 from sqlalchemy import Table, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..instrumentation import instrumented
 from .base import BaseRepository
 
 
@@ -12,6 +13,7 @@ class ConfigRepository(BaseRepository):
     def __init__(self, session: AsyncSession, config: Table) -> None:
         super().__init__(session, config, id_column="id")
 
+    @instrumented("get_active")
     async def get_active(self, key: str = "trading") -> Optional[Mapping[str, Any]]:
         stmt = select(self.table).where(
             (self.table.c.key == key) & (self.table.c.is_active.is_(True))
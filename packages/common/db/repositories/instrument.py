@@ -5,6 +5,8 @@ from typing import Any, Mapping, Optional
 from sqlalchemy import Table, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..instrument_index import InstrumentIndex, load_instrument_index
+from ..instrumentation import instrumented
 from .base import BaseRepository
 
 
@@ -12,8 +14,14 @@ class InstrumentRepository(BaseRepository):
     def __init__(self, session: AsyncSession, instrument: Table) -> None:
         super().__init__(session, instrument, id_column="id")
 
+    @instrumented("get_by_symbol")
     async def get_by_symbol(self, symbol: str) -> Optional[Mapping[str, Any]]:
         stmt = select(self.table).where(self.table.c.symbol == symbol)
         res = await self.session.execute(stmt)
         row = res.mappings().first()
         return dict(row) if row else None
+
+    @instrumented("load_index")
+    async def load_index(self, exchange: str = "NSE") -> InstrumentIndex:
+        """All instruments of `exchange` as an in-process index (one query)."""
+        return await load_instrument_index(self.session, self.table, exchange)
@@ -5,15 +5,54 @@ from typing import Any, Mapping, Optional
 from sqlalchemy import Table, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .base import BaseRepository
+from ..instrumentation import instrumented
+from ..order_book import OpenOrderBook, load_open_order_book
+from .base import BaseRepository, Rows
+from .upsert import Merge, UpsertResult, coalesce, greatest, keep, ranked
+
+# Order statuses from least to most advanced; terminal states share the top rank, so
+# the first one recorded sticks and late or replayed postbacks cannot move it back.
+STATUS_PROGRESSION = ranked(
+    "NEW",
+    "PENDING",
+    "TRIGGER_PENDING",
+    "OPEN",
+    "PARTIALLY_FILLED",
+    ("FILLED", "CANCELLED", "REJECTED", "EXPIRED"),
+)
+
+POSTBACK_MERGE: Mapping[str, Merge] = {
+    "status": STATUS_PROGRESSION,
+    "updated_at": greatest(),
+    "rejection_reason": coalesce(),
+    "placed_at": keep(),
+    "client_id": keep(),
+    "signal_id": coalesce(),
+    "parent_id": coalesce(),
+}
 
 
 class OrderRepository(BaseRepository):
     def __init__(self, session: AsyncSession, order: Table) -> None:
         super().__init__(session, order, id_column="id")
 
+    @instrumented("get_by_client_id")
     async def get_by_client_id(self, client_id: str) -> Optional[Mapping[str, Any]]:
         stmt = select(self.table).where(self.table.c.client_id == client_id)
         res = await self.session.execute(stmt)
         row = res.mappings().first()
         return dict(row) if row else None
+
+    @instrumented("load_open_book")
+    async def load_open_book(self, instrument: Table) -> OpenOrderBook:
+        """All open orders as an in-process book (one query over ix_order__open)."""
+        return await load_open_order_book(self.session, self.table, instrument)
+
+    async def apply_postbacks(self, rows: Rows, chunk_size: int = 1000) -> UpsertResult:
+        """
+        Reconcile broker postbacks keyed by broker_order_id: unknown orders are inserted,
+        known ones merged with POSTBACK_MERGE, and duplicates or stale updates skipped.
+        """
+        return await self.upsert_many(
+            rows, "uq_order__broker_order_id", POSTBACK_MERGE, chunk_size=chunk_size
+        )
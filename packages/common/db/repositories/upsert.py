@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Literal, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import ColumnElement, Index, Table, UniqueConstraint, case, func, or_, text
+
+Outcome = Literal["inserted", "updated", "skipped"]
+
+
+@dataclass(frozen=True)
+class Merge:
+    """
+    How an upsert combines the stored value of a column with the incoming one.
+
+    Each rule has a SQL form (used in ON CONFLICT DO UPDATE) and an equivalent Python
+    form (used to fold duplicates of the same key inside one batch, which Postgres
+    would otherwise reject). Build rules with the helpers below.
+    """
+
+    kind: str
+    by: Optional[str] = None
+    ranks: Tuple[Any, ...] = ()
+
+    def sql(self, table: Table, excluded: Any, column: str) -> ColumnElement[Any]:
+        old, new = table.c[column], excluded[column]
+        if self.kind == "replace":
+            return new  # type: ignore[no-any-return]
+        if self.kind == "keep":
+            return old
+        if self.kind == "greatest":
+            return func.greatest(old, new)
+        if self.kind == "least":
+            return func.least(old, new)
+        if self.kind == "coalesce":
+            return func.coalesce(old, new)
+        if self.kind == "newer":
+            assert self.by is not None
+            old_by, new_by = table.c[self.by], excluded[self.by]
+            return case((or_(old_by.is_(None), new_by >= old_by), new), else_=old)
+        if self.kind == "ranked":
+            return case((self._rank_sql(new) > self._rank_sql(old), new), else_=old)
+        raise ValueError(f"unknown merge rule {self.kind!r}")
+
+    def _rank_sql(self, col: Any) -> ColumnElement[int]:
+        return case(*[(col == v, r) for v, r in self._rank_of().items()], else_=-1)
+
+    def _rank_of(self) -> Dict[Any, int]:
+        return {
+            v: i
+            for i, level in enumerate(self.ranks)
+            for v in (level if isinstance(level, tuple) else (level,))
+        }
+
+    def fold(self, old: Mapping[str, Any], new: Mapping[str, Any], column: str) -> Any:
+        a, b = old.get(column), new.get(column)
+        if self.kind == "replace":
+            return b
+        if self.kind == "keep":
+            return a
+        if self.kind in ("greatest", "least"):  # NULLs are ignored, as in Postgres
+            if a is None or b is None:
+                return b if a is None else a
+            return max(a, b) if self.kind == "greatest" else min(a, b)
+        if self.kind == "coalesce":
+            return b if a is None else a
+        if self.kind == "newer":
+            assert self.by is not None
+            old_by, new_by = old.get(self.by), new.get(self.by)
+            return b if old_by is None or (new_by is not None and new_by >= old_by) else a
+        if self.kind == "ranked":
+            rank = self._rank_of()
+            return b if rank.get(_plain(b), -1) > rank.get(_plain(a), -1) else a
+        raise ValueError(f"unknown merge rule {self.kind!r}")
+
+
+def replace() -> Merge:
+    """Take the incoming value (plain upsert)."""
+    return Merge("replace")
+
+
+def keep() -> Merge:
+    """Keep the stored value (set once on insert)."""
+    return Merge("keep")
+
+
+def greatest() -> Merge:
+    """Keep the larger value, e.g. a filled quantity that only grows."""
+    return Merge("greatest")
+
+
+def least() -> Merge:
+    return Merge("least")
+
+
+def coalesce() -> Merge:
+    """Keep the stored value unless it is NULL (fill in missing data)."""
+    return Merge("coalesce")
+
+
+def newer(by: str) -> Merge:
+    """Take the incoming value if its `by` column is at least the stored one."""
+    return Merge("newer", by=by)
+
+
+def ranked(*levels: Any) -> Merge:
+    """
+    Take the incoming value only if it ranks higher in `levels` (earliest = lowest), e.g.
+    a status that must not move backwards. A level may be a tuple of equally ranked
+    values: whichever arrives first is kept. Values not listed rank below all others.
+    """
+    return Merge("ranked", ranks=tuple(_plain(level) for level in levels))
+
+
+def _plain(v: Any) -> Any:
+    if isinstance(v, tuple):
+        return tuple(_plain(x) for x in v)
+    return getattr(v, "value", v)
+
+
+@dataclass
+class UpsertResult:
+    """Per input row outcome (same order as the input) and the rows written."""
+
+    outcomes: List[Outcome] = field(default_factory=list)
+    rows: List[Mapping[str, Any]] = field(default_factory=list)
+
+    def count(self, outcome: Outcome) -> int:
+        return self.outcomes.count(outcome)
+
+    @property
+    def inserted(self) -> int:
+        return self.count("inserted")
+
+    @property
+    def updated(self) -> int:
+        return self.count("updated")
+
+    @property
+    def skipped(self) -> int:
+        return self.count("skipped")
+
+
+@dataclass(frozen=True)
+class ConflictTarget:
+    """The columns (and partial-index predicate) an ON CONFLICT clause arbitrates on."""
+
+    name: str
+    columns: Tuple[str, ...]
+    constraint: Optional[str] = None  # set for real constraints (ON CONSTRAINT name)
+    where: Any = None  # partial unique index predicate
+
+    def on_conflict_kwargs(self) -> Dict[str, Any]:
+        if self.constraint is not None:
+            return {"constraint": self.constraint}
+        return {"index_elements": list(self.columns), "index_where": self.where}
+
+
+def conflict_target(table: Table, name: str) -> ConflictTarget:
+    """Resolve a unique constraint, primary key or unique (partial) index by name."""
+    pk = table.primary_key
+    if pk is not None and pk.name == name:
+        return ConflictTarget(name, tuple(c.name for c in pk.columns), constraint=name)
+    for c in table.constraints:
+        if isinstance(c, UniqueConstraint) and c.name == name:
+            return ConflictTarget(name, tuple(col.name for col in c.columns), constraint=name)
+    for ix in table.indexes:
+        if isinstance(ix, Index) and ix.name == name and ix.unique:
+            where = ix.dialect_options["postgresql"].get("where")
+            if isinstance(where, str):
+                where = text(where)
+            return ConflictTarget(name, tuple(col.name for col in ix.columns), where=where)
+    raise ValueError(f"{table.name} has no unique constraint or index named {name!r}")
+
+
+def fold_duplicates(
+    rows: Sequence[Dict[str, Any]],
+    key: Sequence[str],
+    merge: Mapping[str, Merge],
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """
+    Collapse rows sharing a conflict key (in input order) with the merge rules; returns
+    the folded rows and, per input row, the index of the folded row it went into. Rows
+    with a NULL key column never conflict and are kept as they are.
+    """
+    folded: List[Dict[str, Any]] = []
+    slot_of: Dict[Tuple[Any, ...], int] = {}
+    group: List[int] = []
+    for row in rows:
+        k = tuple(row.get(c) for c in key)
+        slot = None if any(v is None for v in k) else slot_of.get(k)
+        if slot is None:
+            slot = len(folded)
+            folded.append(dict(row))
+            if not any(v is None for v in k):
+                slot_of[k] = slot
+        else:
+            old = folded[slot]
+            folded[slot] = {
+                c: merge.get(c, replace()).fold(old, row, c) if c not in key else old[c]
+                for c in old
+            }
+        group.append(slot)
+    return folded, group
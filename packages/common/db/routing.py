@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Optional
+
+from sqlalchemy import CompoundSelect, Select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from .session import create_sessionmaker
+
+# session.info key set once the session has written (or was pinned explicitly)
+PINNED = "vt_pinned_to_primary"
+
+# Seconds the replica is behind. A replica whose received WAL is fully replayed is
+# current even if the last replayed transaction is old (idle primary); the primary
+# itself (not in recovery) has no lag.
+_LAG = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0.0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0.0
+        ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0.0)
+    END
+    """
+)
+
+
+class ReplicaMonitor:
+    """
+    Tracks replication lag of a read replica. `usable` is False until the first check,
+    when the last check failed or is older than `stale_after_s`, or when the lag exceeds
+    `max_lag_s`; routed sessions then read from the primary. `start()` checks every
+    `interval_s` in the background.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        max_lag_s: float = 5.0,
+        interval_s: float = 1.0,
+        stale_after_s: Optional[float] = None,
+    ) -> None:
+        self.engine = engine
+        self.max_lag_s = max_lag_s
+        self.interval_s = interval_s
+        self.stale_after_s = 3 * interval_s if stale_after_s is None else stale_after_s
+        self.lag_s: Optional[float] = None  # None: unknown or replica unreachable
+        self.checked_at: Optional[float] = None
+        self.failures = 0
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def usable(self) -> bool:
+        if self.lag_s is None or self.checked_at is None:
+            return False
+        if time.monotonic() - self.checked_at > self.stale_after_s:
+            return False
+        return self.lag_s <= self.max_lag_s
+
+    def update(self, lag_s: Optional[float]) -> None:
+        self.lag_s = lag_s
+        self.checked_at = time.monotonic()
+
+    async def check(self) -> Optional[float]:
+        try:
+            async with self.engine.connect() as conn:
+                lag = float((await conn.execute(_LAG)).scalar_one())
+        except Exception:
+            self.failures += 1
+            lag = None
+        self.update(lag)
+        return lag
+
+    async def start(self) -> None:
+        await self.check()
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def __aenter__(self) -> ReplicaMonitor:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_s)
+            await self.check()
+
+
+class RoutingSession(Session):
+    """
+    Sends plain SELECTs to the replica and everything else (INSERT/UPDATE/DELETE, text(),
+    SELECT ... FOR UPDATE, raw connections) to the primary.
+
+    Read-your-writes: once the session has sent a write to the primary, later reads in
+    the same session go there too, until the session is closed. Reads also fall back to
+    the primary while `monitor` reports the replica as lagging or unreachable.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replica: Optional[Engine] = None,
+        monitor: Optional[ReplicaMonitor] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replica = replica
+        self.monitor = monitor
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Engine | Connection:
+        if self._reads_replica(clause):
+            assert self.replica is not None
+            return self.replica
+        if not isinstance(clause, (Select, CompoundSelect)):
+            self.info[PINNED] = True
+        return self.primary
+
+    def _reads_replica(self, clause: Any) -> bool:
+        if self.replica is None or self.info.get(PINNED) or self._flushing:
+            return False
+        if isinstance(clause, Select):
+            if clause._for_update_arg is not None:
+                return False
+        elif not isinstance(clause, CompoundSelect):
+            return False
+        return self.monitor is None or self.monitor.usable
+
+    def close(self) -> None:
+        super().close()
+        self.info.pop(PINNED, None)
+
+
+def pin_to_primary(session: AsyncSession) -> None:
+    """Send the rest of this session's reads to the primary (e.g. before a read whose
+    result must reflect a write made through another session)."""
+    session.info[PINNED] = True
+
+
+def is_pinned(session: AsyncSession) -> bool:
+    return bool(session.info.get(PINNED))
+
+
+def create_routing_sessionmaker(
+    primary: AsyncEngine,
+    replica: Optional[AsyncEngine] = None,
+    monitor: Optional[ReplicaMonitor] = None,
+) -> async_sessionmaker[AsyncSession]:
+    """
+    Session factory whose repository reads go to `replica` (see `create_read_engine`)
+    and writes to `primary`. Without a replica this is `create_sessionmaker(primary)`.
+    """
+    if replica is None:
+        return create_sessionmaker(primary)
+    return async_sessionmaker(
+        expire_on_commit=False,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        primary=primary.sync_engine,
+        replica=replica.sync_engine,
+        monitor=monitor,
+    )
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 import os
-from typing import Any, Optional
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Union
 
+from sqlalchemy import event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool
+
+from .instrumentation import instrument_engine
 
 
 def get_database_url() -> str:
@@ -24,20 +31,296 @@ def get_database_url() -> str:
     return url
 
 
-def create_engine(echo: bool = False) -> AsyncEngine:
+def get_database_read_url() -> Optional[str]:
+    """The read replica's URL from DATABASE_READ_URL (asyncpg driver), or None if unset."""
+    url = os.getenv("DATABASE_READ_URL")
+    if not url or not url.strip():
+        return None
+    if url.startswith("postgresql+psycopg://"):
+        url = url.replace("postgresql+psycopg://", "postgresql+asyncpg://", 1)
+    elif url.startswith("postgresql://"):
+        url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+# --- engine profiles ---
+
+
+@dataclass(frozen=True)
+class EngineProfile:
     """
-    Create an AsyncEngine. In CI/tests we default to NullPool to ensure each acquire
-    gets a fresh connection and to avoid cross-task reuse that can trigger:
-      asyncpg.InterfaceError: cannot perform operation: another operation is in progress
-    Toggle via SQLALCHEMY_NULLPOOL_FOR_TESTS=0 to opt-out.
+    Pool and connection settings for one kind of process.
+
+    `pool_size = 0` selects NullPool (fresh connection per checkout). `warm_connections`
+    is how many connections `warm_up()` opens ahead of the first real query. `read_only`
+    makes every transaction read-only (used for replica engines).
     """
-    url = get_database_url()
-    use_nullpool = os.getenv("SQLALCHEMY_NULLPOOL_FOR_TESTS", "1") == "1"
-    kwargs: dict[str, Any] = {"echo": echo, "future": True}
-    if use_nullpool:
-        kwargs["poolclass"] = NullPool
-    return create_async_engine(url, **kwargs)
+
+    name: str
+    pool_size: int
+    max_overflow: int = 0
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
+    statement_timeout_ms: Optional[int] = None
+    application_name: str = "vaayutrade"
+    warm_connections: int = 0
+    read_only: bool = False
+
+    def engine_kwargs(self) -> Dict[str, Any]:
+        server_settings = {"application_name": self.application_name}
+        if self.statement_timeout_ms is not None:
+            server_settings["statement_timeout"] = str(self.statement_timeout_ms)
+        if self.read_only:
+            server_settings["default_transaction_read_only"] = "on"
+        kwargs: Dict[str, Any] = {
+            "connect_args": {
+                "statement_cache_size": self.statement_cache_size,
+                "server_settings": server_settings,
+            },
+            "pool_pre_ping": self.pool_pre_ping,
+        }
+        if self.pool_size == 0:
+            kwargs["poolclass"] = _MeteredNullPool
+        else:
+            kwargs.update(
+                poolclass=_MeteredQueuePool,
+                pool_size=self.pool_size,
+                max_overflow=self.max_overflow,
+                pool_timeout=self.pool_timeout,
+                pool_recycle=self.pool_recycle,
+            )
+        return kwargs
+
+
+PROFILES: Dict[str, EngineProfile] = {
+    # CI/tests: a fresh connection per acquire avoids cross-task reuse that can trigger
+    #   asyncpg.InterfaceError: cannot perform operation: another operation is in progress
+    "test": EngineProfile(
+        name="test",
+        pool_size=0,
+        pool_pre_ping=False,
+        statement_timeout_ms=30_000,
+        application_name="vaayutrade-test",
+    ),
+    # API / dashboard / batch services: moderate pool, bounded burst via overflow.
+    "service": EngineProfile(
+        name="service",
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=10.0,
+        pool_recycle=1800,
+        statement_timeout_ms=15_000,
+        application_name="vaayutrade-service",
+    ),
+    # traderd: small fixed pool kept warm so writes after a fill never pay a handshake;
+    # no overflow (a burst waits briefly instead of opening cold connections) and tight
+    # timeouts so a stuck query surfaces fast.
+    "trading-daemon": EngineProfile(
+        name="trading-daemon",
+        pool_size=4,
+        max_overflow=0,
+        pool_timeout=2.0,
+        pool_recycle=3600,
+        statement_cache_size=500,
+        statement_timeout_ms=2_000,
+        application_name="vaayutrade-traderd",
+        warm_connections=4,
+    ),
+}
+
+
+def get_profile(profile: Union[str, EngineProfile, None] = None) -> EngineProfile:
+    """
+    Resolve a profile by name. Without one, `DB_ENGINE_PROFILE` is used; failing that the
+    legacy switch applies: SQLALCHEMY_NULLPOOL_FOR_TESTS=0 -> "service", else "test".
+    """
+    if isinstance(profile, EngineProfile):
+        return profile
+    name = profile or os.getenv("DB_ENGINE_PROFILE")
+    if not name:
+        name = "test" if os.getenv("SQLALCHEMY_NULLPOOL_FOR_TESTS", "1") == "1" else "service"
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"unknown engine profile {name!r}; choose from {sorted(PROFILES)}")
+
+
+def create_engine(
+    echo: bool = False,
+    profile: Union[str, EngineProfile, None] = None,
+    url: Optional[str] = None,
+    **overrides: Any,
+) -> AsyncEngine:
+    """
+    Create an AsyncEngine configured by an engine profile (see `get_profile`) on `url`
+    (default: DATABASE_URL). `overrides` replace profile fields, e.g.
+    `create_engine(profile="service", pool_size=2)`.
+    Statement timings go to the installed metrics sink (see `instrumentation`).
+    """
+    prof = get_profile(profile)
+    if overrides:
+        prof = replace(prof, **overrides)
+    engine = create_async_engine(url or get_database_url(), echo=echo, **prof.engine_kwargs())
+    pool = engine.sync_engine.pool
+    if isinstance(pool, _MeteredPool):
+        pool.metrics.profile = prof
+        _attach_metrics(pool)
+    instrument_engine(engine)
+    return engine
+
+
+def create_read_engine(
+    echo: bool = False, profile: Union[str, EngineProfile, None] = None, **overrides: Any
+) -> Optional[AsyncEngine]:
+    """
+    Engine on the read replica (DATABASE_READ_URL), or None when no replica is
+    configured. Same profile as `create_engine`, but read-only and tagged "-ro" in
+    application_name; see `routing` for sending repository reads to it.
+    """
+    url = get_database_read_url()
+    if url is None:
+        return None
+    prof = get_profile(profile)
+    overrides.setdefault("application_name", prof.application_name + "-ro")
+    overrides.setdefault("read_only", True)
+    return create_engine(echo=echo, profile=prof, url=url, **overrides)
 
 
 def create_sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
     return async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+
+# --- pool metrics ---
+
+
+@dataclass
+class PoolMetrics:
+    """Counters for one engine's pool; read them with `pool_metrics(engine)`."""
+
+    profile: Optional[EngineProfile] = None
+    connects: int = 0
+    checkouts: int = 0
+    in_use: int = 0
+    max_in_use: int = 0
+    wait_total_s: float = 0.0
+    wait_max_s: float = 0.0
+    timeouts: int = 0
+    wait_listeners: List[Callable[[float], None]] = field(default_factory=list, repr=False)
+
+    @property
+    def wait_avg_s(self) -> float:
+        return self.wait_total_s / self.checkouts if self.checkouts else 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "in_use": self.in_use,
+            "max_in_use": self.max_in_use,
+            "wait_avg_ms": self.wait_avg_s * 1e3,
+            "wait_max_ms": self.wait_max_s * 1e3,
+            "timeouts": self.timeouts,
+        }
+
+
+class _MeteredPool(Pool):
+    """Times every pool acquire (the wait for a free or new connection)."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self) -> Any:
+        t0 = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        waited = time.perf_counter() - t0
+        m = self.metrics
+        m.checkouts += 1
+        m.wait_total_s += waited
+        if waited > m.wait_max_s:
+            m.wait_max_s = waited
+        for listener in m.wait_listeners:
+            listener(waited)
+        return conn
+
+    def recreate(self) -> Any:
+        # engine.dispose() swaps in a recreated pool; it inherits the event listeners via
+        # the shared dispatch, so only the counters need carrying over.
+        new: Any = super().recreate()
+        new.metrics = self.metrics
+        return new
+
+
+class _MeteredQueuePool(_MeteredPool, AsyncAdaptedQueuePool):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+
+class _MeteredNullPool(_MeteredPool, NullPool):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+
+def _attach_metrics(pool: _MeteredPool) -> None:
+    m = pool.metrics
+
+    def on_connect(*_: Any) -> None:
+        m.connects += 1
+
+    def on_checkout(*_: Any) -> None:
+        m.in_use += 1
+        if m.in_use > m.max_in_use:
+            m.max_in_use = m.in_use
+
+    def on_checkin(*_: Any) -> None:
+        m.in_use -= 1
+
+    event.listen(pool, "connect", on_connect)
+    event.listen(pool, "checkout", on_checkout)
+    event.listen(pool, "checkin", on_checkin)
+
+
+def pool_metrics(engine: AsyncEngine) -> Optional[PoolMetrics]:
+    pool = engine.sync_engine.pool
+    return pool.metrics if isinstance(pool, _MeteredPool) else None
+
+
+async def warm_up(engine: AsyncEngine, n: Optional[int] = None) -> int:
+    """
+    Open `n` connections concurrently (default: the profile's `warm_connections`) and
+    return them to the pool, so the first real statements skip connect + auth. A no-op
+    without a pool; `n` is capped at what the pool can hold.
+    """
+    metrics = pool_metrics(engine)
+    prof = metrics.profile if metrics else None
+    if prof is None or prof.pool_size == 0:
+        return 0
+    n = min(prof.warm_connections if n is None else n, prof.pool_size + prof.max_overflow)
+    if n <= 0:
+        return 0
+
+    async def ping(ready: asyncio.Event, opened: list[int]) -> None:
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                opened.append(1)
+                if len(opened) == n:
+                    ready.set()
+                await ready.wait()  # hold until all are open so each task gets its own
+        except BaseException:
+            ready.set()  # a failed connect releases the others, which check theirs back in
+            raise
+
+    ready = asyncio.Event()
+    opened: list[int] = []
+    results = await asyncio.gather(*(ping(ready, opened) for _ in range(n)), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return len(opened)
@@ -0,0 +1,485 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any, Callable, Deque, Dict, List, Literal, Mapping, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Table
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .repositories.base import BaseRepository
+
+Overflow = Literal["block", "drop_oldest", "spill"]
+ToRow = Callable[[Any], Mapping[str, Any]]
+
+
+@dataclass(frozen=True)
+class WriteSink:
+    """Destination table for one kind of object and how to turn an object into a row."""
+
+    table: Table
+    to_row: ToRow
+
+
+def _value(x: Any) -> Any:
+    return getattr(x, "value", x)
+
+
+# Domain -> row adapters. They read attributes only, so any object shaped like the
+# vaayutrade_common models (or a test stand-in) works.
+
+_SIGNAL_SIDE = {"BUY": "LONG", "SELL": "SHORT"}
+_ALERT_SEVERITY = {"ERROR": "CRITICAL"}  # the DB enum has no ERROR level
+
+
+def signal_sink(
+    table: Table,
+    instrument_id: Callable[[str], Optional[int]],
+    model_artifact_id: Any = None,
+) -> WriteSink:
+    """`Signal` -> signal row; `instrument_id` maps a symbol to instrument.id."""
+
+    def to_row(s: Any) -> Dict[str, Any]:
+        side = _value(s.side)
+        return {
+            "id": s.id,
+            "ts": s.ts,
+            "instrument_id": instrument_id(s.symbol),
+            "side": _SIGNAL_SIDE.get(side, side),
+            "horizon_seconds": int(s.horizon) * 60,
+            "score": s.score,
+            "confidence": s.conf,
+            "features_ref": s.features_ref,
+            "model_artifact_id": model_artifact_id,
+        }
+
+    return WriteSink(table, to_row)
+
+
+def pnl_minute_sink(table: Table, instrument_id: Optional[int] = None) -> WriteSink:
+    """`PnLMinute` -> pnl_minute row (account level unless `instrument_id` is given)."""
+
+    def to_row(p: Any) -> Dict[str, Any]:
+        return {
+            "ts": p.ts,
+            "instrument_id": instrument_id,
+            "realized": p.realized,
+            "unrealized": p.unrealized,
+            "fees": p.fees,
+            "turnover": p.turnover,
+        }
+
+    return WriteSink(table, to_row)
+
+
+def alert_sink(table: Table) -> WriteSink:
+    """`AlertEvent` -> alert row; message/dedup_key are taken from the payload if set."""
+
+    def to_row(a: Any) -> Dict[str, Any]:
+        severity = _value(a.severity)
+        payload = dict(a.payload)
+        return {
+            "ts": a.ts,
+            "type": a.type,
+            "severity": _ALERT_SEVERITY.get(severity, severity),
+            "message": str(payload.get("message", a.type)),
+            "payload": payload,
+            "dedup_key": payload.get("dedup_key"),
+        }
+
+    return WriteSink(table, to_row)
+
+
+@dataclass
+class WriteMetrics:
+    """Counters for one sink; read them with `WriteBehindWriter.metrics[kind]`."""
+
+    depth: int = 0
+    max_depth: int = 0
+    enqueued: int = 0
+    written: int = 0
+    dropped: int = 0
+    spilled: int = 0
+    rejected: int = 0  # offer() refused under the "block" policy
+    invalid: int = 0  # objects whose to_row() raised; dropped
+    refused: int = 0  # rows the database rejected on their own; see `refused_path`
+    flushes: int = 0
+    failures: int = 0
+    flush_last_s: float = 0.0
+    flush_max_s: float = 0.0
+    flush_total_s: float = 0.0
+    last_error: Optional[str] = None
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "rejected": self.rejected,
+            "invalid": self.invalid,
+            "refused": self.refused,
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "flush_last_ms": self.flush_last_s * 1e3,
+            "flush_max_ms": self.flush_max_s * 1e3,
+            "flush_avg_ms": self.flush_total_s / self.flushes * 1e3 if self.flushes else 0.0,
+        }
+
+
+class WriteBehindWriter:
+    """
+    Buffers objects per sink and writes them in the background.
+
+    `offer()` is synchronous and never waits on the database: it appends to a bounded
+    in-memory queue. A flusher task writes a queue as one multi-row INSERT (one
+    transaction per sink) once it holds `max_batch` objects or its oldest object is
+    `max_age_s` old. When a queue is full the overflow policy applies:
+
+    - "drop_oldest": the oldest queued object is discarded;
+    - "spill": the new object's row is appended to `<spill_dir>/<kind>.spill`
+      (load it later with `replay_spill`);
+    - "block": `offer()` returns False and `await put()` waits for room.
+
+    Objects are converted to rows once, before any attempt; an object whose `to_row`
+    raises is counted in `invalid` and dropped alone. A write that fails on a connection
+    or resource error is retried `max_retries` times, then spilled (with a spill dir) or
+    dropped. Any other failure is caused by the rows themselves (a constraint, a bad
+    value), so the batch is bisected down to the offending rows, which are counted in
+    `refused` and appended to `<spill_dir>/<kind>.refused` (never replayed) while the
+    rest is written. Either way the flusher keeps running. `close()` writes everything
+    left.
+
+    Spill files hold one JSON object per line; `replay_spill` restores datetime, UUID
+    and Decimal columns from the sink's table.
+    """
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        sinks: Mapping[str, WriteSink],
+        max_batch: int = 500,
+        max_age_s: float = 0.25,
+        max_queue: int = 10_000,
+        overflow: Overflow = "drop_oldest",
+        spill_dir: Optional[os.PathLike[str] | str] = None,
+        max_retries: int = 2,
+        retry_backoff_s: float = 0.1,
+    ) -> None:
+        if max_batch < 1 or max_queue < max_batch:
+            raise ValueError("need 1 <= max_batch <= max_queue")
+        if overflow == "spill" and spill_dir is None:
+            raise ValueError("overflow='spill' requires spill_dir")
+        self.sessionmaker = sessionmaker
+        self.sinks = dict(sinks)
+        self.max_batch = max_batch
+        self.max_age_s = max_age_s
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self.max_retries = max_retries
+        self.retry_backoff_s = retry_backoff_s
+        self.metrics: Dict[str, WriteMetrics] = {k: WriteMetrics() for k in self.sinks}
+        self._queues: Dict[str, Deque[Tuple[float, Any]]] = {k: deque() for k in self.sinks}
+        self._spill_files: Dict[str, IO[str]] = {}
+        self._wake = asyncio.Event()
+        self._room = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task[None]] = None
+        self._closing = False
+
+    # --- producer side ---
+
+    def offer(self, kind: str, obj: Any) -> bool:
+        """Enqueue without waiting. False only under "block" with a full queue."""
+        q = self._queues[kind]
+        m = self.metrics[kind]
+        if len(q) >= self.max_queue:
+            if self.overflow == "block":
+                m.rejected += 1
+                self._wake.set()
+                return False
+            if self.overflow == "spill":
+                self._spill(kind, self._rows(kind, [obj]))
+                return True
+            q.popleft()
+            m.dropped += 1
+        q.append((time.monotonic(), obj))
+        m.enqueued += 1
+        m.depth = len(q)
+        if m.depth > m.max_depth:
+            m.max_depth = m.depth
+        if m.depth >= self.max_batch:
+            self._wake.set()
+        return True
+
+    async def put(self, kind: str, obj: Any) -> None:
+        """Like `offer`, but waits for room when the queue is full under "block"."""
+        while not self.offer(kind, obj):
+            self._room.clear()
+            await self._room.wait()
+
+    # --- lifecycle ---
+
+    def start(self) -> None:
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the flusher, write whatever is queued and close spill files."""
+        self._closing = True
+        self._wake.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+        for f in self._spill_files.values():
+            f.close()
+        self._spill_files.clear()
+
+    async def __aenter__(self) -> WriteBehindWriter:
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    async def flush(self) -> int:
+        """Write every queued object now; returns the number written."""
+        return await self._flush(force=True)
+
+    # --- flusher ---
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._next_due())
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self._flush(force=False)
+
+    def _next_due(self) -> float:
+        oldest = [q[0][0] for q in self._queues.values() if q]
+        if not oldest:
+            return self.max_age_s
+        return max(0.0, min(oldest) + self.max_age_s - time.monotonic())
+
+    async def _flush(self, force: bool) -> int:
+        written = 0
+        async with self._lock:
+            for kind, q in self._queues.items():
+                while q and (
+                    force
+                    or len(q) >= self.max_batch
+                    or time.monotonic() - q[0][0] >= self.max_age_s
+                ):
+                    batch = [q.popleft()[1] for _ in range(min(len(q), self.max_batch))]
+                    self.metrics[kind].depth = len(q)
+                    self._room.set()
+                    written += await self._write(kind, batch)
+        return written
+
+    def _rows(self, kind: str, batch: List[Any]) -> List[Mapping[str, Any]]:
+        to_row, m = self.sinks[kind].to_row, self.metrics[kind]
+        rows: List[Mapping[str, Any]] = []
+        for obj in batch:
+            try:
+                rows.append(to_row(obj))
+            except Exception as exc:  # one malformed object must not sink its batch
+                m.invalid += 1
+                m.last_error = f"{type(exc).__name__}: {exc}"
+        return rows
+
+    async def _write(self, kind: str, batch: List[Any]) -> int:
+        rows = self._rows(kind, batch)
+        return await self._insert(kind, rows) if rows else 0
+
+    async def _insert(self, kind: str, rows: List[Mapping[str, Any]]) -> int:
+        """Write `rows`, bisecting around rows the database refuses; returns rows written."""
+        sink, m = self.sinks[kind], self.metrics[kind]
+        for attempt in range(self.max_retries + 1):
+            t0 = time.perf_counter()
+            try:
+                async with self.sessionmaker() as session, session.begin():
+                    repo = BaseRepository(session, sink.table)
+                    await repo.create_many(rows, chunk_size=len(rows), returning=False)
+            except Exception as exc:  # keep the flusher alive whatever the driver raises
+                m.failures += 1
+                m.last_error = f"{type(exc).__name__}: {exc}"
+                if not _transient(exc):
+                    return await self._bisect(kind, rows)
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self.retry_backoff_s * 2**attempt)
+                continue
+            took = time.perf_counter() - t0
+            m.flushes += 1
+            m.written += len(rows)
+            m.flush_last_s = took
+            m.flush_total_s += took
+            if took > m.flush_max_s:
+                m.flush_max_s = took
+            return len(rows)
+        if self.spill_dir is not None:
+            self._spill(kind, rows)
+        else:
+            m.dropped += len(rows)
+        return 0
+
+    async def _bisect(self, kind: str, rows: List[Mapping[str, Any]]) -> int:
+        if len(rows) == 1:
+            self.metrics[kind].refused += 1
+            if self.spill_dir is not None:
+                self._append(self.refused_path(kind), rows)
+            return 0
+        mid = len(rows) // 2
+        return await self._insert(kind, rows[:mid]) + await self._insert(kind, rows[mid:])
+
+    # --- spill files ---
+
+    def spill_path(self, kind: str) -> Path:
+        if self.spill_dir is None:
+            raise ValueError("no spill_dir configured")
+        return self.spill_dir / f"{kind}.spill"
+
+    def refused_path(self, kind: str) -> Path:
+        return self.spill_path(kind).with_suffix(".refused")
+
+    def _spill(self, kind: str, rows: List[Mapping[str, Any]]) -> None:
+        f = self._spill_files.get(kind)
+        if f is None:
+            path = self.spill_path(kind)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            f = self._spill_files[kind] = open(path, "a", encoding="utf-8")
+        f.writelines(_dump_row(row) for row in rows)
+        f.flush()
+        self.metrics[kind].spilled += len(rows)
+
+    @staticmethod
+    def _append(path: Path, rows: List[Mapping[str, Any]]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.writelines(_dump_row(row) for row in rows)
+
+    async def replay_spill(self, kind: str) -> int:
+        """
+        Insert the rows spilled for `kind`; returns the number written.
+
+        Rows go through the normal write path in `max_batch` chunks: rows the database
+        refuses, and lines that no longer parse, end up in `refused_path(kind)`; rows
+        hit by a connection error are spilled again for the next replay.
+        """
+        path = self.spill_path(kind)
+        f = self._spill_files.pop(kind, None)
+        if f is not None:
+            f.close()
+        replaying = path.with_suffix(".replay")  # left over if a previous replay died
+        if path.exists():
+            if replaying.exists():
+                with open(replaying, "a", encoding="utf-8") as dst:
+                    dst.write(path.read_text(encoding="utf-8"))
+                path.unlink()
+            else:
+                path.rename(replaying)
+        if not replaying.exists():
+            return 0
+        table, m = self.sinks[kind].table, self.metrics[kind]
+        loads = _row_loader(table)
+        rows: List[Mapping[str, Any]] = []
+        with open(replaying, encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(loads(line))
+                except (ValueError, TypeError, ArithmeticError) as exc:
+                    m.refused += 1
+                    m.last_error = f"{type(exc).__name__}: {exc}"
+                    with open(self.refused_path(kind), "a", encoding="utf-8") as bad:
+                        bad.write(line if line.endswith("\n") else line + "\n")
+        written = 0
+        for i in range(0, len(rows), self.max_batch):
+            written += await self._insert(kind, rows[i : i + self.max_batch])
+        replaying.unlink()
+        return written
+
+
+# --- failure classification and spill encoding ---
+
+# SQLSTATE classes that say nothing about the rows: connection exception, transaction
+# rollback (serialization failure, deadlock), insufficient resources, operator
+# intervention.
+_TRANSIENT_SQLSTATES = ("08", "40", "53", "57")
+
+
+def _transient(exc: BaseException) -> bool:
+    """True when retrying the same rows could succeed."""
+    if isinstance(exc, OSError):  # includes TimeoutError / ConnectionError
+        return True
+    if isinstance(exc, DBAPIError):
+        if exc.connection_invalidated:
+            return True
+        state = getattr(exc.orig, "sqlstate", None) or getattr(exc.orig, "pgcode", None)
+        if state:
+            return str(state)[:2] in _TRANSIENT_SQLSTATES
+        return isinstance(exc, (OperationalError, InterfaceError))
+    return False
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _dump_row(row: Mapping[str, Any]) -> str:
+    return json.dumps(dict(row), default=_json_default, separators=(",", ":")) + "\n"
+
+
+_PARSERS: Dict[type, Callable[[str], Any]] = {
+    datetime: datetime.fromisoformat,
+    date: date.fromisoformat,
+    UUID: UUID,
+    Decimal: Decimal,
+}
+
+
+def _row_loader(table: Table) -> Callable[[str], Dict[str, Any]]:
+    """Parse a spilled line back into a row, restoring the types JSON flattened."""
+    parsers: Dict[str, Callable[[str], Any]] = {}
+    for col in table.columns:
+        try:
+            parser = _PARSERS.get(col.type.python_type)
+        except NotImplementedError:
+            continue
+        if parser is not None:
+            parsers[col.name] = parser
+
+    def loads(line: str) -> Dict[str, Any]:
+        row = json.loads(line)
+        if not isinstance(row, dict):
+            raise ValueError("spilled row is not an object")
+        for name, parse in parsers.items():
+            value = row.get(name)
+            if isinstance(value, str):
+                row[name] = parse(value)
+        return row
+
+    return loads
@@ -23,8 +23,20 @@ from .models.domain import (
     BacktestRun,
     ConfigBlob,
 )
+from .models.base import VM, trusted_mode
+from .models.depth import BookSide
+from .models.feature_schema import FeatureSchema, FeatureVector
+from .models.feature_matrix import FeatureMatrix
+from .models.tick_batch import SymbolTable, TickBatch
+from . import calibration, codec, scoring
+from .candles import CandleAggregator
+from .features import FeatureEngine
+from .ingest import StaleFeedError, TickConflator
 
 __all__ = [
+    "calibration",
+    "codec",
+    "scoring",
     "AppError",
     "ErrorCode",
     "Result",
@@ -51,4 +63,16 @@ __all__ = [
     "AlertEvent",
     "BacktestRun",
     "ConfigBlob",
+    "BookSide",
+    "FeatureMatrix",
+    "FeatureSchema",
+    "FeatureVector",
+    "SymbolTable",
+    "TickBatch",
+    "CandleAggregator",
+    "FeatureEngine",
+    "StaleFeedError",
+    "TickConflator",
+    "VM",
+    "trusted_mode",
 ]
@@ -0,0 +1,126 @@
+"""
+Isotonic score calibration compiled from `ModelArtifact.calib`.
+
+`calib` stores the fitted isotonic curve as {"<raw score>": calibrated probability}. It is
+compiled once into sorted breakpoint / value arrays and applied to whole score vectors
+with `np.interp` (binary search + linear interpolation, clamped at both ends). Compiled
+calibrators are cached per (artifact id, version) and can be written as a sidecar next to
+the artifact so a cold start loads arrays instead of re-parsing the map. An artifact is
+immutable per (id, version), so that pair is what the sidecar is checked against; reading
+it never touches `calib`.
+
+Sidecar layout: one header line `VTCALIB1 <id>/<version>`, then the breakpoints and the
+values as little-endian float64 (read back zero-copy with `np.frombuffer`).
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple, Union
+from uuid import UUID
+
+import numpy as np
+
+from .models.domain import ModelArtifact
+
+SIDECAR_SUFFIX = ".calib.bin"
+_MAGIC = b"VTCALIB1 "
+
+
+def artifact_key(artifact: ModelArtifact) -> str:
+    """Identity a sidecar was compiled for."""
+    return f"{artifact.id}/{artifact.version}"
+
+
+class IsotonicCalibrator:
+    """Piecewise-linear monotone map from raw scores to probabilities."""
+
+    __slots__ = ("x", "y", "key")
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, key: str = "") -> None:
+        if x.ndim != 1 or x.shape != y.shape or not len(x):
+            raise ValueError("calibration needs matching, non-empty 1-D breakpoint arrays")
+        if np.any(np.diff(x) <= 0):
+            raise ValueError("calibration breakpoints must be strictly increasing")
+        self.x = x
+        self.y = y
+        self.key = key
+
+    @classmethod
+    def compile(cls, calib: Mapping[str, float], key: str = "") -> "IsotonicCalibrator":
+        """
+        Parse and sort the points. Values are made non-decreasing with a running max so a
+        slightly non-monotone fit can never invert the score order.
+        """
+        try:
+            points = sorted((float(k), float(v)) for k, v in calib.items())
+        except ValueError as exc:
+            raise ValueError(f"calibration keys must be numeric scores: {exc}") from exc
+        if not points:
+            raise ValueError("artifact has no calibration points")
+        x = np.array([p[0] for p in points], dtype=np.float64)
+        y = np.maximum.accumulate(np.array([p[1] for p in points], dtype=np.float64))
+        return cls(x, y, key)
+
+    def __call__(self, scores: np.ndarray) -> np.ndarray:
+        return np.interp(np.asarray(scores, dtype=np.float64), self.x, self.y)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __repr__(self) -> str:
+        return f"IsotonicCalibrator({len(self)} points, key={self.key!r})"
+
+    # --- persistence ---
+
+    def save(self, path: Union[str, Path]) -> None:
+        with open(path, "wb") as fh:
+            fh.write(_MAGIC + self.key.encode() + b"\n")
+            fh.write(np.stack([self.x, self.y]).astype("<f8", copy=False).tobytes())
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "IsotonicCalibrator":
+        raw = Path(path).read_bytes()
+        end = raw.find(b"\n")
+        if not raw.startswith(_MAGIC) or end < 0 or (len(raw) - end - 1) % 16:
+            raise ValueError(f"{path} is not a calibration sidecar")
+        xy = np.frombuffer(raw, dtype="<f8", offset=end + 1).reshape(2, -1)
+        return cls(xy[0], xy[1], raw[len(_MAGIC) : end].decode())
+
+
+_CACHE: Dict[Tuple[UUID, str], IsotonicCalibrator] = {}
+
+
+def sidecar_path(artifact: ModelArtifact) -> Path:
+    return Path(artifact.path + SIDECAR_SUFFIX)
+
+
+def calibrator_for(
+    artifact: ModelArtifact, sidecar: Optional[Union[str, Path]] = None
+) -> IsotonicCalibrator:
+    """
+    Cached calibrator for `artifact`. With `sidecar`, a file written for the same artifact
+    id and version is loaded instead of compiling; a missing or stale one is (re)written
+    after compiling.
+    """
+    key = (artifact.id, artifact.version)
+    cal = _CACHE.get(key)
+    if cal is not None:
+        return cal
+    stamp = artifact_key(artifact)
+    if sidecar is not None and Path(sidecar).exists():
+        try:
+            loaded = IsotonicCalibrator.load(sidecar)
+        except ValueError:
+            loaded = None  # unreadable: rewritten below
+        if loaded is not None and loaded.key == stamp:
+            cal = loaded
+    if cal is None:
+        cal = IsotonicCalibrator.compile(artifact.calib, stamp)
+        if sidecar is not None:
+            cal.save(sidecar)
+    _CACHE[key] = cal
+    return cal
+
+
+def clear_cache() -> None:
+    _CACHE.clear()
@@ -0,0 +1,221 @@
+"""
+Streaming tick -> Candle aggregation shared by traderd (live) and the backtester (replay).
+
+Bars are bucketed on the UTC epoch grid ([start, start + timeframe)), which lines up with
+the 09:15 IST open for every supported timeframe. All decisions are driven by tick event
+time, never the wall clock, so feeding the same ticks in the same order produces the same
+candles live and offline.
+
+Volume: `TickSnapshot.volume` is Kite's cumulative day volume. A tick contributes the
+increase over the highest cumulative volume seen so far for its symbol, so a late or
+duplicated tick adds price information but no volume.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .models.domain import Candle, TickSnapshot
+from .models.tick_batch import NO_VOLUME, TickBatch, from_epoch_ns, to_epoch_ns
+
+NS = 1_000_000_000
+
+TIMEFRAMES: Dict[str, int] = {
+    "1s": 1,
+    "1m": 60,
+    "5m": 5 * 60,
+    "15m": 15 * 60,
+}
+
+ClosedCandle = Tuple[str, Candle]  # (timeframe label, candle stamped with its bar start)
+
+
+class _Bar:
+    __slots__ = ("start", "open", "high", "low", "close", "open_ns", "close_ns", "volume", "pv")
+
+    def __init__(self, start: int, ts: int, price: float, volume: float) -> None:
+        self.start = start
+        self.open = self.high = self.low = self.close = price
+        self.open_ns = self.close_ns = ts
+        self.volume = volume
+        self.pv = price * volume
+
+    def update(self, ts: int, price: float, volume: float) -> None:
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        if ts < self.open_ns:  # late tick that precedes the current open
+            self.open, self.open_ns = price, ts
+        if ts >= self.close_ns:
+            self.close, self.close_ns = price, ts
+        self.volume += volume
+        self.pv += price * volume
+
+
+class _SymbolState:
+    __slots__ = ("watermark", "cum_volume", "open_bars", "closed_until")
+
+    def __init__(self, n_timeframes: int) -> None:
+        self.watermark = -1
+        self.cum_volume = -1
+        # per timeframe: open bars keyed by start ns (a few at most, bounded by the grace)
+        self.open_bars: List[Dict[int, _Bar]] = [{} for _ in range(n_timeframes)]
+        # per timeframe: end of the newest closed bar; older ticks are dropped
+        self.closed_until: List[int] = [-1] * n_timeframes
+
+
+class CandleAggregator:
+    """
+    Incremental multi-timeframe candle builder.
+
+    `on_tick` / `on_batch` return the candles closed by that input. A bar closes once the
+    symbol's event-time watermark reaches `bar end + grace`, so ticks up to `grace` late
+    still land in their bar; later ones are counted in `late_dropped`. Work per tick is
+    O(timeframes). `advance(ts)` closes bars of symbols that stopped ticking and `flush()`
+    closes everything (end of session or replay).
+    """
+
+    def __init__(
+        self,
+        timeframes: Sequence[str] = ("1s", "1m", "5m", "15m"),
+        grace_seconds: float = 2.0,
+    ) -> None:
+        unknown = [tf for tf in timeframes if tf not in TIMEFRAMES]
+        if unknown:
+            raise ValueError(f"unsupported timeframes: {unknown}")
+        if grace_seconds < 0:
+            raise ValueError("grace_seconds must be >= 0")
+        self.timeframes = tuple(timeframes)
+        self._widths = tuple(TIMEFRAMES[tf] * NS for tf in self.timeframes)
+        self._grace = int(grace_seconds * NS)
+        self._symbols: Dict[str, _SymbolState] = {}
+        self.late_dropped = 0
+
+    # --- input ---
+
+    def on_tick(self, tick: TickSnapshot) -> List[ClosedCandle]:
+        if tick.last is None:
+            return []
+        return self._on_trade(
+            tick.symbol,
+            to_epoch_ns(tick.ts),
+            tick.last,
+            NO_VOLUME if tick.volume is None else tick.volume,
+        )
+
+    def on_ticks(self, ticks: Iterable[TickSnapshot]) -> List[ClosedCandle]:
+        out: List[ClosedCandle] = []
+        for tick in ticks:
+            out += self.on_tick(tick)
+        return out
+
+    def on_batch(self, batch: TickBatch) -> List[ClosedCandle]:
+        """Row-by-row over the columns; produces exactly what on_tick would for each row."""
+        symbol = batch.symbols.symbol
+        out: List[ClosedCandle] = []
+        for ts, sid, last, vol in zip(
+            batch.ts.tolist(), batch.symbol_id.tolist(), batch.last.tolist(), batch.volume.tolist()
+        ):
+            if last == last:  # NaN: no trade price on this tick
+                out += self._on_trade(symbol(sid), ts, last, vol)
+        return out
+
+    # --- clock ---
+
+    def advance(self, ts_ns: int) -> List[ClosedCandle]:
+        """Move every symbol's watermark to `ts_ns` (e.g. from a feed heartbeat)."""
+        out: List[ClosedCandle] = []
+        for symbol, state in self._symbols.items():
+            if ts_ns > state.watermark:
+                state.watermark = ts_ns
+                self._close_ready(symbol, state, out)
+        return out
+
+    def flush(self) -> List[ClosedCandle]:
+        out: List[ClosedCandle] = []
+        for symbol, state in self._symbols.items():
+            for i, bars in enumerate(state.open_bars):
+                for start in sorted(bars):
+                    out.append(self._emit(symbol, i, bars.pop(start)))
+                    state.closed_until[i] = max(state.closed_until[i], start + self._widths[i])
+        return out
+
+    # --- internals ---
+
+    def _on_trade(self, symbol: str, ts: int, price: float, cum_volume: int) -> List[ClosedCandle]:
+        state = self._symbols.get(symbol)
+        if state is None:
+            state = self._symbols[symbol] = _SymbolState(len(self._widths))
+        volume = 0.0
+        if cum_volume != NO_VOLUME:
+            if state.cum_volume >= 0 and cum_volume > state.cum_volume:
+                volume = float(cum_volume - state.cum_volume)
+            if cum_volume > state.cum_volume:
+                state.cum_volume = cum_volume
+
+        dropped = False
+        for i, width in enumerate(self._widths):
+            start = ts - ts % width
+            if start < state.closed_until[i]:
+                dropped = True
+                continue
+            bars = state.open_bars[i]
+            bar = bars.get(start)
+            if bar is None:
+                bars[start] = _Bar(start, ts, price, volume)
+            else:
+                bar.update(ts, price, volume)
+        if dropped:
+            self.late_dropped += 1
+
+        out: List[ClosedCandle] = []
+        if ts > state.watermark:
+            state.watermark = ts
+            self._close_ready(symbol, state, out)
+        return out
+
+    def _close_ready(self, symbol: str, state: _SymbolState, out: List[ClosedCandle]) -> None:
+        limit = state.watermark - self._grace
+        for i, width in enumerate(self._widths):
+            bars = state.open_bars[i]
+            if not bars:
+                continue
+            ready = [start for start in bars if start + width <= limit]
+            for start in sorted(ready):
+                out.append(self._emit(symbol, i, bars.pop(start)))
+                state.closed_until[i] = max(state.closed_until[i], start + width)
+
+    def _emit(self, symbol: str, tf_index: int, bar: _Bar) -> ClosedCandle:
+        candle = Candle.construct_trusted(
+            symbol=symbol,
+            ts=from_epoch_ns(bar.start),
+            o=bar.open,
+            h=bar.high,
+            low=bar.low,
+            c=bar.close,
+            v=bar.volume,
+            vwap=bar.pv / bar.volume if bar.volume > 0 else None,
+        )
+        return self.timeframes[tf_index], candle
+
+    def open_candles(self, symbol: str) -> List[ClosedCandle]:
+        """Snapshot of the still-forming bars for `symbol` (for dashboards; not emitted)."""
+        state = self._symbols.get(symbol)
+        if state is None:
+            return []
+        return [
+            self._emit(symbol, i, bar)
+            for i, bars in enumerate(state.open_bars)
+            for _, bar in sorted(bars.items())
+        ]
+
+
+def candles_from_ticks(
+    ticks: Iterable[TickSnapshot],
+    timeframes: Sequence[str] = ("1s", "1m", "5m", "15m"),
+    grace_seconds: float = 2.0,
+) -> List[ClosedCandle]:
+    """Offline helper: aggregate a whole tick stream and flush the trailing bars."""
+    agg = CandleAggregator(timeframes, grace_seconds)
+    out = agg.on_ticks(ticks)
+    return out + agg.flush()
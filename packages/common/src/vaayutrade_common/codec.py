@@ -0,0 +1,533 @@
+"""
+Schema-versioned binary codec for the hot domain models on the internal event bus.
+
+Frame layout (little-endian):
+
+    message: MAGIC(2) VERSION(u8) TAG(u8) FINGERPRINT(8) BODY
+    batch:   MAGIC(2) VERSION(u8) 0x00    FINGERPRINT(8) COUNT(u32) {LEN(u32) TAG(u8) BODY}*
+
+BODY is one struct for the fixed-width fields (with a u16 null bitmap first when the model
+has optional fields) followed by the variable-width fields in declaration order.
+The fingerprint hashes every layout below, so a producer and consumer built from different
+layouts fail on the first frame instead of mis-decoding.
+
+Decoded objects are built through the trusted lane: producers only encode validated models.
+Datetimes travel as UTC epoch microseconds and decode as UTC-aware values.
+"""
+
+from __future__ import annotations
+import hashlib
+from abc import ABC, abstractmethod
+import struct
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Type, Union
+from uuid import UUID, SafeUUID
+
+import numpy as np
+
+from .models.base import VM, construct_complete
+from .models.depth import DEPTH, BookSide
+from .models.domain import (
+    Execution,
+    OrderSide,
+    OrderStatus,
+    OrderType,
+    Order,
+    PnLMinute,
+    Position,
+    Signal,
+    TickSnapshot,
+)
+
+SCHEMA_VERSION = 1
+MAGIC = b"VT"
+
+_HEADER = struct.Struct("<2sBB8s")
+_COUNT = struct.Struct("<I")
+_RECORD = struct.Struct("<IB")
+_U16 = struct.Struct("<H")
+_BATCH_TAG = 0
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_US = timedelta(microseconds=1)
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class CodecError(ValueError):
+    pass
+
+
+class SchemaMismatchError(CodecError):
+    pass
+
+
+# --- field kinds ---
+#
+# Each layout compiles into one encode and one decode function (the same technique
+# dataclasses uses for __init__), so the per-message cost is a single struct call plus the
+# conversions the fields actually need. Kinds contribute source snippets to those functions.
+
+
+def _uuid_from_bytes(
+    raw: bytes,
+    _new: Any = object.__new__,
+    _set: Any = object.__setattr__,
+    _from_bytes: Any = int.from_bytes,
+    _safe: SafeUUID = SafeUUID.unknown,
+) -> UUID:
+    # Same result as UUID(bytes=raw) without re-validating 16 bytes we packed ourselves.
+    uid = _new(UUID)
+    _set(uid, "int", _from_bytes(raw, "big"))
+    _set(uid, "is_safe", _safe)
+    return uid
+
+
+def _write_depth(side: BookSide, out: bytearray) -> None:
+    n = len(side)
+    out.append(n)
+    out += side.levels[:n].astype("<f8", copy=False).tobytes()
+
+
+_LEVELS = [struct.Struct(f"<{2 * n}d") for n in range(DEPTH + 1)]
+_PAD = (float("nan"), 0.0)
+
+
+def _read_depth(buf: Buffer, off: int) -> Tuple[BookSide, int]:
+    n = buf[off]
+    if n > DEPTH:
+        raise ValueError(f"depth of {n} levels")
+    flat = _LEVELS[n].unpack_from(buf, off + 1) + _PAD * (DEPTH - n)
+    return BookSide(np.array(flat).reshape(DEPTH, 2), n), off + 1 + 16 * n
+
+
+_GLOBALS: Dict[str, Any] = {
+    "_EPOCH": _EPOCH,
+    "_US": _US,
+    "_UTC": timezone.utc,
+    "_timedelta": timedelta,
+    "_uuid_from_bytes": _uuid_from_bytes,
+    "_write_depth": _write_depth,
+    "_read_depth": _read_depth,
+    "_u16_pack": _U16.pack,
+    "_u16_unpack_from": _U16.unpack_from,
+    "_construct": construct_complete,
+}
+
+
+class _Kind:
+    """A wire type: `_Fixed` kinds pack into the body struct, `_Variable` ones follow it."""
+
+    name = ""
+
+    def helpers(self, prefix: str) -> Dict[str, Any]:
+        return {}
+
+
+class _Fixed(_Kind):
+    """Packed with struct `code`; to_wire/from_wire emit the conversion expressions."""
+
+    code = ""
+    null = "0"  # source of the placeholder packed for a None optional
+
+    def to_wire(self, x: str, prefix: str) -> str:
+        return x
+
+    def from_wire(self, v: str, prefix: str) -> str:
+        return v
+
+
+class _Variable(_Kind, ABC):
+    """Written after the body struct; write/read emit the statements."""
+
+    @abstractmethod
+    def write(self, x: str, prefix: str) -> List[str]: ...
+
+    @abstractmethod
+    def read(self, target: str, prefix: str) -> List[str]: ...
+
+
+class _F64(_Fixed):
+    name, code, null = "f64", "d", "0.0"
+
+
+class _I64(_Fixed):
+    name, code = "i64", "q"
+
+
+class _Timestamp(_Fixed):
+    """UTC epoch microseconds; naive datetimes are taken as UTC."""
+
+    name, code = "ts_us", "q"
+
+    def to_wire(self, x: str, prefix: str) -> str:
+        return f"(({x} if {x}.tzinfo else {x}.replace(tzinfo=_UTC)) - _EPOCH) // _US"
+
+    def from_wire(self, v: str, prefix: str) -> str:
+        return f"_EPOCH + _timedelta(microseconds={v})"
+
+
+class _Uuid(_Fixed):
+    name, code, null = "uuid", "16s", "b''"
+
+    def to_wire(self, x: str, prefix: str) -> str:
+        return f"{x}.bytes"
+
+    def from_wire(self, v: str, prefix: str) -> str:
+        return f"_uuid_from_bytes({v})"
+
+
+class _Choice(_Fixed):
+    """Enum members or Literal values as a u8 index. Decodes to the plain value."""
+
+    code = "B"
+
+    def __init__(self, values: Sequence[str]) -> None:
+        self.values = tuple(values)
+        self.name = "choice(" + ",".join(self.values) + ")"
+
+    @classmethod
+    def of(cls, enum: Type[Enum]) -> "_Choice":
+        return cls([m.value for m in enum])
+
+    def helpers(self, prefix: str) -> Dict[str, Any]:
+        # str-valued enum members hash and compare equal to their values
+        return {
+            f"{prefix}index": {v: i for i, v in enumerate(self.values)},
+            f"{prefix}values": self.values,
+        }
+
+    def to_wire(self, x: str, prefix: str) -> str:
+        return f"{prefix}index[{x}]"
+
+    def from_wire(self, v: str, prefix: str) -> str:
+        return f"{prefix}values[{v}]"
+
+
+class _Str(_Variable):
+    name = "str_u16"
+
+    def write(self, x: str, prefix: str) -> List[str]:
+        return [f"raw = {x}.encode()", "out += _u16_pack(len(raw))", "out += raw"]
+
+    def read(self, target: str, prefix: str) -> List[str]:
+        return [
+            "(n,) = _u16_unpack_from(buf, off)",
+            "off += 2",
+            "if off + n > len(buf):",
+            "    raise ValueError(f'string of {n} bytes runs past the frame')",
+            f"{target} = str(buf[off : off + n], 'utf-8')",
+            "off += n",
+        ]
+
+
+class _Depth(_Variable):
+    """u8 level count, then count * (price f64, qty f64)."""
+
+    name = "depth_f64x2"
+
+    def write(self, x: str, prefix: str) -> List[str]:
+        return [f"_write_depth({x}, out)"]
+
+    def read(self, target: str, prefix: str) -> List[str]:
+        return [f"{target}, off = _read_depth(buf, off)"]
+
+
+F64, I64, TS, UUID_, STR, DEPTH_ = _F64(), _I64(), _Timestamp(), _Uuid(), _Str(), _Depth()
+
+
+# --- per-model layouts ---
+
+
+class _Layout:
+    def __init__(
+        self, tag: int, model: Type[VM], fields: Sequence[Tuple[str, _Kind, bool]]
+    ) -> None:
+        if [name for name, _, _ in fields] != list(model.model_fields):
+            raise CodecError(f"{model.__name__} layout must list its fields in declaration order")
+        self.tag = tag
+        self.model = model
+        self.fields = tuple(fields)
+        self.source = self._compile()
+
+    def describe(self) -> str:
+        parts = [f"{n}:{k.name}{'?' if o else ''}" for n, k, o in self.fields]
+        return f"{self.tag}:{self.model.__name__}(" + ",".join(parts) + ")"
+
+    def _compile(self) -> str:
+        ns: Dict[str, Any] = dict(_GLOBALS)
+        ns["_model"] = self.model
+        fixed = [(i, (n, k, o)) for i, (n, k, o) in enumerate(self.fields) if isinstance(k, _Fixed)]
+        variable = [
+            (i, (n, k, o)) for i, (n, k, o) in enumerate(self.fields) if isinstance(k, _Variable)
+        ]
+        flags: Dict[int, int] = {}
+        for i, (_, _, optional) in enumerate(self.fields):
+            if optional:
+                flags[i] = 1 << len(flags)
+        if len(flags) > 16:
+            raise CodecError(f"{self.model.__name__} has more than 16 optional fields")
+        has_mask = bool(flags)
+        packed = struct.Struct(
+            "<" + ("H" if has_mask else "") + "".join(k.code for _, (_, k, _) in fixed)
+        )
+        ns["_pack"], ns["_unpack_from"], ns["_SIZE"] = packed.pack, packed.unpack_from, packed.size
+
+        enc = ["def encode(obj, out):", "    d = obj.__dict__"]
+        if has_mask:
+            enc.append("    mask = 0")
+        for i, (name, kind, optional) in fixed:
+            prefix = f"h{i}_"
+            ns.update(kind.helpers(prefix))
+            enc.append(f"    x{i} = d[{name!r}]")
+            if optional:
+                enc += [
+                    f"    if x{i} is None:",
+                    f"        mask |= {flags[i]}",
+                    f"        w{i} = {kind.null}",
+                    "    else:",
+                    f"        w{i} = {kind.to_wire(f'x{i}', prefix)}",
+                ]
+            else:
+                enc.append(f"    w{i} = {kind.to_wire(f'x{i}', prefix)}")
+        for i, (name, _, optional) in variable:
+            enc.append(f"    x{i} = d[{name!r}]")
+            if optional:
+                enc.append(f"    if x{i} is None:")
+                enc.append(f"        mask |= {flags[i]}")
+        args = (["mask"] if has_mask else []) + [f"w{i}" for i, _ in fixed]
+        enc.append(f"    out += _pack({', '.join(args)})")
+        for i, (_, var, optional) in variable:
+            lines = var.write(f"x{i}", f"h{i}_")
+            if optional:
+                enc.append(f"    if x{i} is not None:")
+                enc += [f"        {line}" for line in lines]
+            else:
+                enc += [f"    {line}" for line in lines]
+
+        targets = (["mask"] if has_mask else []) + [f"v{i}" for i, _ in fixed]
+        dec = [
+            "def decode(buf, off):",
+            f"    {', '.join(targets)}{',' if len(targets) == 1 else ''} = _unpack_from(buf, off)",
+            "    off += _SIZE",
+        ]
+        for i, (_, var, optional) in variable:
+            lines = var.read(f"t{i}", f"h{i}_")
+            if optional:
+                dec += [f"    if mask & {flags[i]}:", f"        t{i} = None", "    else:"]
+                dec += [f"        {line}" for line in lines]
+            else:
+                dec += [f"    {line}" for line in lines]
+        items = []
+        for i, (name, field_kind, optional) in enumerate(self.fields):
+            if isinstance(field_kind, _Fixed):
+                expr = field_kind.from_wire(f"v{i}", f"h{i}_")
+                if optional:
+                    expr = f"None if mask & {flags[i]} else {expr}"
+            else:
+                expr = f"t{i}"
+            items.append(f"        {name!r}: {expr},")
+        dec += ["    values = {", *items, "    }", "    return _construct(_model, values), off"]
+
+        source = "\n".join(enc) + "\n\n\n" + "\n".join(dec) + "\n"
+        exec(compile(source, f"<codec {self.model.__name__}>", "exec"), ns)
+        self.encode_into = ns["encode"]
+        self.decode_from = ns["decode"]
+        return source
+
+    def encode(self, obj: VM, out: bytearray) -> None:
+        try:
+            self.encode_into(obj, out)
+        except (TypeError, AttributeError, KeyError, struct.error) as exc:
+            raise CodecError(f"cannot encode {self.model.__name__}: {exc!r}") from exc
+
+    def decode(self, buf: Buffer, off: int) -> Tuple[VM, int]:
+        try:
+            obj, end = self.decode_from(buf, off)
+        except (IndexError, ValueError, OverflowError, struct.error) as exc:
+            raise CodecError(f"truncated or corrupt {self.model.__name__} frame") from exc
+        return obj, end
+
+
+_LAYOUTS: Tuple[_Layout, ...] = (
+    _Layout(
+        1,
+        TickSnapshot,
+        [
+            ("ts", TS, False),
+            ("symbol", STR, False),
+            ("bids", DEPTH_, False),
+            ("asks", DEPTH_, False),
+            ("last", F64, True),
+            ("volume", I64, True),
+        ],
+    ),
+    _Layout(
+        2,
+        Signal,
+        [
+            ("id", UUID_, False),
+            ("ts", TS, False),
+            ("symbol", STR, False),
+            ("score", F64, False),
+            ("horizon", I64, False),
+            ("side", _Choice.of(OrderSide), False),
+            ("conf", F64, False),
+            ("features_ref", STR, True),
+        ],
+    ),
+    _Layout(
+        3,
+        Order,
+        [
+            ("id", UUID_, False),
+            ("client_id", STR, False),
+            ("symbol", STR, False),
+            ("side", _Choice.of(OrderSide), False),
+            ("qty", I64, False),
+            ("type", _Choice.of(OrderType), False),
+            ("limit_price", F64, True),
+            ("trigger", F64, True),
+            ("status", _Choice.of(OrderStatus), False),
+            ("parent_id", UUID_, True),
+        ],
+    ),
+    _Layout(
+        4,
+        Execution,
+        [
+            ("id", UUID_, False),
+            ("order_id", UUID_, False),
+            ("qty", I64, False),
+            ("price", F64, False),
+            ("ts", TS, False),
+            ("liquidity_flag", _Choice(["M", "T"]), True),
+        ],
+    ),
+    _Layout(
+        5,
+        Position,
+        [
+            ("symbol", STR, False),
+            ("net_qty", I64, False),
+            ("avg_price", F64, False),
+            ("mtm", F64, False),
+            ("last_updated", TS, False),
+        ],
+    ),
+    _Layout(
+        6,
+        PnLMinute,
+        [
+            ("ts", TS, False),
+            ("realized", F64, False),
+            ("unrealized", F64, False),
+            ("fees", F64, False),
+            ("turnover", F64, False),
+        ],
+    ),
+)
+
+_BY_TAG: Dict[int, _Layout] = {layout.tag: layout for layout in _LAYOUTS}
+_BY_MODEL: Dict[type, _Layout] = {layout.model: layout for layout in _LAYOUTS}
+
+SCHEMA_FINGERPRINT: bytes = hashlib.sha256(
+    (f"v{SCHEMA_VERSION};" + ";".join(layout.describe() for layout in _LAYOUTS)).encode()
+).digest()[:8]
+
+_MESSAGE_PREFIX = MAGIC + bytes([SCHEMA_VERSION])
+
+
+def _layout_for(obj: VM) -> _Layout:
+    layout = _BY_MODEL.get(obj.__class__)
+    if layout is None:
+        raise CodecError(f"no binary layout for {obj.__class__.__name__}")
+    return layout
+
+
+def _check_header(buf: Buffer) -> int:
+    if len(buf) < _HEADER.size:
+        raise CodecError("frame shorter than header")
+    magic, version, tag, fingerprint = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise CodecError("not a VaayuTrade binary frame")
+    if version != SCHEMA_VERSION or fingerprint != SCHEMA_FINGERPRINT:
+        raise SchemaMismatchError(
+            f"frame schema v{version}/{fingerprint.hex()} does not match local "
+            f"v{SCHEMA_VERSION}/{SCHEMA_FINGERPRINT.hex()}"
+        )
+    return int(tag)
+
+
+def _layout_for_tag(tag: int) -> _Layout:
+    layout = _BY_TAG.get(tag)
+    if layout is None:
+        raise CodecError(f"unknown message tag {tag}")
+    return layout
+
+
+# --- public API ---
+
+
+def encode(obj: VM) -> bytes:
+    layout = _layout_for(obj)
+    out = bytearray(_HEADER.pack(MAGIC, SCHEMA_VERSION, layout.tag, SCHEMA_FINGERPRINT))
+    layout.encode(obj, out)
+    return bytes(out)
+
+
+def decode(buf: Buffer) -> VM:
+    tag = _check_header(buf)
+    if tag == _BATCH_TAG:
+        raise CodecError("frame is a batch; use decode_batch")
+    obj, off = _layout_for_tag(tag).decode(buf, _HEADER.size)
+    if off != len(buf):
+        raise CodecError(f"{len(buf) - off} trailing bytes after message")
+    return obj
+
+
+def encode_batch(objs: Iterable[VM]) -> bytes:
+    out = bytearray(_HEADER.pack(MAGIC, SCHEMA_VERSION, _BATCH_TAG, SCHEMA_FINGERPRINT))
+    out += _COUNT.pack(0)
+    count = 0
+    for obj in objs:
+        layout = _layout_for(obj)
+        start = len(out)
+        out += _RECORD.pack(0, layout.tag)
+        layout.encode(obj, out)
+        _RECORD.pack_into(out, start, len(out) - start - _RECORD.size, layout.tag)
+        count += 1
+    _COUNT.pack_into(out, _HEADER.size, count)
+    return bytes(out)
+
+
+def decode_batch(buf: Buffer) -> List[VM]:
+    if _check_header(buf) != _BATCH_TAG:
+        raise CodecError("frame is a single message; use decode")
+    try:
+        (count,) = _COUNT.unpack_from(buf, _HEADER.size)
+    except struct.error as exc:
+        raise CodecError("batch frame shorter than its record count") from exc
+    off = _HEADER.size + _COUNT.size
+    out: List[VM] = []
+    for i in range(count):
+        if off + _RECORD.size > len(buf):
+            raise CodecError(f"batch truncated at record {i} of {count}")
+        length, tag = _RECORD.unpack_from(buf, off)
+        off += _RECORD.size
+        if off + length > len(buf):
+            raise CodecError(f"record {i} of {length} bytes runs past the frame")
+        obj, end = _layout_for_tag(tag).decode(buf, off)
+        if end != off + length:
+            raise CodecError(f"record length {length} does not match decoded {end - off} bytes")
+        out.append(obj)
+        off = end
+    if off != len(buf):
+        raise CodecError(f"{len(buf) - off} trailing bytes after batch")
+    return out
+
+
+def is_binary_frame(buf: Buffer) -> bool:
+    """Cheap sniff so bus consumers can accept JSON and binary during a migration."""
+    return bytes(buf[:3]) == _MESSAGE_PREFIX
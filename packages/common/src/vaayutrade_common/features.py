@@ -0,0 +1,415 @@
+"""
+Incremental, universe-wide feature computation.
+
+Every operator keeps its state in arrays indexed by dense symbol id, so one update call
+advances many symbols with a handful of vectorized NumPy operations and O(1) work per
+symbol. A TickBatch is applied in "rounds": round k holds the k-th tick of each symbol in
+the batch, which gives exactly the result of feeding the ticks one at a time while still
+updating the whole universe per NumPy call. Single ticks go through the same code path.
+
+Operators read named input columns derived from ticks (see `tick_inputs`):
+  price, high, low   last traded price (mid when there is no trade); high = low = price
+  spread_bps         top-of-book spread in basis points of mid
+  imbalance          (bid qty - ask qty) / (bid qty + ask qty) over all 5 levels
+  tod                fraction of the 09:15-15:30 IST session elapsed
+"""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from .models.domain import FeatureSnapshot, TickSnapshot
+from .models.feature_matrix import FeatureMatrix
+from .models.feature_schema import FeatureSchema
+from .models.tick_batch import SymbolTable, TickBatch
+
+Inputs = Mapping[str, np.ndarray]
+
+_MINUTE_NS = 60 * 1_000_000_000
+_SESSION_OPEN_UTC_MIN = 3 * 60 + 45  # 09:15 IST
+_SESSION_MINUTES = 375  # 09:15 -> 15:30
+
+
+def tick_inputs(b: TickBatch) -> Dict[str, np.ndarray]:
+    """Derive operator input columns from a tick batch."""
+    mid = b.mid
+    price = np.where(np.isnan(b.last), mid, b.last)
+    bid_qty = b.bid_qty.sum(axis=1)
+    ask_qty = b.ask_qty.sum(axis=1)
+    total = bid_qty + ask_qty
+    with np.errstate(invalid="ignore", divide="ignore"):
+        spread_bps = b.spread / mid * 1e4
+        imbalance = np.where(total > 0, (bid_qty - ask_qty) / total, np.nan)
+    minute_of_day = (b.ts // _MINUTE_NS) % 1440
+    tod = (minute_of_day - _SESSION_OPEN_UTC_MIN) / _SESSION_MINUTES
+    return {
+        "price": price,
+        "high": price,
+        "low": price,
+        "spread_bps": spread_bps,
+        "imbalance": imbalance,
+        "tod": tod.astype(np.float64),
+    }
+
+
+# --- operators ---
+
+
+class Operator(ABC):
+    """
+    Base class: subclasses list their per-symbol state arrays in `_state` as
+    (attribute, trailing shape, fill value) and implement `update` and `value`.
+    `update(idx, x)` receives unique symbol ids and the matching input rows.
+    """
+
+    name = ""
+    inputs: Tuple[str, ...] = ()
+    _state: Tuple[Tuple[str, Tuple[int, ...], float], ...] = ()
+
+    def __init__(self) -> None:
+        self.capacity = 0
+
+    def grow(self, capacity: int) -> None:
+        if capacity <= self.capacity:
+            return
+        for attr, tail, fill in self._state:
+            fresh = np.full((capacity, *tail), fill, dtype=np.float64)
+            if self.capacity:
+                fresh[: self.capacity] = getattr(self, attr)
+            setattr(self, attr, fresh)
+        self.capacity = capacity
+
+    @abstractmethod
+    def update(self, idx: np.ndarray, x: Inputs) -> None: ...
+
+    @abstractmethod
+    def value(self) -> np.ndarray: ...
+
+
+OPERATORS: Dict[str, Type[Operator]] = {}
+
+
+def register_operator(kind: str) -> Callable[[Type[Operator]], Type[Operator]]:
+    def deco(cls: Type[Operator]) -> Type[Operator]:
+        OPERATORS[kind] = cls
+        return cls
+
+    return deco
+
+
+def make_operator(kind: str, **params: object) -> Operator:
+    try:
+        cls = OPERATORS[kind]
+    except KeyError:
+        raise ValueError(f"unknown feature operator {kind!r}") from None
+    return cls(**params)  # type: ignore[arg-type]
+
+
+@register_operator("latest")
+class Latest(Operator):
+    """Last non-NaN value of an input column."""
+
+    _state = (("_v", (), np.nan),)
+
+    def __init__(self, input: str, name: Optional[str] = None) -> None:
+        super().__init__()
+        self.inputs = (input,)
+        self.name = name or input
+
+    def update(self, idx: np.ndarray, x: Inputs) -> None:
+        v = x[self.inputs[0]]
+        keep = ~np.isnan(v)
+        self._v[idx[keep]] = v[keep]
+
+    def value(self) -> np.ndarray:
+        return self._v
+
+
+@register_operator("rolling_mean")
+class RollingMean(Operator):
+    """Ring-buffer rolling mean over the last `window` samples (partial windows allowed)."""
+
+    def __init__(self, input: str, window: int, name: Optional[str] = None) -> None:
+        super().__init__()
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.inputs = (input,)
+        self.window = window
+        self.name = name or f"{input}_mean_{window}"
+        self._state = (
+            ("_buf", (window,), 0.0),
+            ("_sum", (), 0.0),
+            ("_pos", (), 0.0),
+            ("_count", (), 0.0),
+        )
+
+    def update(self, idx: np.ndarray, x: Inputs) -> None:
+        v = x[self.inputs[0]]
+        pos = self._pos[idx].astype(np.intp)
+        full = self._count[idx] >= self.window
+        old = np.where(full, self._buf[idx, pos], 0.0)
+        self._buf[idx, pos] = v
+        self._sum[idx] += v - old
+        pos = (pos + 1) % self.window
+        self._pos[idx] = pos
+        self._count[idx] = np.minimum(self._count[idx] + 1, self.window)
+        # Re-sum each full lap so floating-point drift cannot accumulate (amortized O(1)).
+        lap = idx[pos == 0]
+        if lap.size:
+            self._sum[lap] = self._buf[lap].sum(axis=1)
+
+    def value(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self._count > 0, self._sum / self._count, np.nan)
+
+
+@register_operator("return")
+class LagReturn(Operator):
+    """Simple return of `input` versus `lag` samples ago (NaN until enough history)."""
+
+    def __init__(self, lag: int, input: str = "price", name: Optional[str] = None) -> None:
+        super().__init__()
+        if lag < 1:
+            raise ValueError("lag must be >= 1")
+        self.inputs = (input,)
+        self.lag = lag
+        self.name = name or f"ret_{lag}"
+        self._state = (
+            ("_buf", (lag + 1,), np.nan),
+            ("_pos", (), 0.0),
+            ("_count", (), 0.0),
+        )
+
+    def update(self, idx: np.ndarray, x: Inputs) -> None:
+        pos = self._pos[idx].astype(np.intp)
+        self._buf[idx, pos] = x[self.inputs[0]]
+        self._pos[idx] = (pos + 1) % (self.lag + 1)
+        self._count[idx] += 1
+
+    def value(self) -> np.ndarray:
+        rows = np.arange(self.capacity)
+        newest = (self._pos.astype(np.intp) - 1) % (self.lag + 1)
+        oldest = self._pos.astype(np.intp)  # slot about to be overwritten = lag samples ago
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ret = self._buf[rows, newest] / self._buf[rows, oldest] - 1.0
+        return np.where(self._count > self.lag, ret, np.nan)
+
+
+@register_operator("ewma")
+class Ewma(Operator):
+    """
+    Exponentially weighted mean with alpha = 2 / (span + 1), seeded by the first sample.
+    NaN samples (e.g. spread on a one-sided book) leave that row's state unchanged.
+    """
+
+    _state = (("_v", (), np.nan),)
+
+    def __init__(self, input: str, span: float, name: Optional[str] = None) -> None:
+        super().__init__()
+        if span < 1:
+            raise ValueError("span must be >= 1")
+        self.inputs = (input,)
+        self.alpha = 2.0 / (span + 1.0)
+        self.name = name or f"{input}_ewma_{span:g}"
+
+    def update(self, idx: np.ndarray, x: Inputs) -> None:
+        v = x[self.inputs[0]]
+        keep = ~np.isnan(v)
+        idx, v = idx[keep], v[keep]
+        prev = self._v[idx]
+        self._v[idx] = np.where(np.isnan(prev), v, prev + self.alpha * (v - prev))
+
+    def value(self) -> np.ndarray:
+        return self._v
+
+
+@register_operator("rsi")
+class WilderRsi(Operator):
+    """
+    Wilder RSI. Average gain/loss use a running mean for the first `period` changes and
+    Wilder smoothing (alpha = 1/period) afterwards; NaN until `period` changes are seen.
+    """
+
+    _state = (("_prev", (), np.nan), ("_gain", (), 0.0), ("_loss", (), 0.0), ("_n", (), 0.0))
+
+    def __init__(self, period: int = 14, input: str = "price", name: Optional[str] = None) -> None:
+        super().__init__()
+        if period < 1:
+            raise ValueError("period must be >= 1")
+        self.inputs = (input,)
+        self.period = period
+        self.name = name or f"rsi_{period}"
+
+    def update(self, idx: np.ndarray, x: Inputs) -> None:
+        v = x[self.inputs[0]]
+        prev = self._prev[idx]
+        has_prev = ~np.isnan(prev)
+        diff = np.where(has_prev, v - prev, 0.0)
+        n = self._n[idx] + has_prev
+        k = np.maximum(np.minimum(n, self.period), 1.0)
+        self._gain[idx] += np.where(has_prev, (np.maximum(diff, 0.0) - self._gain[idx]) / k, 0.0)
+        self._loss[idx] += np.where(has_prev, (np.maximum(-diff, 0.0) - self._loss[idx]) / k, 0.0)
+        self._n[idx] = n
+        self._prev[idx] = v
+
+    def value(self) -> np.ndarray:
+        gain, loss = self._gain, self._loss
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rsi = np.where(loss > 0, 100.0 - 100.0 / (1.0 + gain / loss), 100.0)
+        rsi = np.where((loss == 0) & (gain == 0), 50.0, rsi)
+        return np.where(self._n >= self.period, rsi, np.nan)
+
+
+@register_operator("atr")
+class WilderAtr(Operator):
+    """Wilder ATR over true range of (high, low, previous close)."""
+
+    _state = (("_prev_close", (), np.nan), ("_atr", (), 0.0), ("_n", (), 0.0))
+
+    def __init__(self, period: int = 14, name: Optional[str] = None) -> None:
+        super().__init__()
+        self.inputs = ("high", "low", "price")
+        self.period = period
+        self.name = name or f"atr_{period}"
+
+    def update(self, idx: np.ndarray, x: Inputs) -> None:
+        high, low, close = x["high"], x["low"], x["price"]
+        prev = self._prev_close[idx]
+        tr = np.where(
+            np.isnan(prev),
+            high - low,
+            np.maximum(high - low, np.maximum(np.abs(high - prev), np.abs(low - prev))),
+        )
+        n = self._n[idx] + 1
+        self._atr[idx] += (tr - self._atr[idx]) / np.minimum(n, self.period)
+        self._n[idx] = n
+        self._prev_close[idx] = close
+
+    def value(self) -> np.ndarray:
+        return np.where(self._n >= self.period, self._atr, np.nan)
+
+
+def default_operators() -> List[Operator]:
+    """The planned v1 feature set: returns ladder, ATR, RSI, spread, depth imbalance, time."""
+    return [
+        LagReturn(1),
+        LagReturn(5),
+        LagReturn(20),
+        LagReturn(60),
+        WilderAtr(14),
+        WilderRsi(14),
+        Ewma("spread_bps", 20, name="spread_bps_ewma"),
+        Latest("spread_bps"),
+        Latest("imbalance"),
+        Latest("tod"),
+    ]
+
+
+# --- engine ---
+
+
+class FeatureEngine:
+    """
+    Runs a set of operators over the universe and emits FeatureSnapshots on demand.
+    Ticks whose price cannot be determined (no last trade, one-sided book) are skipped.
+    """
+
+    def __init__(
+        self,
+        operators: Optional[Sequence[Operator]] = None,
+        symbols: Optional[SymbolTable] = None,
+        capacity: int = 128,
+        dtype: Any = np.float64,
+    ) -> None:
+        self.operators = list(operators) if operators is not None else default_operators()
+        self.schema = FeatureSchema((op.name for op in self.operators), dtype)
+        self.names: Tuple[str, ...] = self.schema.names
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self._capacity = 0
+        self._last_ns = np.zeros(0, dtype=np.int64)
+        self._grow(max(capacity, len(self.symbols)))
+
+    def _grow(self, needed: int) -> None:
+        if needed <= self._capacity:
+            return
+        capacity = max(needed, 2 * self._capacity)
+        for op in self.operators:
+            op.grow(capacity)
+        last = np.full(capacity, -1, dtype=np.int64)
+        last[: self._capacity] = self._last_ns
+        self._last_ns = last
+        self._capacity = capacity
+
+    # --- input ---
+
+    def on_tick(self, tick: TickSnapshot) -> None:
+        self.on_batch(TickBatch.from_snapshots([tick], self.symbols))
+
+    def on_batch(self, batch: TickBatch) -> None:
+        if batch.symbols is not self.symbols:
+            raise ValueError("batch must share the engine's SymbolTable")
+        if not len(batch):
+            return
+        self._grow(len(self.symbols))
+        x = tick_inputs(batch)
+        valid = np.flatnonzero(~np.isnan(x["price"]))
+        if valid.size != len(batch):
+            x = {k: v[valid] for k, v in x.items()}
+            sid, ts = batch.symbol_id[valid], batch.ts[valid]
+        else:
+            sid, ts = batch.symbol_id, batch.ts
+        for rows in _rounds(sid):
+            idx = sid[rows].astype(np.intp)
+            xr = {k: v[rows] for k, v in x.items()}
+            for op in self.operators:
+                op.update(idx, xr)
+            self._last_ns[idx] = ts[rows]
+
+    # --- output ---
+
+    def matrix(self, symbols: Optional[Sequence[str]] = None) -> FeatureMatrix:
+        """
+        Dense (n_symbols, n_features) matrix on `self.schema` for `symbols` (default: all)
+        that have seen at least one usable tick; unknown or unseen symbols are skipped.
+        """
+        if symbols is None:
+            sids = np.arange(len(self.symbols))
+        else:
+            sids = np.array(
+                [self.symbols.id_of(s) for s in symbols if s in self.symbols], dtype=np.intp
+            )
+        sids = sids[self._last_ns[sids] >= 0]
+        values = np.empty((len(sids), len(self.operators)), dtype=self.schema.dtype)
+        for j, op in enumerate(self.operators):
+            values[:, j] = op.value()[sids]
+        symbol = self.symbols.symbol
+        return FeatureMatrix(
+            self.schema, [symbol(int(sid)) for sid in sids], self._last_ns[sids], values
+        )
+
+    def snapshot(self, symbol: str) -> Optional[FeatureSnapshot]:
+        snaps = self.snapshots([symbol])
+        return snaps[0] if snaps else None
+
+    def snapshots(self, symbols: Optional[Sequence[str]] = None) -> List[FeatureSnapshot]:
+        """FeatureSnapshots with dense features (rows of `matrix(symbols)`)."""
+        return self.matrix(symbols).to_snapshots()
+
+
+def _rounds(sid: np.ndarray) -> List[np.ndarray]:
+    """
+    Split row positions into rounds where each symbol appears at most once; round k holds
+    each symbol's k-th row. Rows inside a round keep batch order.
+    """
+    n = len(sid)
+    order = np.argsort(sid, kind="stable")
+    sorted_sid = sid[order]
+    starts = np.flatnonzero(np.r_[True, sorted_sid[1:] != sorted_sid[:-1]])
+    sizes = np.diff(np.r_[starts, n])
+    rank = np.empty(n, dtype=np.intp)
+    rank[order] = np.arange(n) - np.repeat(starts, sizes)
+    by_rank = np.argsort(rank, kind="stable")
+    counts = np.bincount(rank)
+    return np.split(by_rank, np.cumsum(counts)[:-1])
@@ -0,0 +1,236 @@
+"""
+Conflating tick ingestion between the broker WebSocket and feature computation.
+
+The feed writes every tick with `put`; each symbol has one slot that always holds its
+newest tick, so a burst (the open, a reconnect replay) costs memory per symbol, never per
+tick. Consumers `drain()` / `await get()` every symbol that changed since their last
+batch, in the order the symbols first changed. A slow consumer therefore skips the
+intermediate ticks it could not keep up with and always works on the freshest state.
+
+Volume: `TickSnapshot.volume` is Kite's cumulative day volume, so the newest tick already
+carries it. With `accumulate_volume`, each drained entry also reports the volume traded
+since the symbol was last drained (increases over the highest cumulative volume seen,
+the same rule as `CandleAggregator`), so nothing traded inside a conflated run is lost.
+
+Queue age is measured on the monotonic clock from the first pending update of an entry
+to the moment it is drained. When the oldest entry of a batch is older than `max_age_s`
+the consumer is behind the feed: `drain` raises `StaleFeedError` (carrying the batch and
+an `ErrorCode.STALE_FEED` `AppError`) or, with `raise_on_stale=False`, only counts it.
+"""
+
+from __future__ import annotations
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .errors import AppError, ErrorCode
+from .models.domain import TickSnapshot
+from .models.tick_batch import TickBatch
+
+
+class ConflatedTick:
+    """One symbol's newest tick plus what was folded into it since the last drain."""
+
+    __slots__ = ("tick", "merged", "volume", "age_ns")
+
+    def __init__(self, tick: TickSnapshot, merged: int, volume: Optional[int], age_ns: int):
+        self.tick = tick
+        self.merged = merged  # ticks received for this entry (1 = nothing conflated)
+        self.volume = volume  # traded since the last drain; None without accumulate_volume
+        self.age_ns = age_ns  # first pending update -> drain
+
+    @property
+    def symbol(self) -> str:
+        return self.tick.symbol
+
+    def __repr__(self) -> str:
+        return (
+            f"ConflatedTick({self.tick.symbol!r}, ts={self.tick.ts.isoformat()}, "
+            f"merged={self.merged}, volume={self.volume}, age_ns={self.age_ns})"
+        )
+
+
+class StaleFeedError(RuntimeError):
+    """Raised by `TickConflator.drain` past the high-water mark; the batch is still attached."""
+
+    def __init__(self, error: AppError, batch: List[ConflatedTick]) -> None:
+        super().__init__(str(error))
+        self.error = error
+        self.batch = batch
+
+
+class IngestStats:
+    """Running counters; `reset_window()` clears the age high-water of the current window."""
+
+    __slots__ = (
+        "received",
+        "conflated",
+        "dropped",
+        "drained",
+        "batches",
+        "stale_batches",
+        "max_age_ns",
+        "last_age_ns",
+    )
+
+    def __init__(self) -> None:
+        self.received = 0  # ticks passed to put()
+        self.conflated = 0  # ticks overwritten by a newer one before being drained
+        self.dropped = 0  # ticks older than the symbol's newest (out of order)
+        self.drained = 0  # entries handed to consumers
+        self.batches = 0
+        self.stale_batches = 0
+        self.max_age_ns = 0  # oldest entry drained in the current window
+        self.last_age_ns = 0  # oldest entry of the last batch
+
+    def reset_window(self) -> None:
+        self.max_age_ns = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _Slot:
+    __slots__ = ("tick", "merged", "volume", "cum_volume", "since_ns")
+
+    def __init__(self) -> None:
+        self.tick: Optional[TickSnapshot] = None
+        self.merged = 0
+        self.volume = 0
+        self.cum_volume = -1
+        self.since_ns = 0
+
+
+class TickConflator:
+    """
+    Per-symbol latest-tick buffer with batch drains and a queue-age high-water mark.
+
+    `put` never blocks and never grows past one slot per symbol; call it (and `get`)
+    from the event loop thread, or hand ticks over with `loop.call_soon_threadsafe`.
+    A tick older than the symbol's current newest is dropped (counted in `dropped`).
+    """
+
+    def __init__(
+        self,
+        max_age_s: float = 1.0,
+        accumulate_volume: bool = True,
+        raise_on_stale: bool = True,
+        clock: Callable[[], int] = time.monotonic_ns,
+    ) -> None:
+        if max_age_s <= 0:
+            raise ValueError("max_age_s must be > 0")
+        self.max_age_ns = int(max_age_s * 1e9)
+        self.accumulate_volume = accumulate_volume
+        self.raise_on_stale = raise_on_stale
+        self._clock = clock
+        self._slots: Dict[str, _Slot] = {}
+        self._pending: Dict[str, _Slot] = {}  # insertion order = order symbols changed
+        self._ready = asyncio.Event()
+        self.stats = IngestStats()
+
+    def __len__(self) -> int:
+        """Symbols with an undrained update."""
+        return len(self._pending)
+
+    # --- producer ---
+
+    def put(self, tick: TickSnapshot) -> None:
+        self.stats.received += 1
+        slot = self._slots.get(tick.symbol)
+        if slot is None:
+            slot = self._slots[tick.symbol] = _Slot()
+        if self.accumulate_volume and tick.volume is not None:
+            if slot.cum_volume >= 0 and tick.volume > slot.cum_volume:
+                slot.volume += tick.volume - slot.cum_volume
+            if tick.volume > slot.cum_volume:
+                slot.cum_volume = tick.volume
+        if slot.tick is not None and tick.ts < slot.tick.ts:
+            self.stats.dropped += 1
+            return
+        slot.tick = tick
+        if slot.merged:
+            self.stats.conflated += 1
+        else:
+            slot.since_ns = self._clock()
+            self._pending[tick.symbol] = slot
+            self._ready.set()
+        slot.merged += 1
+
+    def put_many(self, ticks: Iterable[TickSnapshot]) -> None:
+        for tick in ticks:
+            self.put(tick)
+
+    # --- consumer ---
+
+    def drain(self) -> List[ConflatedTick]:
+        """Every symbol changed since the last drain (possibly none); never waits."""
+        if not self._pending:
+            return []
+        now = self._clock()
+        batch: List[ConflatedTick] = []
+        for slot in self._pending.values():
+            assert slot.tick is not None
+            batch.append(
+                ConflatedTick(
+                    slot.tick,
+                    slot.merged,
+                    slot.volume if self.accumulate_volume else None,
+                    now - slot.since_ns,
+                )
+            )
+            slot.merged = 0
+            slot.volume = 0
+        self._pending.clear()
+        self._ready.clear()
+
+        stats = self.stats
+        age = batch[0].age_ns  # first changed = oldest
+        stats.drained += len(batch)
+        stats.batches += 1
+        stats.last_age_ns = age
+        stats.max_age_ns = max(stats.max_age_ns, age)
+        if age > self.max_age_ns:
+            stats.stale_batches += 1
+            if self.raise_on_stale:
+                raise StaleFeedError(self._stale_error(age, len(batch)), batch)
+        return batch
+
+    async def get(self, timeout: Optional[float] = None) -> List[ConflatedTick]:
+        """Wait until at least one symbol changed, then `drain()`; [] on timeout."""
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        return self.drain()
+
+    @staticmethod
+    def to_batch(entries: List[ConflatedTick]) -> TickBatch:
+        """Drained entries as a `TickBatch` (for `FeatureEngine.on_batch`)."""
+        return TickBatch.from_snapshots([c.tick for c in entries])
+
+    # --- health ---
+
+    def oldest_age_ns(self) -> int:
+        """Age of the oldest undrained entry (0 when nothing is pending)."""
+        if not self._pending:
+            return 0
+        return self._clock() - next(iter(self._pending.values())).since_ns
+
+    def check(self) -> Optional[AppError]:
+        """STALE_FEED error when pending updates are past the high-water mark, else None."""
+        age = self.oldest_age_ns()
+        if age > self.max_age_ns:
+            return self._stale_error(age, len(self._pending))
+        return None
+
+    def _stale_error(self, age_ns: int, symbols: int) -> AppError:
+        return AppError(
+            code=ErrorCode.STALE_FEED,
+            message=(
+                f"tick queue age {age_ns / 1e6:.1f} ms exceeds "
+                f"{self.max_age_ns / 1e6:.1f} ms high-water mark"
+            ),
+            retryable=True,
+            details={"age_ns": age_ns, "symbols": symbols, **self.stats.as_dict()},
+        )
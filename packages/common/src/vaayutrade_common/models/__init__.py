@@ -21,6 +21,11 @@ from .domain import (
     BacktestRun,
     ConfigBlob,
 )
+from .base import VM, trusted_mode
+from .depth import BookSide
+from .feature_schema import FeatureSchema, FeatureVector
+from .feature_matrix import FeatureMatrix
+from .tick_batch import SymbolTable, TickBatch
 
 __all__ = [
     "Account",
@@ -44,4 +49,12 @@ __all__ = [
     "AlertEvent",
     "BacktestRun",
     "ConfigBlob",
+    "BookSide",
+    "FeatureMatrix",
+    "FeatureSchema",
+    "FeatureVector",
+    "SymbolTable",
+    "TickBatch",
+    "VM",
+    "trusted_mode",
 ]
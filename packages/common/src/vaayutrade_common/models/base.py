@@ -1,10 +1,102 @@
 from __future__ import annotations
-from pydantic import BaseModel, ConfigDict
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from pydantic_core import PydanticUndefined
+
+M = TypeVar("M", bound="VM")
+
+# (field name, default, default_factory) per model class; built on first trusted use.
+_Plan = Tuple[Tuple[str, Any, Optional[Callable[[], Any]]], ...]
+
+_PLANS: Dict[type, _Plan] = {}
+_LIST_ADAPTERS: Dict[type, TypeAdapter[Any]] = {}
+_set_attr = object.__setattr__
+
+
+def _plan(cls: type) -> _Plan:
+    plan = _PLANS.get(cls)
+    if plan is None:
+        plan = tuple(
+            (name, field.default, field.default_factory)  # type: ignore[misc]
+            for name, field in cls.__pydantic_fields__.items()  # type: ignore[attr-defined]
+        )
+        _PLANS[cls] = plan
+    return plan
+
+
+def _populate_trusted(obj: "VM", data: Mapping[str, Any]) -> None:
+    """
+    Fill `obj` like pydantic's model_construct, minus its per-call alias handling.
+    Keys must be field names; missing required fields stay unset.
+    """
+    values: Dict[str, Any] = {}
+    for name, default, factory in _plan(obj.__class__):
+        if name in data:
+            values[name] = data[name]
+        elif factory is not None:
+            values[name] = factory()
+        elif default is PydanticUndefined:
+            continue  # required and not given: absent, as with model_construct
+        elif default.__class__ in (list, dict, set):
+            values[name] = default.copy()
+        else:
+            values[name] = default
+    _set_attr(obj, "__dict__", values)
+    _set_attr(obj, "__pydantic_fields_set__", set(data))
+    _set_attr(obj, "__pydantic_extra__", None)
+    _set_attr(obj, "__pydantic_private__", None)
+
+
+@contextmanager
+def trusted_mode(model: Type[M]) -> Iterator[Callable[..., M]]:
+    """
+    Scope a trusted lane for `model`: yields its unvalidated constructor.
+
+        with trusted_mode(Signal) as new:
+            signals = [new(**row) for row in rows]
+
+    Only for inputs validated upstream. Nothing global changes: `model(**data)` and
+    attribute assignment keep validating inside the block too.
+    """
+    _plan(model)  # build the field plan once, before the loop
+    yield model.construct_trusted
+
+
+def construct_complete(cls: Type[M], values: Dict[str, Any]) -> M:
+    """
+    Trusted construction when `values` already holds every field in declaration order
+    (decoders that produce whole rows). Takes ownership of `values`.
+    """
+    obj = cls.__new__(cls)
+    _set_attr(obj, "__dict__", values)
+    _set_attr(obj, "__pydantic_fields_set__", set(values))
+    _set_attr(obj, "__pydantic_extra__", None)
+    _set_attr(obj, "__pydantic_private__", None)
+    return obj
 
 
 class VM(BaseModel):
     """
     Base model with JSON-friendly settings.
+
+    Hot paths that build models from already-validated data can bypass validation with
+    `construct_trusted` / `construct_trusted_many` (or a scoped `trusted_mode(Model)`), and
+    update them with `assign_trusted`.
+    Plain construction and assignment always validate.
     """
 
     model_config = ConfigDict(
@@ -16,3 +108,49 @@ class VM(BaseModel):
         arbitrary_types_allowed=False,
         use_enum_values=True,
     )
+
+    # --- trusted construction ---
+
+    @classmethod
+    def construct_trusted(cls: Type[M], **data: Any) -> M:
+        """Build without validation; defaults and default factories are still applied."""
+        if cls.__private_attributes__:
+            return cls.model_construct(**data)
+        obj = cls.__new__(cls)
+        _populate_trusted(obj, data)
+        return obj
+
+    @classmethod
+    def construct_trusted_many(cls: Type[M], rows: Iterable[Mapping[str, Any]]) -> List[M]:
+        if cls.__private_attributes__:
+            return [cls.model_construct(**row) for row in rows]
+        new = cls.__new__
+        out: List[M] = []
+        for row in rows:
+            obj = new(cls)
+            _populate_trusted(obj, row)
+            out.append(obj)
+        return out
+
+    def assign_trusted(self, **values: Any) -> None:
+        """Set fields without validate_assignment; keys must be field names."""
+        fields = self.__class__.__pydantic_fields__
+        unknown = values.keys() - fields.keys()
+        if unknown:
+            raise AttributeError(f"{self.__class__.__name__} has no fields {sorted(unknown)}")
+        self.__dict__.update(values)
+        self.__pydantic_fields_set__.update(values)
+
+    # --- batch validation ---
+
+    @classmethod
+    def validate_many(cls: Type[M], rows: Iterable[Any]) -> List[M]:
+        """
+        Validate a list of raw dicts (or model instances) in one pydantic-core call.
+        Raises a single ValidationError whose locations are prefixed with the row index.
+        """
+        adapter = _LIST_ADAPTERS.get(cls)
+        if adapter is None:
+            adapter = TypeAdapter(List[cls])  # type: ignore[valid-type]
+            _LIST_ADAPTERS[cls] = adapter
+        return adapter.validate_python(rows if isinstance(rows, list) else list(rows))
@@ -0,0 +1,190 @@
+from __future__ import annotations
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Sequence, Union, overload
+
+import numpy as np
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import SchemaValidator, core_schema
+
+from .base import VM
+
+DEPTH = 5  # Kite publishes at most 5 levels per side
+_PAD = (float("nan"), 0.0)
+
+
+class PriceLevel(VM):
+    price: float
+    qty: int
+
+
+# Same (lax) rules as List[PriceLevel]: "10" and 10.0 are quantities, 10.7 is not.
+_LEVEL_SCHEMA = core_schema.typed_dict_schema(
+    {
+        "price": core_schema.typed_dict_field(core_schema.float_schema()),
+        "qty": core_schema.typed_dict_field(core_schema.int_schema()),
+    }
+)
+_check_level = SchemaValidator(_LEVEL_SCHEMA).validate_python
+
+
+def _checked(price: Any, qty: Any) -> tuple[float, int]:
+    # Plain float/int pairs (the feed and every internal caller) skip pydantic-core.
+    if price.__class__ in (float, int) and qty.__class__ is int:
+        return float(price), qty
+    level = _check_level({"price": price, "qty": qty})
+    return level["price"], level["qty"]
+
+
+def _level_pair(level: Any) -> tuple[float, int]:
+    if isinstance(level, Mapping):
+        return _checked(level["price"], level["qty"])
+    if isinstance(level, tuple):
+        price, qty = level
+        return _checked(price, qty)
+    if isinstance(level, PriceLevel):
+        return _checked(level.price, level.qty)
+    raise TypeError(f"expected a price level, got {level!r}")
+
+
+class BookSide:
+    """
+    One side of a Kite depth snapshot as a fixed (5, 2) float64 array of (price, qty).
+
+    Rows beyond `len(side)` hold price NaN / qty 0. Validates from and serializes to the
+    same `[{"price": ..., "qty": ...}, ...]` shape as List[PriceLevel]; indexing and
+    iteration yield PriceLevel objects for compatibility, but hot code should use
+    `prices`, `qtys` and `best_price` which do not allocate models.
+    """
+
+    __slots__ = ("_levels", "_n")
+
+    def __init__(self, levels: np.ndarray, n: int) -> None:
+        if levels.shape != (DEPTH, 2):
+            raise ValueError(f"depth array must have shape ({DEPTH}, 2), got {levels.shape}")
+        if not 0 <= n <= DEPTH:
+            raise ValueError(f"level count must be within 0..{DEPTH}, got {n}")
+        self._levels = levels
+        self._n = n
+
+    @classmethod
+    def empty(cls) -> "BookSide":
+        return cls(np.array([_PAD] * DEPTH), 0)
+
+    @classmethod
+    def from_levels(cls, levels: Iterable[Any]) -> "BookSide":
+        """
+        Pack PriceLevel objects, {"price", "qty"} mappings or (price, qty) tuples.
+
+        Values follow PriceLevel's lax rules (10.0 and "10" are quantities, 10.7 is
+        rejected); lists are not taken as pairs so JSON arrays never pass as a level.
+        """
+        pairs = [_level_pair(lvl) for lvl in levels]
+        n = len(pairs)
+        if n > DEPTH:
+            raise ValueError(f"depth has {n} levels, at most {DEPTH} allowed")
+        return cls(np.array(pairs + [_PAD] * (DEPTH - n), dtype=np.float64), n)
+
+    @classmethod
+    def from_arrays(cls, prices: np.ndarray, qtys: np.ndarray) -> "BookSide":
+        """Build from length-5 price/qty rows (NaN price marks a missing level)."""
+        levels = np.empty((DEPTH, 2))
+        levels[:, 0] = prices
+        levels[:, 1] = qtys
+        n = int(np.count_nonzero(~np.isnan(levels[:, 0])))
+        levels[n:, 1] = 0.0
+        return cls(levels, n)
+
+    # --- accessors ---
+
+    @property
+    def levels(self) -> np.ndarray:
+        """Read-only view of the full (5, 2) array, padding included."""
+        view = self._levels.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self._levels[: self._n, 0]
+
+    @property
+    def qtys(self) -> np.ndarray:
+        return self._levels[: self._n, 1]
+
+    @property
+    def best_price(self) -> Optional[float]:
+        return float(self._levels[0, 0]) if self._n else None
+
+    @property
+    def best_qty(self) -> Optional[int]:
+        return int(self._levels[0, 1]) if self._n else None
+
+    def to_levels(self) -> List[PriceLevel]:
+        new = PriceLevel.construct_trusted
+        return [new(price=p, qty=int(q)) for p, q in self._levels[: self._n].tolist()]
+
+    def to_list(self) -> List[dict[str, Union[float, int]]]:
+        return [{"price": p, "qty": int(q)} for p, q in self._levels[: self._n].tolist()]
+
+    # --- sequence protocol (compatibility with List[PriceLevel]) ---
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self) -> Iterator[PriceLevel]:
+        return iter(self.to_levels())
+
+    @overload
+    def __getitem__(self, item: int) -> PriceLevel: ...
+
+    @overload
+    def __getitem__(self, item: slice) -> List[PriceLevel]: ...
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[PriceLevel, List[PriceLevel]]:
+        return self.to_levels()[item]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, BookSide):
+            return self._n == other._n and bool(
+                np.array_equal(self._levels[: self._n], other._levels[: other._n])
+            )
+        if isinstance(other, Sequence):
+            try:
+                return self == BookSide.from_levels(other)
+            except (TypeError, ValueError, KeyError, AttributeError):
+                return False
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        inner = ", ".join(f"({p}, {int(q)})" for p, q in self._levels[: self._n].tolist())
+        return f"BookSide([{inner}])"
+
+    # --- pydantic integration ---
+
+    @classmethod
+    def _validate(cls, value: Any) -> "BookSide":
+        if isinstance(value, BookSide):
+            return value
+        if isinstance(value, (str, bytes)) or not isinstance(value, Iterable):
+            raise ValueError("depth must be a list of price levels")
+        try:
+            return cls.from_levels(value)
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"invalid price level: {exc}") from exc
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, _source: Any, _handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        level = _LEVEL_SCHEMA
+        from_json = core_schema.no_info_after_validator_function(
+            cls.from_levels, core_schema.list_schema(level, max_length=DEPTH)
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_json,
+            python_schema=core_schema.no_info_plain_validator_function(cls._validate),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                BookSide.to_list, return_schema=core_schema.list_schema(level)
+            ),
+        )
@@ -1,11 +1,13 @@
 from __future__ import annotations
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Annotated, Any, Dict, List, Literal, Mapping, Optional
+from typing import Annotated, Any, Dict, List, Literal, Mapping, Optional, Union
 from uuid import UUID, uuid4
 
 from pydantic import Field, StringConstraints, model_validator
 from .base import VM
+from .depth import BookSide, PriceLevel  # noqa: F401  (PriceLevel re-exported)
+from .feature_schema import FeatureSchema, FeatureValue, FeatureVector
 
 # --- Core domain models (aligned with Discovery §3) ---
 
@@ -130,7 +132,17 @@ class ModelArtifact(VM):
 class FeatureSnapshot(VM):
     ts: datetime
     symbol: str
-    features: Mapping[str, float]
+    # Either a plain mapping (JSON / dashboard form) or a dense FeatureVector; both
+    # serialize to the same JSON object, NaN as null (read back as NaN).
+    features: Union[FeatureVector, Dict[str, FeatureValue]]
+
+    def dense(self, schema: FeatureSchema) -> FeatureVector:
+        """Features as a vector on `schema` (no copy when already dense on it)."""
+        return schema.vector(self.features)
+
+    def as_mapping(self) -> Dict[str, float]:
+        feats = self.features
+        return feats.to_dict() if isinstance(feats, FeatureVector) else dict(feats)
 
 
 class Candle(VM):
@@ -144,19 +156,32 @@ class Candle(VM):
     vwap: Optional[float] = None
 
 
-class PriceLevel(VM):
-    price: float
-    qty: int
-
-
 class TickSnapshot(VM):
     ts: datetime
     symbol: str
-    bids: List[PriceLevel]  # depth 1..5
-    asks: List[PriceLevel]
+    bids: BookSide  # depth 1..5, serialized as [{"price", "qty"}, ...]
+    asks: BookSide
     last: Optional[float] = None
     volume: Optional[int] = None
 
+    @property
+    def best_bid(self) -> Optional[float]:
+        return self.bids.best_price
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        return self.asks.best_price
+
+    @property
+    def spread(self) -> Optional[float]:
+        bid, ask = self.bids.best_price, self.asks.best_price
+        return None if bid is None or ask is None else ask - bid
+
+    @property
+    def mid(self) -> Optional[float]:
+        bid, ask = self.bids.best_price, self.asks.best_price
+        return None if bid is None or ask is None else (bid + ask) / 2.0
+
 
 class AlertSeverity(str, Enum):
     INFO = "INFO"
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .domain import FeatureSnapshot
+from .feature_schema import FeatureSchema, FeatureVector
+from .tick_batch import from_epoch_ns, to_epoch_ns
+
+
+class FeatureMatrix:
+    """
+    Universe-wide (n_symbols, n_features) feature matrix against one schema, the input
+    shape for batch scoring. Rows align with `symbols` and `ts` (int64 epoch ns).
+    """
+
+    __slots__ = ("schema", "symbols", "ts", "values")
+
+    def __init__(
+        self, schema: FeatureSchema, symbols: Sequence[str], ts: np.ndarray, values: np.ndarray
+    ) -> None:
+        if values.shape != (len(symbols), len(schema)) or ts.shape != (len(symbols),):
+            raise ValueError(
+                f"matrix shape {values.shape} / ts {ts.shape} do not fit "
+                f"{len(symbols)} symbols x {len(schema)} features"
+            )
+        self.schema = schema
+        self.symbols = list(symbols)
+        self.ts = ts
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @classmethod
+    def from_snapshots(
+        cls, snapshots: Sequence[FeatureSnapshot], schema: FeatureSchema
+    ) -> "FeatureMatrix":
+        """Stack FeatureSnapshots; dense rows on `schema` are copied without key lookups."""
+        values = np.empty((len(snapshots), len(schema)), dtype=schema.dtype)
+        ts = np.empty(len(snapshots), dtype=np.int64)
+        for i, snap in enumerate(snapshots):
+            feats = snap.features
+            if isinstance(feats, FeatureVector) and feats.schema.hash == schema.hash:
+                values[i] = feats.values
+            else:
+                values[i] = schema.vector(feats).values
+            ts[i] = to_epoch_ns(snap.ts)
+        return cls(schema, [snap.symbol for snap in snapshots], ts, values)
+
+    def to_snapshots(self) -> List[FeatureSnapshot]:
+        """FeatureSnapshots whose dense features are views of this matrix's rows."""
+        new = FeatureSnapshot.construct_trusted
+        schema = self.schema
+        return [
+            new(ts=from_epoch_ns(ns), symbol=symbol, features=FeatureVector(schema, row))
+            for ns, symbol, row in zip(self.ts.tolist(), self.symbols, self.values)
+        ]
+
+    def row(self, symbol: str) -> Optional[np.ndarray]:
+        try:
+            return self.values[self.symbols.index(symbol)]
+        except ValueError:
+            return None
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self.schema.index(name)]
+
+    def __repr__(self) -> str:
+        return f"FeatureMatrix({len(self)} symbols, {self.schema!r})"
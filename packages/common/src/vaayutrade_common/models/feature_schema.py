@@ -0,0 +1,130 @@
+from __future__ import annotations
+import hashlib
+from typing import Annotated, Any, Dict, Iterable, Iterator, Mapping, Sequence, Tuple
+
+import numpy as np
+from pydantic import BeforeValidator, GetCoreSchemaHandler, WithJsonSchema
+from pydantic_core import core_schema
+
+
+class FeatureSchemaMismatch(ValueError):
+    pass
+
+
+def _nan_if_none(value: Any) -> Any:
+    return float("nan") if value is None else value
+
+
+# A feature value on the wire: NaN (not warmed up / no book) is written as JSON null, so
+# null must read back as NaN for snapshots to survive a JSON round trip.
+FeatureValue = Annotated[
+    float,
+    BeforeValidator(_nan_if_none),
+    WithJsonSchema({"anyOf": [{"type": "number"}, {"type": "null"}]}),
+]
+
+
+class FeatureSchema:
+    """
+    Ordered feature names -> column positions, identified by `hash` (the value stored in
+    `ModelArtifact.schema_hash`). The hash covers the names and their order only; `dtype`
+    is the storage type of vectors built against the schema.
+    """
+
+    __slots__ = ("names", "dtype", "hash", "_index")
+
+    def __init__(self, names: Iterable[str], dtype: Any = np.float64) -> None:
+        self.names: Tuple[str, ...] = tuple(names)
+        self._index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        if len(self._index) != len(self.names):
+            raise ValueError(f"duplicate feature names: {list(self.names)}")
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError(f"feature dtype must be float32 or float64, got {self.dtype}")
+        self.hash = schema_hash(self.names)
+
+    def index(self, name: str) -> int:
+        return self._index[name]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FeatureSchema):
+            return self.hash == other.hash and self.dtype == other.dtype
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.hash, self.dtype.str))
+
+    def __repr__(self) -> str:
+        return f"FeatureSchema({len(self)} features, hash={self.hash}, dtype={self.dtype})"
+
+    def require(self, expected_hash: str) -> None:
+        """Raise FeatureSchemaMismatch unless `expected_hash` (e.g. an artifact's) matches."""
+        if expected_hash != self.hash:
+            raise FeatureSchemaMismatch(
+                f"features built for schema {self.hash}, model expects {expected_hash}"
+            )
+
+    def vector(self, features: Mapping[str, float], fill: float = float("nan")) -> "FeatureVector":
+        """Densify a name -> value mapping; missing names get `fill`, unknown names are ignored."""
+        if isinstance(features, FeatureVector) and features.schema == self:
+            return features
+        get = features.get
+        values = np.array([get(name, fill) for name in self.names], dtype=self.dtype)
+        return FeatureVector(self, values)
+
+
+def schema_hash(names: Sequence[str]) -> str:
+    return hashlib.sha256("\n".join(names).encode()).hexdigest()[:16]
+
+
+class FeatureVector(Mapping[str, float]):
+    """
+    Dense feature values laid out by a FeatureSchema. Behaves as a read-only mapping so
+    `FeatureSnapshot.features[name]` keeps working and serializes to the same JSON object.
+    """
+
+    __slots__ = ("schema", "values")
+
+    def __init__(self, schema: FeatureSchema, values: np.ndarray) -> None:
+        if values.shape != (len(schema),):
+            raise ValueError(f"expected {len(schema)} feature values, got shape {values.shape}")
+        self.schema = schema
+        self.values = values
+
+    def __getitem__(self, name: str) -> float:
+        return float(self.values[self.schema.index(name)])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.schema.names)
+
+    def __len__(self) -> int:
+        return len(self.schema.names)
+
+    def to_dict(self) -> Dict[str, float]:
+        return dict(zip(self.schema.names, self.values.tolist()))
+
+    def __repr__(self) -> str:
+        return f"FeatureVector({self.to_dict()!r}, hash={self.schema.hash})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, _source: Any, _handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        # Instances pass through untouched; plain mappings (and all JSON) are left to the
+        # Dict[str, float] branch of the field's union.
+        return core_schema.is_instance_schema(
+            cls,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                FeatureVector.to_dict,
+                return_schema=core_schema.dict_schema(
+                    core_schema.str_schema(),
+                    core_schema.nullable_schema(core_schema.float_schema()),
+                ),
+            ),
+        )
@@ -0,0 +1,319 @@
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .depth import DEPTH, BookSide
+from .domain import TickSnapshot
+
+NO_VOLUME = -1  # sentinel for TickSnapshot.volume is None
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_US = timedelta(microseconds=1)
+
+
+def to_epoch_ns(ts: datetime) -> int:
+    """UTC epoch nanoseconds; naive datetimes are taken as UTC."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ((ts - _EPOCH) // _US) * 1000
+
+
+def from_epoch_ns(ns: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=ns // 1000)
+
+
+class SymbolTable:
+    """
+    Interns symbol strings to dense integer ids (0..n-1).
+    Share one table across batches so ids stay comparable.
+    """
+
+    __slots__ = ("_ids", "_symbols")
+
+    def __init__(self, symbols: Iterable[str] = ()) -> None:
+        self._ids: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        for s in symbols:
+            self.intern(s)
+
+    def intern(self, symbol: str) -> int:
+        sid = self._ids.get(symbol)
+        if sid is None:
+            sid = len(self._symbols)
+            self._ids[symbol] = sid
+            self._symbols.append(symbol)
+        return sid
+
+    def id_of(self, symbol: str) -> int:
+        return self._ids[symbol]
+
+    def symbol(self, sid: int) -> str:
+        return self._symbols[sid]
+
+    @property
+    def symbols(self) -> Sequence[str]:
+        return tuple(self._symbols)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._ids
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+
+class TickBatch:
+    """
+    Columnar container for a stream of TickSnapshot rows.
+
+    Columns (n = number of ticks):
+      ts         int64[n]     UTC epoch nanoseconds
+      symbol_id  int32[n]     ids into `symbols`
+      last       float64[n]   NaN when last is None
+      volume     int64[n]     NO_VOLUME when volume is None
+      bid_px     float64[n,5] NaN for missing levels
+      bid_qty    int64[n,5]   0 for missing levels
+      ask_px     float64[n,5]
+      ask_qty    int64[n,5]
+
+    Slicing (`batch[i:j]`, `between`) returns views that share memory with the parent
+    batch; so do `partition_by_symbol` groups when the batch is already ordered by symbol
+    (otherwise that call makes one gather copy).
+    """
+
+    __slots__ = (
+        "symbols",
+        "ts",
+        "symbol_id",
+        "last",
+        "volume",
+        "bid_px",
+        "bid_qty",
+        "ask_px",
+        "ask_qty",
+    )
+
+    def __init__(
+        self,
+        symbols: SymbolTable,
+        ts: np.ndarray,
+        symbol_id: np.ndarray,
+        last: np.ndarray,
+        volume: np.ndarray,
+        bid_px: np.ndarray,
+        bid_qty: np.ndarray,
+        ask_px: np.ndarray,
+        ask_qty: np.ndarray,
+    ) -> None:
+        n = len(ts)
+        for name, col in (
+            ("symbol_id", symbol_id),
+            ("last", last),
+            ("volume", volume),
+            ("bid_px", bid_px),
+            ("bid_qty", bid_qty),
+            ("ask_px", ask_px),
+            ("ask_qty", ask_qty),
+        ):
+            if len(col) != n:
+                raise ValueError(f"column {name} has length {len(col)}, expected {n}")
+        self.symbols = symbols
+        self.ts = ts
+        self.symbol_id = symbol_id
+        self.last = last
+        self.volume = volume
+        self.bid_px = bid_px
+        self.bid_qty = bid_qty
+        self.ask_px = ask_px
+        self.ask_qty = ask_qty
+
+    # --- construction ---
+
+    @classmethod
+    def empty(cls, n: int = 0, symbols: Optional[SymbolTable] = None) -> "TickBatch":
+        return cls(
+            symbols=symbols if symbols is not None else SymbolTable(),
+            ts=np.zeros(n, dtype=np.int64),
+            symbol_id=np.zeros(n, dtype=np.int32),
+            last=np.full(n, np.nan),
+            volume=np.full(n, NO_VOLUME, dtype=np.int64),
+            bid_px=np.full((n, DEPTH), np.nan),
+            bid_qty=np.zeros((n, DEPTH), dtype=np.int64),
+            ask_px=np.full((n, DEPTH), np.nan),
+            ask_qty=np.zeros((n, DEPTH), dtype=np.int64),
+        )
+
+    @classmethod
+    def from_snapshots(
+        cls, snapshots: Sequence[TickSnapshot], symbols: Optional[SymbolTable] = None
+    ) -> "TickBatch":
+        symbols = symbols if symbols is not None else SymbolTable()
+        n = len(snapshots)
+        if not n:
+            return cls.empty(0, symbols)
+        intern = symbols.intern
+        bids = np.stack([snap.bids.levels for snap in snapshots])  # (n, 5, 2)
+        asks = np.stack([snap.asks.levels for snap in snapshots])
+        return cls(
+            symbols=symbols,
+            ts=np.fromiter((to_epoch_ns(snap.ts) for snap in snapshots), dtype=np.int64, count=n),
+            symbol_id=np.fromiter(
+                (intern(snap.symbol) for snap in snapshots), dtype=np.int32, count=n
+            ),
+            last=np.array(
+                [np.nan if snap.last is None else snap.last for snap in snapshots],
+                dtype=np.float64,
+            ),
+            volume=np.array(
+                [NO_VOLUME if snap.volume is None else snap.volume for snap in snapshots],
+                dtype=np.int64,
+            ),
+            bid_px=np.ascontiguousarray(bids[:, :, 0]),
+            bid_qty=bids[:, :, 1].astype(np.int64),
+            ask_px=np.ascontiguousarray(asks[:, :, 0]),
+            ask_qty=asks[:, :, 1].astype(np.int64),
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["TickBatch"]) -> "TickBatch":
+        if not batches:
+            return cls.empty()
+        symbols = batches[0].symbols
+        if any(b.symbols is not symbols for b in batches):
+            raise ValueError("TickBatch.concat requires batches sharing one SymbolTable")
+        return cls(
+            symbols=symbols,
+            ts=np.concatenate([b.ts for b in batches]),
+            symbol_id=np.concatenate([b.symbol_id for b in batches]),
+            last=np.concatenate([b.last for b in batches]),
+            volume=np.concatenate([b.volume for b in batches]),
+            bid_px=np.concatenate([b.bid_px for b in batches]),
+            bid_qty=np.concatenate([b.bid_qty for b in batches]),
+            ask_px=np.concatenate([b.ask_px for b in batches]),
+            ask_qty=np.concatenate([b.ask_qty for b in batches]),
+        )
+
+    # --- conversion ---
+
+    def to_snapshots(self) -> List[TickSnapshot]:
+        """
+        Rebuild row objects. Columns are trusted, so models are constructed unvalidated;
+        each BookSide is a view of one stacked (n, 5, 2) array.
+        """
+        tick = TickSnapshot.construct_trusted
+        symbol = self.symbols.symbol
+        bids = np.stack((self.bid_px, self.bid_qty), axis=2)
+        asks = np.stack((self.ask_px, self.ask_qty), axis=2)
+        n_bids = np.count_nonzero(~np.isnan(self.bid_px), axis=1).tolist()
+        n_asks = np.count_nonzero(~np.isnan(self.ask_px), axis=1).tolist()
+        out: List[TickSnapshot] = []
+        for i, (ns, sid, last, vol) in enumerate(
+            zip(
+                self.ts.tolist(),
+                self.symbol_id.tolist(),
+                self.last.tolist(),
+                self.volume.tolist(),
+            )
+        ):
+            out.append(
+                tick(
+                    ts=from_epoch_ns(ns),
+                    symbol=symbol(sid),
+                    bids=BookSide(bids[i], n_bids[i]),
+                    asks=BookSide(asks[i], n_asks[i]),
+                    last=None if last != last else last,  # NaN -> None
+                    volume=None if vol == NO_VOLUME else vol,
+                )
+            )
+        return out
+
+    # --- slicing ---
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def __getitem__(self, item: slice) -> "TickBatch":
+        if not isinstance(item, slice):
+            raise TypeError("TickBatch supports slice indexing only; use to_snapshots() for rows")
+        return TickBatch(
+            symbols=self.symbols,
+            ts=self.ts[item],
+            symbol_id=self.symbol_id[item],
+            last=self.last[item],
+            volume=self.volume[item],
+            bid_px=self.bid_px[item],
+            bid_qty=self.bid_qty[item],
+            ask_px=self.ask_px[item],
+            ask_qty=self.ask_qty[item],
+        )
+
+    def between(self, start: datetime, end: datetime) -> "TickBatch":
+        """Ticks with start <= ts < end. Assumes `ts` is ascending (stream order)."""
+        lo = int(np.searchsorted(self.ts, to_epoch_ns(start), side="left"))
+        hi = int(np.searchsorted(self.ts, to_epoch_ns(end), side="left"))
+        return self[lo:hi]
+
+    def partition_by_symbol(self) -> Dict[str, "TickBatch"]:
+        """
+        Group ticks per symbol, preserving time order within each symbol.
+
+        A batch already ordered by symbol id is split without copying: each group is a
+        view of this batch. Otherwise the rows are gathered once into symbol order (one
+        copy per call) and each group is a view of that copy.
+        """
+        sid = self.symbol_id
+        if len(sid) > 1 and np.any(sid[1:] < sid[:-1]):
+            grouped = self.take(np.argsort(sid, kind="stable"))
+        else:
+            grouped = self
+        sids, starts = np.unique(grouped.symbol_id, return_index=True)
+        ends = np.append(starts[1:], len(grouped))
+        return {
+            self.symbols.symbol(int(sid)): grouped[int(lo) : int(hi)]
+            for sid, lo, hi in zip(sids, starts, ends)
+        }
+
+    def take(self, indices: np.ndarray) -> "TickBatch":
+        """Gather rows by index or boolean mask (copies)."""
+        return TickBatch(
+            symbols=self.symbols,
+            ts=self.ts[indices],
+            symbol_id=self.symbol_id[indices],
+            last=self.last[indices],
+            volume=self.volume[indices],
+            bid_px=self.bid_px[indices],
+            bid_qty=self.bid_qty[indices],
+            ask_px=self.ask_px[indices],
+            ask_qty=self.ask_qty[indices],
+        )
+
+    # --- helpers ---
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            col.nbytes
+            for col in (
+                self.ts,
+                self.symbol_id,
+                self.last,
+                self.volume,
+                self.bid_px,
+                self.bid_qty,
+                self.ask_px,
+                self.ask_qty,
+            )
+        )
+
+    @property
+    def mid(self) -> np.ndarray:
+        """Top-of-book mid price per tick (NaN if either side is empty)."""
+        return (self.bid_px[:, 0] + self.ask_px[:, 0]) / 2.0
+
+    @property
+    def spread(self) -> np.ndarray:
+        return self.ask_px[:, 0] - self.bid_px[:, 0]
+
+    def __repr__(self) -> str:
+        return f"TickBatch(n={len(self)}, symbols={len(self.symbols)})"
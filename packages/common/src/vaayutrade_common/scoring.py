@@ -0,0 +1,137 @@
+"""
+Universe-wide scoring: one model call per FeatureMatrix, then vectorized thresholds,
+side selection and confidence. Output is a columnar SignalBatch; Signal objects are only
+built for the rows that pass.
+
+A model returns a raw score per row (higher = more bullish). `to_prob` maps raw scores to
+P(up) (logistic by default; a fitted calibrator can be plugged in). A row becomes a BUY
+when P(up) >= `buy_above`, a SELL when P(up) <= `sell_below`, and conf is the probability
+of the chosen direction. Rows with any NaN feature (operators still warming up) score NaN
+and never pass.
+"""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+from .models.domain import OrderSide, Signal
+from .models.feature_matrix import FeatureMatrix
+from .models.tick_batch import from_epoch_ns
+
+BUY, FLAT, SELL = 1, 0, -1
+
+
+class Model(ABC):
+    """Scoring interface: `predict` maps an (n, k) matrix on `schema_hash` to n scores."""
+
+    schema_hash = ""
+
+    @abstractmethod
+    def predict(self, x: np.ndarray) -> np.ndarray: ...
+
+
+class LinearModel(Model):
+    """Pure-NumPy reference model: score = x @ weights + bias."""
+
+    def __init__(self, weights: Sequence[float], schema_hash: str, bias: float = 0.0) -> None:
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.schema_hash = schema_hash
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        if x.shape[1] != self.weights.shape[0]:
+            raise ValueError(
+                f"model has {self.weights.shape[0]} weights, got {x.shape[1]} features"
+            )
+        return x @ self.weights.astype(x.dtype, copy=False) + self.bias
+
+
+def logistic(score: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.asarray(score, dtype=np.float64)))
+
+
+class SignalBatch:
+    """Columnar scoring result; rows align with the scored FeatureMatrix."""
+
+    __slots__ = ("symbols", "ts", "score", "prob", "side", "conf", "horizon")
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        ts: np.ndarray,
+        score: np.ndarray,
+        prob: np.ndarray,
+        side: np.ndarray,
+        conf: np.ndarray,
+        horizon: int,
+    ) -> None:
+        self.symbols = list(symbols)
+        self.ts = ts
+        self.score = score
+        self.prob = prob
+        self.side = side  # int8: BUY / SELL / FLAT
+        self.conf = conf
+        self.horizon = horizon
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def passed(self) -> np.ndarray:
+        """Row indices that produced a BUY or SELL."""
+        return np.flatnonzero(self.side != FLAT)
+
+    def to_signals(self, features_ref: Optional[str] = None) -> List[Signal]:
+        new = Signal.construct_trusted
+        out: List[Signal] = []
+        for i in self.passed.tolist():
+            out.append(
+                new(
+                    ts=from_epoch_ns(int(self.ts[i])),
+                    symbol=self.symbols[i],
+                    score=float(self.score[i]),
+                    horizon=self.horizon,
+                    side=OrderSide.BUY.value if self.side[i] == BUY else OrderSide.SELL.value,
+                    conf=float(self.conf[i]),
+                    features_ref=features_ref,
+                )
+            )
+        return out
+
+    def __repr__(self) -> str:
+        return f"SignalBatch({len(self)} rows, {len(self.passed)} passed)"
+
+
+class SignalStage:
+    """Scores a FeatureMatrix with `model` and applies thresholds in one pass."""
+
+    def __init__(
+        self,
+        model: Model,
+        buy_above: float = 0.55,
+        sell_below: float = 0.45,
+        horizon: int = 10,
+        to_prob: Callable[[np.ndarray], np.ndarray] = logistic,
+    ) -> None:
+        if not 0.0 <= sell_below < buy_above <= 1.0:
+            raise ValueError("thresholds must satisfy 0 <= sell_below < buy_above <= 1")
+        self.model = model
+        self.buy_above = buy_above
+        self.sell_below = sell_below
+        self.horizon = horizon
+        self.to_prob = to_prob
+
+    def score(self, matrix: FeatureMatrix) -> SignalBatch:
+        matrix.schema.require(self.model.schema_hash)  # once per batch, not per key
+        score = np.asarray(self.model.predict(matrix.values), dtype=np.float64)
+        prob = self.to_prob(score)
+        side = np.zeros(len(matrix), dtype=np.int8)
+        side[prob >= self.buy_above] = BUY  # NaN compares False on both sides
+        side[prob <= self.sell_below] = SELL
+        conf = np.where(side == SELL, 1.0 - prob, prob)
+        return SignalBatch(matrix.symbols, matrix.ts, score, prob, side, conf, self.horizon)
+
+    def signals(self, matrix: FeatureMatrix, features_ref: Optional[str] = None) -> List[Signal]:
+        return self.score(matrix).to_signals(features_ref)
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from vaayutrade_common import ModelArtifact
+from vaayutrade_common.calibration import (
+    IsotonicCalibrator,
+    calibrator_for,
+    clear_cache,
+    sidecar_path,
+)
+
+CALIB = {"-2.0": 0.1, "0": 0.5, "2.0": 0.9, "1.0": 0.65}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def test_compile_sorts_and_interpolates_vectorized():
+    cal = IsotonicCalibrator.compile(CALIB)
+    assert cal.x.tolist() == [-2.0, 0.0, 1.0, 2.0]
+    out = cal(np.array([-5.0, -1.0, 0.5, 1.5, 9.0, np.nan]))
+    np.testing.assert_allclose(out[:5], [0.1, 0.3, 0.575, 0.775, 0.9])
+    assert np.isnan(out[5])
+
+
+def test_compile_enforces_monotonicity_and_rejects_bad_points():
+    cal = IsotonicCalibrator.compile({"0": 0.4, "1": 0.3, "2": 0.8})
+    assert cal.y.tolist() == [0.4, 0.4, 0.8]
+    with pytest.raises(ValueError):
+        IsotonicCalibrator.compile({})
+    with pytest.raises(ValueError):
+        IsotonicCalibrator.compile({"method": 1.0})
+
+
+def test_cached_per_artifact_version_and_sidecar(tmp_path):
+    artifact = ModelArtifact(
+        version="1", path=str(tmp_path / "model.onnx"), schema_hash="h", calib=CALIB
+    )
+    sidecar = sidecar_path(artifact)
+    first = calibrator_for(artifact, sidecar)
+    assert calibrator_for(artifact) is first and sidecar.exists()
+
+    clear_cache()  # cold start: arrays come from the sidecar
+    loaded = calibrator_for(artifact, sidecar)
+    assert loaded is not first and loaded.key == f"{artifact.id}/1"
+    np.testing.assert_array_equal(loaded.x, first.x)
+
+    newer = artifact.model_copy(update={"version": "2", "calib": {"0": 0.2, "1": 0.7}})
+    assert calibrator_for(newer, sidecar).y.tolist() == [0.2, 0.7]  # stale sidecar rebuilt
+    assert IsotonicCalibrator.load(sidecar).y.tolist() == [0.2, 0.7]
+
+
+def test_sidecar_hit_does_not_read_calib(tmp_path, monkeypatch):
+    artifact = ModelArtifact(
+        version="1", path=str(tmp_path / "model.onnx"), schema_hash="h", calib=CALIB
+    )
+    calibrator_for(artifact, sidecar_path(artifact))
+    clear_cache()
+
+    def no_compile(*_a, **_k):
+        raise AssertionError("a matching sidecar must not be recompiled")
+
+    monkeypatch.setattr(IsotonicCalibrator, "compile", no_compile)
+    cold = artifact.model_copy(update={"calib": {}})  # only id/version are consulted
+    assert calibrator_for(cold, sidecar_path(artifact)).x.tolist() == [-2.0, 0.0, 1.0, 2.0]
+
+
+def test_unreadable_sidecar_is_rewritten(tmp_path):
+    artifact = ModelArtifact(
+        version="1", path=str(tmp_path / "model.onnx"), schema_hash="h", calib=CALIB
+    )
+    sidecar = sidecar_path(artifact)
+    sidecar.write_bytes(b"PK\x03\x04 not ours")
+    assert len(calibrator_for(artifact, sidecar)) == 4
+    assert IsotonicCalibrator.load(sidecar).key == f"{artifact.id}/1"
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from vaayutrade_common import TickBatch, TickSnapshot
+from vaayutrade_common.candles import CandleAggregator, candles_from_ticks
+
+T0 = datetime(2025, 8, 1, 3, 45, tzinfo=timezone.utc)  # 09:15 IST
+
+
+def tick(sec, last, volume, symbol="TCS"):
+    return TickSnapshot(
+        ts=T0 + timedelta(seconds=sec), symbol=symbol, bids=[], asks=[], last=last, volume=volume
+    )
+
+
+def test_one_minute_bar_with_vwap():
+    agg = CandleAggregator(timeframes=("1m",), grace_seconds=0)
+    assert agg.on_tick(tick(0, 100.0, 1000)) == []  # first tick sets the volume baseline
+    assert agg.on_tick(tick(10, 102.0, 1100)) == []
+    assert agg.on_tick(tick(50, 99.0, 1400)) == []
+    closed = agg.on_tick(tick(61, 101.0, 1500))
+    assert [tf for tf, _ in closed] == ["1m"]
+    candle = closed[0][1]
+    assert candle.ts == T0 and candle.symbol == "TCS"
+    assert (candle.o, candle.h, candle.low, candle.c, candle.v) == (100.0, 102.0, 99.0, 99.0, 400)
+    assert candle.vwap == pytest.approx((102.0 * 100 + 99.0 * 300) / 400)
+
+
+def test_multi_timeframe_and_late_ticks():
+    agg = CandleAggregator(timeframes=("1s", "1m"), grace_seconds=2)
+    agg.on_tick(tick(0.2, 100.0, 10))
+    agg.on_tick(tick(1.5, 101.0, 20))
+    # 0.9s is late but within grace: it becomes the close of the [0, 1) bar
+    assert agg.on_tick(tick(0.9, 99.5, 20)) == []
+    closed = agg.on_tick(tick(3.1, 102.0, 30))
+    first = [c for tf, c in closed if tf == "1s"][0]
+    assert (first.o, first.c, first.low) == (100.0, 99.5, 99.5)
+    agg.on_tick(tick(0.5, 98.0, 30))  # beyond grace for 1s, still open for 1m
+    assert agg.late_dropped == 1
+    minute = [c for tf, c in agg.flush() if tf == "1m"][0]
+    assert minute.low == 98.0 and minute.h == 102.0 and minute.v == 20
+
+
+def test_batch_and_tick_paths_agree():
+    ticks = [
+        tick(i * 7.3, 100 + (i % 5), 1000 + 10 * i, "TCS" if i % 3 else "INFY") for i in range(60)
+    ]
+    live = CandleAggregator()
+    expected = live.on_ticks(ticks) + live.flush()
+    replay = CandleAggregator()
+    batch = TickBatch.from_snapshots(ticks)
+    got = replay.on_batch(batch[:25]) + replay.on_batch(batch[25:]) + replay.flush()
+    assert got == expected
+    assert candles_from_ticks(ticks) == expected
+    assert {tf for tf, _ in expected} == {"1s", "1m", "5m", "15m"}
@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from vaayutrade_common import (
+    Execution,
+    Order,
+    OrderSide,
+    OrderStatus,
+    OrderType,
+    PnLMinute,
+    Position,
+    PriceLevel,
+    Signal,
+    TickSnapshot,
+    codec,
+)
+
+
+def roundtrip(obj):
+    return codec.decode(codec.encode(obj))
+
+
+def sample_objects():
+    now = datetime.now(timezone.utc)
+    return [
+        TickSnapshot(
+            ts=now,
+            symbol="TCS",
+            bids=[PriceLevel(price=100.0, qty=50), PriceLevel(price=99.95, qty=20)],
+            asks=[PriceLevel(price=100.1, qty=60)],
+            last=100.05,
+            volume=12345,
+        ),
+        TickSnapshot(ts=now, symbol="INFY", bids=[], asks=[]),
+        Signal(symbol="TCS", score=0.72, side=OrderSide.BUY, conf=0.66, features_ref="f:1"),
+        Order(
+            client_id="cid-1",
+            symbol="TCS",
+            side=OrderSide.SELL,
+            qty=10,
+            type=OrderType.SL_LIMIT,
+            limit_price=100.5,
+            trigger=101.0,
+            status=OrderStatus.OPEN,
+            parent_id=uuid4(),
+        ),
+        Order(client_id="cid-2", symbol="TCS", side=OrderSide.BUY, qty=1, limit_price=99.0),
+        Execution(order_id=uuid4(), qty=5, price=100.0, liquidity_flag="M"),
+        Execution(order_id=uuid4(), qty=5, price=100.0),
+        Position(symbol="TCS", net_qty=-10, avg_price=100.0, mtm=1.5),
+        PnLMinute(ts=now, realized=10.0, unrealized=-2.0, fees=0.5, turnover=100000),
+    ]
+
+
+@pytest.mark.parametrize("obj", sample_objects(), ids=lambda o: o.__class__.__name__)
+def test_message_roundtrip(obj):
+    out = roundtrip(obj)
+    assert out == obj
+    assert out.model_dump_json() == obj.model_dump_json()
+    assert len(codec.encode(obj)) < len(obj.model_dump_json())
+
+
+def test_batch_roundtrip():
+    objs = sample_objects()
+    assert codec.decode_batch(codec.encode_batch(objs)) == objs
+    assert codec.decode_batch(codec.encode_batch([])) == []
+
+
+def test_fingerprint_mismatch_fails_fast():
+    frame = bytearray(codec.encode(Position(symbol="TCS", net_qty=1, avg_price=1.0)))
+    frame[4] ^= 0xFF  # first fingerprint byte
+    with pytest.raises(codec.SchemaMismatchError):
+        codec.decode(bytes(frame))
+
+
+def test_rejects_unknown_models_and_wrong_framing():
+    with pytest.raises(codec.CodecError):
+        codec.encode(PriceLevel(price=1.0, qty=1))
+    with pytest.raises(codec.CodecError):
+        codec.decode(codec.encode_batch([]))
+    assert codec.is_binary_frame(codec.encode_batch([]))
+    assert not codec.is_binary_frame(b'{"ts": 1}')
+
+
+def test_truncated_frames_raise_codec_error():
+    objs = sample_objects()
+    frame = codec.encode(objs[0])
+    for cut in range(len(frame)):
+        with pytest.raises(codec.CodecError):
+            codec.decode(frame[:cut])
+    batch = codec.encode_batch(objs)
+    for cut in range(len(batch)):
+        with pytest.raises(codec.CodecError):
+            codec.decode_batch(batch[:cut])
+
+
+def test_string_length_past_the_frame_is_rejected():
+    obj = Position(symbol="TCS", net_qty=1, avg_price=1.0)
+    frame = bytearray(codec.encode(obj))
+    at = bytes(frame).index(b"\x03\x00TCS")
+    frame[at : at + 2] = b"\xff\x00"  # claims 255 bytes
+    with pytest.raises(codec.CodecError, match="truncated or corrupt"):
+        codec.decode(bytes(frame))
+
+
+def test_corrupt_timestamp_raises_codec_error():
+    objs = sample_objects()
+    pnl = objs[-1]
+    frame = bytearray(codec.encode(pnl))
+    ts_at = len(frame) - 4 * 8 - 8  # ts i64 precedes the four f64 fields
+    frame[ts_at : ts_at + 8] = (2**62).to_bytes(8, "little")
+    with pytest.raises(codec.CodecError):
+        codec.decode(bytes(frame))
+    batch = bytearray(codec.encode_batch([pnl]))
+    batch[-40:-32] = (2**62).to_bytes(8, "little")
+    with pytest.raises(codec.CodecError):
+        codec.decode_batch(bytes(batch))
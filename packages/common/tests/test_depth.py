@@ -0,0 +1,87 @@
+import json
+import math
+from decimal import Decimal
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from vaayutrade_common import BookSide, PriceLevel, TickSnapshot
+
+
+def make_tick(**kw):
+    data = dict(
+        ts=datetime.now(timezone.utc),
+        symbol="TCS",
+        bids=[PriceLevel(price=100.0, qty=50), {"price": 99.95, "qty": 10}],
+        asks=[(100.1, 60)],
+    )
+    data.update(kw)
+    return TickSnapshot(**data)
+
+
+def test_accessors():
+    tick = make_tick()
+    assert isinstance(tick.bids, BookSide) and len(tick.bids) == 2
+    assert tick.best_bid == 100.0 and tick.best_ask == 100.1
+    assert math.isclose(tick.spread, 0.1) and math.isclose(tick.mid, 100.05)
+    assert tick.bids[1] == PriceLevel(price=99.95, qty=10)
+    np.testing.assert_array_equal(tick.bids.qtys, [50, 10])
+    assert tick.bids.levels.shape == (5, 2) and np.isnan(tick.bids.levels[2, 0])
+    empty = make_tick(asks=[])
+    assert empty.best_ask is None and empty.spread is None and empty.mid is None
+
+
+def test_json_shape_matches_price_level_lists():
+    tick = make_tick()
+    dumped = tick.model_dump(mode="json")
+    assert dumped["bids"] == [{"price": 100.0, "qty": 50}, {"price": 99.95, "qty": 10}]
+    assert dumped["asks"] == [{"price": 100.1, "qty": 60}]
+    assert tick.bids == [PriceLevel(price=100.0, qty=50), PriceLevel(price=99.95, qty=10)]
+
+
+def test_rejects_more_than_five_levels():
+    with pytest.raises(ValidationError):
+        make_tick(bids=[(100.0 - i, 1) for i in range(6)])
+    with pytest.raises(ValidationError):
+        make_tick(bids="100x50")
+
+
+@pytest.mark.parametrize(
+    "level",
+    [
+        {"price": 100.0, "qty": 10.7},
+        {"price": 100.0, "qty": "10.7"},
+        {"price": "abc", "qty": 10},
+        [100.0, 10],
+    ],
+)
+def test_rejects_invalid_levels_on_both_paths(level):
+    data = {"ts": "2024-01-02T03:45:00Z", "symbol": "TCS", "bids": [level], "asks": []}
+    with pytest.raises(ValidationError):
+        TickSnapshot.model_validate_json(json.dumps(data))
+    with pytest.raises(ValidationError):
+        TickSnapshot.model_validate(json.loads(json.dumps(data)))
+
+
+@pytest.mark.parametrize(
+    "level",
+    [
+        {"price": "100.5", "qty": "10"},
+        {"price": 100.5, "qty": 10.0},
+        {"price": 100.5, "qty": 10},
+    ],
+)
+def test_accepts_what_price_level_lists_accepted(level):
+    data = {"ts": "2024-01-02T03:45:00Z", "symbol": "TCS", "bids": [level], "asks": []}
+    expected = [{"price": 100.5, "qty": 10}]
+    assert TickSnapshot.model_validate_json(json.dumps(data)).bids.to_list() == expected
+    assert TickSnapshot.model_validate(json.loads(json.dumps(data))).bids.to_list() == expected
+    assert PriceLevel.model_validate(level).model_dump() == expected[0]
+
+
+def test_python_levels_accept_decimal_and_numpy_values():
+    tick = make_tick(bids=[{"price": Decimal("100.5"), "qty": 10}], asks=[(100.5, np.int64(3))])
+    assert tick.bids.to_list() == [{"price": 100.5, "qty": 10}]
+    assert tick.asks.to_list() == [{"price": 100.5, "qty": 3}]
@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from vaayutrade_common import (
+    FeatureMatrix,
+    FeatureSchema,
+    FeatureSnapshot,
+    FeatureVector,
+    ModelArtifact,
+)
+from vaayutrade_common.models.feature_schema import FeatureSchemaMismatch
+
+NOW = datetime(2025, 8, 1, 4, 0, tzinfo=timezone.utc)
+SCHEMA = FeatureSchema(["ret_1", "rsi_14", "spread_bps"])
+
+
+def test_schema_hash_tracks_names_and_order():
+    assert FeatureSchema(["ret_1", "rsi_14", "spread_bps"]).hash == SCHEMA.hash
+    assert FeatureSchema(["rsi_14", "ret_1", "spread_bps"]).hash != SCHEMA.hash
+    assert FeatureSchema(SCHEMA.names, np.float32).hash == SCHEMA.hash
+    artifact = ModelArtifact(version="1", path="s3://m", schema_hash=SCHEMA.hash)
+    SCHEMA.require(artifact.schema_hash)
+    with pytest.raises(FeatureSchemaMismatch):
+        SCHEMA.require("abcd1234")
+    with pytest.raises(ValueError):
+        FeatureSchema(["a", "a"])
+
+
+def test_dense_snapshot_keeps_mapping_behaviour_and_json_shape():
+    vec = SCHEMA.vector({"rsi_14": 55.0, "ret_1": 0.01, "extra": 1.0})
+    assert isinstance(vec, FeatureVector) and np.isnan(vec["spread_bps"])
+    assert list(vec) == list(SCHEMA.names)
+    snap = FeatureSnapshot(ts=NOW, symbol="TCS", features=vec)
+    assert snap.features is vec  # validation passes dense vectors through
+    plain = FeatureSnapshot(ts=NOW, symbol="TCS", features=vec.to_dict())
+    assert snap.model_dump_json() == plain.model_dump_json()
+    assert snap.dense(SCHEMA) is vec
+    assert plain.dense(SCHEMA).values[1] == 55.0
+
+    full = FeatureSnapshot(ts=NOW, symbol="TCS", features=SCHEMA.vector({}, fill=1.5))
+    back = FeatureSnapshot.model_validate_json(full.model_dump_json())
+    assert isinstance(back.features, dict)
+    assert back.as_mapping() == full.as_mapping() == dict.fromkeys(SCHEMA.names, 1.5)
+
+
+def test_matrix_roundtrip_through_snapshots():
+    snaps = [
+        FeatureSnapshot(ts=NOW, symbol="TCS", features={"ret_1": 0.1, "rsi_14": 40.0}),
+        FeatureSnapshot(
+            ts=NOW, symbol="INFY", features=FeatureVector(SCHEMA, np.array([0.2, 60.0, 3.0]))
+        ),
+    ]
+    m = FeatureMatrix.from_snapshots(snaps, FeatureSchema(SCHEMA.names, np.float32))
+    assert m.values.dtype == np.float32 and m.values.shape == (2, 3)
+    np.testing.assert_allclose(m.column("rsi_14"), [40.0, 60.0])
+    assert m.row("INFY")[2] == 3.0 and m.row("SBIN") is None
+    rows = m.to_snapshots()
+    assert [r.symbol for r in rows] == ["TCS", "INFY"] and rows[0].ts == NOW
+    assert np.shares_memory(rows[1].features.values, m.values)
+    assert rows[1].as_mapping() == pytest.approx({"ret_1": 0.2, "rsi_14": 60.0, "spread_bps": 3.0})
@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from vaayutrade_common import FeatureSnapshot, SymbolTable, TickBatch, TickSnapshot
+from vaayutrade_common.features import (
+    FeatureEngine,
+    LagReturn,
+    Operator,
+    RollingMean,
+    WilderAtr,
+    WilderRsi,
+    make_operator,
+)
+
+T0 = datetime(2025, 8, 1, 3, 45, tzinfo=timezone.utc)  # 09:15 IST
+
+
+def tick(sec, last, symbol="TCS", bids=(), asks=()):
+    return TickSnapshot(
+        ts=T0 + timedelta(seconds=sec), symbol=symbol, bids=list(bids), asks=list(asks), last=last
+    )
+
+
+def prices(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (100.0 + np.cumsum(rng.normal(0, 0.5, n))).tolist()
+
+
+def reference_rsi(xs, period):
+    diffs = np.diff(xs)
+    gains, losses = np.maximum(diffs, 0), np.maximum(-diffs, 0)
+    ag, al = gains[:period].mean(), losses[:period].mean()
+    for g, loss in zip(gains[period:], losses[period:]):
+        ag = (ag * (period - 1) + g) / period
+        al = (al * (period - 1) + loss) / period
+    return 100.0 - 100.0 / (1.0 + ag / al)
+
+
+def test_operators_match_reference_computations():
+    xs = prices(200)
+    engine = FeatureEngine([RollingMean("price", 20), LagReturn(5), WilderRsi(14), WilderAtr(3)])
+    for i, px in enumerate(xs):
+        engine.on_tick(tick(i, px))
+    feats = engine.snapshot("TCS").features
+    assert feats["price_mean_20"] == pytest.approx(np.mean(xs[-20:]))
+    assert feats["ret_5"] == pytest.approx(xs[-1] / xs[-6] - 1)
+    assert feats["rsi_14"] == pytest.approx(reference_rsi(xs, 14))
+    tr = np.r_[0.0, np.abs(np.diff(xs))]  # high == low == price for ticks
+    atr = tr[:3].mean()
+    for v in tr[3:]:
+        atr = (atr * 2 + v) / 3
+    assert feats["atr_3"] == pytest.approx(atr)
+
+
+def test_warmup_is_nan_and_unseen_symbols_are_absent():
+    engine = FeatureEngine([LagReturn(5), WilderRsi(14)])
+    engine.on_tick(tick(0, 100.0))
+    snap = engine.snapshot("TCS")
+    assert isinstance(snap, FeatureSnapshot) and snap.ts == T0
+    assert np.isnan(snap.features["ret_5"]) and np.isnan(snap.features["rsi_14"])
+    assert engine.snapshot("INFY") is None
+
+
+def test_batch_update_equals_tick_by_tick():
+    names = ["TCS", "INFY", "SBIN"]
+    ticks = [
+        tick(i * 0.1, px, symbol=names[i % 3] if i % 7 else "TCS")
+        for i, px in enumerate(prices(300, seed=1))
+    ]
+    one = FeatureEngine()
+    for t in ticks:
+        one.on_tick(t)
+    table = SymbolTable()
+    batched = FeatureEngine(symbols=table, capacity=1)  # also exercises growth
+    for start in range(0, len(ticks), 64):
+        batched.on_batch(TickBatch.from_snapshots(ticks[start : start + 64], table))
+    for sym in names:
+        a, b = one.snapshot(sym), batched.snapshot(sym)
+        assert a.ts == b.ts
+        np.testing.assert_allclose(
+            [a.features[k] for k in one.names], [b.features[k] for k in one.names], equal_nan=True
+        )
+
+
+def test_book_features_and_matrix():
+    engine = FeatureEngine()
+    engine.on_tick(
+        tick(
+            30 * 60,
+            None,
+            bids=[{"price": 99.9, "qty": 300}],
+            asks=[{"price": 100.1, "qty": 100}],
+        )
+    )
+    feats = engine.snapshot("TCS").features
+    assert feats["imbalance"] == pytest.approx(0.5)
+    assert feats["spread_bps"] == pytest.approx(0.2 / 100.0 * 1e4)
+    assert feats["tod"] == pytest.approx(30 / 375)
+    assert engine.matrix().values.shape == (1, len(engine.names))
+    engine.on_tick(tick(0, None))  # no price at all: ignored
+    assert engine.snapshot("TCS").ts == T0 + timedelta(minutes=30)
+
+
+def test_registry_and_validation():
+    op = make_operator("ewma", input="price", span=10)
+    assert op.name == "price_ewma_10"
+    with pytest.raises(ValueError):
+        make_operator("nope")
+    with pytest.raises(ValueError):
+        make_operator("rsi", period=0)
+    with pytest.raises(ValueError):
+        FeatureEngine([LagReturn(1), LagReturn(1)])
+    with pytest.raises(ValueError):
+        FeatureEngine().on_batch(TickBatch.from_snapshots([tick(0, 1.0)]))
+
+
+def test_ewma_skips_nan_samples():
+    engine = FeatureEngine()
+    book = dict(bids=[{"price": 99.9, "qty": 10}], asks=[{"price": 100.1, "qty": 10}])
+    wide = dict(bids=[{"price": 99.0, "qty": 10}], asks=[{"price": 101.0, "qty": 10}])
+    engine.on_tick(tick(0, 100.0, **book))
+    first = engine.snapshot("TCS").features["spread_bps_ewma"]
+    engine.on_tick(tick(1, 100.0, bids=book["bids"]))  # one-sided: spread is NaN
+    assert engine.snapshot("TCS").features["spread_bps_ewma"] == pytest.approx(first)
+    engine.on_tick(tick(2, 100.0, **wide))
+    alpha = 2 / 21
+    expected = first + alpha * (2.0 / 100.0 * 1e4 - first)
+    assert engine.snapshot("TCS").features["spread_bps_ewma"] == pytest.approx(expected)
+
+
+def test_operator_base_is_abstract():
+    with pytest.raises(TypeError):
+        Operator()
@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from vaayutrade_common import ErrorCode, StaleFeedError, TickConflator, TickSnapshot
+
+T0 = datetime(2025, 8, 1, 3, 45, tzinfo=timezone.utc)  # 09:15 IST
+MS = 1_000_000
+
+
+class Clock:
+    def __init__(self):
+        self.ns = 0
+
+    def __call__(self):
+        return self.ns
+
+
+def tick(sec, last, volume=None, symbol="TCS"):
+    return TickSnapshot(
+        ts=T0 + timedelta(seconds=sec), symbol=symbol, bids=[], asks=[], last=last, volume=volume
+    )
+
+
+def test_latest_tick_per_symbol_in_change_order():
+    q = TickConflator()
+    q.put_many(
+        [
+            tick(0, 100.0, 1000),
+            tick(0.1, 50.0, 10, "INFY"),
+            tick(0.2, 101.0, 1100),
+            tick(0.3, 102.0, 1250),
+        ]
+    )
+    assert len(q) == 2
+    batch = q.drain()
+    assert [(c.symbol, c.tick.last, c.merged) for c in batch] == [
+        ("TCS", 102.0, 3),
+        ("INFY", 50.0, 1),
+    ]
+    # volume traded inside the conflated run survives; first tick is the baseline
+    assert [c.volume for c in batch] == [250, 0]
+    assert q.drain() == [] and len(q) == 0
+
+    q.put(tick(1, 103.0, 1300))
+    assert [(c.symbol, c.volume, c.merged) for c in q.drain()] == [("TCS", 50, 1)]
+    assert (q.stats.received, q.stats.conflated, q.stats.drained, q.stats.batches) == (5, 2, 3, 2)
+
+
+def test_out_of_order_ticks_are_dropped():
+    q = TickConflator(accumulate_volume=False)
+    q.put(tick(2, 100.0))
+    q.put(tick(1, 99.0))
+    (entry,) = q.drain()
+    assert entry.tick.last == 100.0 and entry.volume is None
+    q.put(tick(1.5, 98.0))  # still older than what was already drained
+    assert q.drain() == [] and q.stats.dropped == 2
+
+
+def test_stale_high_water_mark():
+    clock = Clock()
+    q = TickConflator(max_age_s=0.05, clock=clock)
+    q.put(tick(0, 100.0))
+    clock.ns = 20 * MS
+    q.put(tick(0.1, 50.0, symbol="INFY"))
+    assert q.check() is None and q.oldest_age_ns() == 20 * MS
+    clock.ns = 60 * MS
+    err = q.check()
+    assert err is not None and err.code == ErrorCode.STALE_FEED and err.details["symbols"] == 2
+
+    with pytest.raises(StaleFeedError) as exc:
+        q.drain()
+    assert exc.value.error.code == ErrorCode.STALE_FEED
+    assert [(c.symbol, c.age_ns) for c in exc.value.batch] == [("TCS", 60 * MS), ("INFY", 40 * MS)]
+    assert (q.stats.stale_batches, q.stats.last_age_ns, q.stats.max_age_ns) == (1, 60 * MS, 60 * MS)
+    assert len(q) == 0 and q.check() is None
+
+    lenient = TickConflator(max_age_s=0.05, raise_on_stale=False, clock=clock)
+    lenient.put(tick(0, 100.0))
+    clock.ns += 100 * MS
+    assert len(lenient.drain()) == 1 and lenient.stats.stale_batches == 1
+
+
+def test_async_get_wakes_on_put():
+    async def run():
+        q = TickConflator()
+        assert await q.get(timeout=0.01) == []
+        waiter = asyncio.ensure_future(q.get(timeout=1))
+        await asyncio.sleep(0)
+        q.put_many([tick(0, 100.0), tick(0.5, 101.0), tick(0.2, 10.0, symbol="SBIN")])
+        batch = await waiter
+        assert [(c.symbol, c.tick.last) for c in batch] == [("TCS", 101.0), ("SBIN", 10.0)]
+        rows = TickConflator.to_batch(batch)
+        assert len(rows) == 2
+
+    asyncio.run(run())
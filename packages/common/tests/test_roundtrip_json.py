@@ -1,3 +1,4 @@
+import math
 from datetime import datetime, timezone
 from uuid import uuid4
 
@@ -14,6 +15,7 @@ from vaayutrade_common import (
     RiskLimit,
     PnLMinute,
     ModelArtifact,
+    FeatureSchema,
     FeatureSnapshot,
     Candle,
     PriceLevel,
@@ -151,3 +153,14 @@ def test_backtestrun_roundtrip():
 def test_configblob_roundtrip():
     obj = ConfigBlob(version="v1", data={"risk": {"max_daily_loss": 0.015}})
     assert roundtrip(obj) == obj
+
+
+def test_featuresnapshot_nan_roundtrip():
+    vec = FeatureSchema(["rsi", "ret_5"]).vector({"rsi": 55.2})
+    for features in ({"rsi": 55.2, "ret_5": float("nan")}, vec):
+        obj = FeatureSnapshot(ts=datetime.now(timezone.utc), symbol="TCS", features=features)
+        s = obj.model_dump_json()
+        assert '"ret_5":null' in s
+        back = FeatureSnapshot.model_validate_json(s)
+        assert back.features["rsi"] == 55.2 and math.isnan(back.features["ret_5"])
+        assert back.model_dump_json() == s
@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from vaayutrade_common import FeatureMatrix, FeatureSchema, Signal
+from vaayutrade_common.models.feature_schema import FeatureSchemaMismatch
+from vaayutrade_common.models.tick_batch import to_epoch_ns
+from vaayutrade_common.scoring import BUY, FLAT, SELL, LinearModel, SignalStage
+
+NOW = datetime(2025, 8, 1, 4, 0, tzinfo=timezone.utc)
+SCHEMA = FeatureSchema(["ret_5", "imbalance"])
+
+
+def matrix(rows):
+    values = np.array(rows, dtype=np.float64)
+    symbols = [f"S{i}" for i in range(len(rows))]
+    ts = np.full(len(rows), to_epoch_ns(NOW), dtype=np.int64)
+    return FeatureMatrix(SCHEMA, symbols, ts, values)
+
+
+def test_thresholds_side_and_confidence():
+    stage = SignalStage(LinearModel([10.0, 1.0], SCHEMA.hash), buy_above=0.6, sell_below=0.4)
+    batch = stage.score(matrix([[0.1, 0.5], [-0.1, -0.5], [0.0, 0.1], [np.nan, 1.0]]))
+    assert batch.side.tolist() == [BUY, SELL, FLAT, FLAT]
+    assert batch.score[0] == pytest.approx(1.5)
+    assert batch.conf[1] == pytest.approx(1 / (1 + np.exp(-1.5)))
+    assert batch.passed.tolist() == [0, 1]
+    signals = batch.to_signals(features_ref="snap-1")
+    assert [(s.symbol, s.side) for s in signals] == [("S0", "BUY"), ("S1", "SELL")]
+    assert all(s.ts == NOW and s.horizon == 10 and s.features_ref == "snap-1" for s in signals)
+    assert Signal.model_validate(signals[0].model_dump()) == signals[0]
+
+
+def test_schema_is_checked_once_per_batch():
+    stage = SignalStage(LinearModel([1.0, 1.0], "deadbeef"))
+    with pytest.raises(FeatureSchemaMismatch):
+        stage.score(matrix([[0.0, 0.0]]))
+    with pytest.raises(ValueError):
+        SignalStage(LinearModel([1.0], SCHEMA.hash), buy_above=0.5, sell_below=0.5)
+
+
+def test_custom_probability_mapping():
+    stage = SignalStage(LinearModel([1.0, 0.0], SCHEMA.hash), to_prob=lambda s: np.clip(s, 0, 1))
+    assert stage.signals(matrix([[0.9, 0.0], [0.5, 0.0]]))[0].conf == pytest.approx(0.9)
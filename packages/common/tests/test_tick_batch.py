@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from vaayutrade_common import PriceLevel, SymbolTable, TickBatch, TickSnapshot
+
+T0 = datetime(2025, 8, 1, 3, 45, tzinfo=timezone.utc)
+
+
+def make_ticks():
+    out = []
+    for i in range(6):
+        sym = "TCS" if i % 2 == 0 else "INFY"
+        out.append(
+            TickSnapshot(
+                ts=T0 + timedelta(seconds=i),
+                symbol=sym,
+                bids=[PriceLevel(price=100.0 + i, qty=10), PriceLevel(price=99.95 + i, qty=20)],
+                asks=[PriceLevel(price=100.1 + i, qty=15)],
+                last=100.05 + i if i != 3 else None,
+                volume=1000 * i if i != 4 else None,
+            )
+        )
+    return out
+
+
+def test_snapshot_roundtrip():
+    ticks = make_ticks()
+    batch = TickBatch.from_snapshots(ticks)
+    assert len(batch) == 6
+    assert batch.bid_px.shape == (6, 5)
+    assert np.isnan(batch.ask_px[0, 1]) and batch.ask_qty[0, 1] == 0
+    assert batch.to_snapshots() == ticks
+
+
+def test_between_is_a_view():
+    batch = TickBatch.from_snapshots(make_ticks())
+    window = batch.between(T0 + timedelta(seconds=1), T0 + timedelta(seconds=4))
+    assert len(window) == 3
+    assert np.shares_memory(window.ts, batch.ts)
+    assert np.shares_memory(window.bid_px, batch.bid_px)
+
+
+def test_partition_by_symbol():
+    symbols = SymbolTable(["INFY", "TCS"])
+    batch = TickBatch.from_snapshots(make_ticks(), symbols)
+    assert batch.symbols is symbols and symbols.id_of("INFY") == 0
+    parts = batch.partition_by_symbol()
+    assert set(parts) == {"TCS", "INFY"}
+    tcs = parts["TCS"]
+    assert len(tcs) == 3 and np.all(np.diff(tcs.ts) > 0)
+    assert tcs.last.base is not None and tcs.last.base is parts["INFY"].last.base
+    assert [t.symbol for t in tcs.to_snapshots()] == ["TCS"] * 3
+
+    in_order = batch.take(np.argsort(batch.symbol_id, kind="stable"))
+    views = in_order.partition_by_symbol()
+    assert np.shares_memory(views["TCS"].ts, in_order.ts)
+    assert np.shares_memory(views["INFY"].bid_px, in_order.bid_px)
+    assert np.array_equal(views["TCS"].ts, tcs.ts)
+    assert not np.shares_memory(tcs.ts, batch.ts)  # unordered input: one gather copy
+
+
+def test_concat_requires_shared_symbols():
+    ticks = make_ticks()
+    a = TickBatch.from_snapshots(ticks[:3])
+    b = TickBatch.from_snapshots(ticks[3:], a.symbols)
+    assert TickBatch.concat([a, b]).to_snapshots() == ticks
+    with pytest.raises(ValueError):
+        TickBatch.concat([a, TickBatch.from_snapshots(ticks[3:])])
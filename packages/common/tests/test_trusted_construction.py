@@ -0,0 +1,64 @@
+import pytest
+from pydantic import ValidationError
+
+from vaayutrade_common import Order, OrderSide, OrderType, Signal, trusted_mode
+
+
+def limit_row(**kw):
+    row = {"client_id": "cid", "symbol": "TCS", "side": "BUY", "qty": 1, "limit_price": 100.0}
+    row.update(kw)
+    return row
+
+
+def test_construct_trusted_skips_validation_but_applies_defaults():
+    # A LIMIT order without a price would fail _validate_pricing; trusted callers own that.
+    order = Order.construct_trusted(client_id="cid", symbol="TCS", side=OrderSide.BUY, qty=1)
+    assert order.type == OrderType.LIMIT and order.limit_price is None
+    assert order.id is not None
+    assert order.model_fields_set == {"client_id", "symbol", "side", "qty"}
+    other = Order.construct_trusted(client_id="cid", symbol="TCS", side=OrderSide.BUY, qty=1)
+    assert other.id != order.id  # default_factory runs per object
+
+
+def test_trusted_roundtrips_like_validated():
+    trusted = Order.construct_trusted_many([limit_row(side=OrderSide.BUY)])[0]
+    validated = Order(**limit_row(id=trusted.id))
+    assert trusted.model_dump_json() == validated.model_dump_json()
+
+
+def test_assign_trusted_skips_only_its_own_assignment():
+    sig = Signal.construct_trusted(symbol="TCS", score="not-a-float", side=OrderSide.SELL)
+    sig.assign_trusted(conf="unchecked")
+    assert sig.score == "not-a-float" and sig.conf == "unchecked"
+    assert "conf" in sig.model_fields_set
+    with pytest.raises(AttributeError):
+        sig.assign_trusted(nope=1)
+    with pytest.raises(ValidationError):
+        sig.conf = "checked again"
+    with pytest.raises(ValidationError):
+        Signal(symbol="TCS", score="not-a-float", side=OrderSide.SELL)
+
+
+def test_validate_many():
+    orders = Order.validate_many([limit_row(client_id=f"c{i}") for i in range(3)])
+    assert [o.client_id for o in orders] == ["c0", "c1", "c2"]
+    with pytest.raises(ValidationError) as ei:
+        Order.validate_many([limit_row(), limit_row(limit_price=None)])
+    assert ei.value.errors()[0]["loc"][0] == 1
+
+
+def test_missing_required_fields_stay_unset():
+    order = Order.construct_trusted(symbol="TCS")
+    assert "client_id" not in order.__dict__ and "side" not in order.__dict__
+    reference = Order.model_construct(symbol="TCS", id=order.id)
+    assert order.model_dump_json() == reference.model_dump_json()
+
+
+def test_trusted_mode_is_scoped_to_its_model():
+    with trusted_mode(Signal) as new:
+        sig = new(symbol="TCS", score="not-a-float", side=OrderSide.SELL)
+        with pytest.raises(ValidationError):
+            Signal(symbol="TCS", score="not-a-float", side=OrderSide.SELL)
+        with pytest.raises(ValidationError):
+            sig.conf = "still validated"
+    assert sig.score == "not-a-float" and isinstance(sig, Signal)
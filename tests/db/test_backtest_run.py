@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import io
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from packages.common.db.artifacts import LocalArtifactStore, S3ArtifactStore
+from packages.common.db.columnar import TradeTable
+from packages.common.db.metadata_reflect import reflect_all
+from packages.common.db.repositories.backtest_run import BacktestRunRepository
+
+T0 = datetime(2025, 8, 1, 3, 45, tzinfo=UTC)
+
+
+def _trades(n: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "ts": T0 + timedelta(minutes=i),
+            "symbol": ("TCS", "INFY", "SBIN")[i % 3],
+            "qty": 10 + i,
+            "r": (i % 5) - 2.0,
+            "exit_reason": None if i % 4 else "stop",
+            "tags": {"fold": i % 2},
+        }
+        for i in range(n)
+    ]
+
+
+def test_columnar_roundtrip_projection_and_filter() -> None:
+    rows = _trades(50)
+    table = TradeTable.from_rows(rows)
+    assert table.kinds == {
+        "ts": "datetime",
+        "symbol": "str",
+        "qty": "int",
+        "r": "float",
+        "exit_reason": "str",
+        "tags": "json",
+    }
+    data = table.to_bytes()
+    assert TradeTable.read(io.BytesIO(data)).rows() == rows
+
+    infy = TradeTable.read(io.BytesIO(data), columns=["qty"], where={"symbol": "INFY"})
+    assert infy.names == ["qty"] and infy["qty"].tolist() == [
+        r["qty"] for r in rows if r["symbol"] == "INFY"
+    ]
+    stops = TradeTable.read(
+        io.BytesIO(data), columns=["ts"], where={"exit_reason": {"stop"}, "r": lambda a: a < 0}
+    )
+    assert len(stops) == sum(1 for r in rows if r["exit_reason"] == "stop" and r["r"] < 0)
+    assert isinstance(stops["ts"], np.ndarray) and stops.rows()[0]["ts"].tzinfo is UTC
+    with pytest.raises(KeyError):
+        TradeTable.read(io.BytesIO(data), columns=["nope"])
+
+
+def test_s3_store_uses_the_client_interface() -> None:
+    class Client:  # boto3-style keyword names
+        def __init__(self) -> None:
+            self.objects: dict[tuple[str, str], bytes] = {}
+
+        def put_object(self, Bucket: str, Key: str, Body: bytes) -> None:  # noqa: N803
+            self.objects[(Bucket, Key)] = Body
+
+        def get_object(self, Bucket: str, Key: str) -> dict[str, Any]:  # noqa: N803
+            return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+        def delete_object(self, Bucket: str, Key: str) -> None:  # noqa: N803
+            del self.objects[(Bucket, Key)]
+
+    store = S3ArtifactStore(Client(), "runs", prefix="bt/")
+    uri = store.put("a/trades.npz", b"x")
+    assert uri == "s3://runs/bt/a/trades.npz" and store.open(uri).read() == b"x"
+    store.delete(uri)
+    with pytest.raises(ValueError):
+        store.open("s3://other/bt/a/trades.npz")
+
+
+@pytest.mark.asyncio
+async def test_runs_keep_reference_and_summary(
+    db_session: AsyncSession, engine: AsyncEngine, tmp_path: Path
+) -> None:
+    md = await reflect_all(engine, only=["backtest_run"])
+    table = md.tables["backtest_run"]
+    store = LocalArtifactStore(tmp_path)
+    repo = BacktestRunRepository(db_session, table, store)
+
+    run = await repo.create_run({"metrics": {"sharpe": 1.1}, "tag": "wf-01"}, _trades(30))
+    assert run["trades"] is None and run["trades_count"] == 30
+    assert run["summary"]["stats"]["r"]["positive"] == pytest.approx(12 / 30)
+    assert Path(run["trades_ref"].removeprefix("file://")).is_relative_to(tmp_path)
+
+    legacy = await repo.create({"metrics": {}, "tag": "old", "trades": [{"r": 1.5}]})
+    listed = await repo.list_runs(tag_prefix="wf-")
+    assert [r["id"] for r in listed] == [run["id"]] and "trades" not in listed[0]
+
+    lazy = repo.trades(listed[0])
+    assert len(lazy) == 30  # from the row, without opening the artifact
+    tcs = await repo.load_trades(listed[0], columns=["qty"], where={"symbol": "TCS"})
+    assert tcs["qty"].tolist() == list(range(10, 40, 3))
+    assert (await repo.load_trades(legacy["id"])).rows() == [{"r": 1.5}]
+
+    assert await repo.externalize_trades() >= 1
+    moved = (await repo.list_runs(ids=[legacy["id"]]))[0]
+    assert moved["trades_count"] == 1 and repo.trades(moved).rows() == [{"r": 1.5}]
+    res = await db_session.execute(
+        select(text("trades IS NULL")).select_from(table).where(table.c.id == legacy["id"])
+    )
+    assert res.scalar_one() is True
+
+    assert await repo.internalize_trades() >= 2
+    res = await db_session.execute(
+        select(table.c.trades, table.c.trades_ref).where(table.c.id == run["id"])
+    )
+    trades, ref = res.one()
+    assert ref is None and len(trades) == 30
+    first = {"ts": T0.isoformat(), "symbol": "TCS", "qty": 10, "r": -2.0, "exit_reason": "stop"}
+    assert trades[0] == {**first, "tags": {"fold": 0}}
+    assert (await repo.load_trades(run["id"], columns=["qty"]))["qty"].tolist()[:2] == [10, 11]
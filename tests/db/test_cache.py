@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import Table, delete, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from packages.common.db.cache import CacheInvalidator, ConfigCache, InstrumentCache
+from packages.common.db.metadata_reflect import reflect_all
+from packages.common.db.session import create_sessionmaker
+
+# These tests commit (NOTIFY is only sent on commit) and clean up after themselves.
+
+
+@pytest_asyncio.fixture
+async def instrument(engine: AsyncEngine) -> AsyncIterator[tuple[Table, str]]:
+    md = await reflect_all(engine)
+    table = md.tables["instrument"]
+    symbol = f"CACHE{uuid4().hex[:8].upper()}"
+    try:
+        yield table, symbol
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(delete(table).where(table.c.symbol == symbol))
+
+
+async def _until(cond: Callable[[], bool], timeout: float = 5.0) -> None:
+    for _ in range(int(timeout / 0.02)):
+        if cond():
+            return
+        await asyncio.sleep(0.02)
+    raise AssertionError("condition not met in time")
+
+
+def _maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return create_sessionmaker(engine)
+
+
+@pytest.mark.asyncio
+async def test_notify_invalidates_exact_keys(
+    engine: AsyncEngine, instrument: tuple[Table, str]
+) -> None:
+    table, symbol = instrument
+    cache = InstrumentCache(_maker(engine), table)
+    async with CacheInvalidator(engine, [cache], poll_interval_s=3600) as inv:
+        assert await cache.get_by_symbol(symbol) is None  # negative entry
+        assert await cache.get_by_symbol(symbol) is None
+        assert (cache.stats.misses, cache.stats.hits) == (1, 1)
+
+        async with engine.begin() as conn:
+            await conn.execute(
+                table.insert().values(token=int(uuid4().int % 10**9), symbol=symbol, tick_size=0.05)
+            )
+        await _until(lambda: cache.peek(symbol) is None and len(cache) == 0)
+        row = await cache.get_by_symbol(symbol)
+        assert row is not None and float(row["tick_size"]) == 0.05
+        assert cache.peek(symbol) == row  # served locally from now on
+
+        async with engine.begin() as conn:
+            await conn.execute(update(table).where(table.c.symbol == symbol).values(lot_size=50))
+        await _until(lambda: inv.notifications >= 2 and cache.peek(symbol) is None)
+        row = await cache.get_by_symbol(symbol)
+        assert row is not None and row["lot_size"] == 50
+        assert cache.stats.stale == 0
+
+
+@pytest.mark.asyncio
+async def test_poll_catches_missed_notifications(
+    engine: AsyncEngine, instrument: tuple[Table, str]
+) -> None:
+    table, symbol = instrument
+    async with engine.begin() as conn:
+        await conn.execute(
+            table.insert().values(token=int(uuid4().int % 10**9), symbol=symbol, tick_size=0.05)
+        )
+    cache = InstrumentCache(_maker(engine), table)  # no listener: every change is "missed"
+    row = await cache.get_by_symbol(symbol)
+    assert row is not None and row["is_tradable"] is True
+    async with engine.begin() as conn:
+        await conn.execute(update(table).where(table.c.symbol == symbol).values(is_tradable=False))
+    assert await cache.get_by_symbol(symbol) == row  # still cached
+    assert await cache.poll() == 1
+    assert cache.stats.stale == 1
+    fresh = cache.peek(symbol)
+    assert fresh is not None and fresh["is_tradable"] is False
+
+
+@pytest.mark.asyncio
+async def test_ttl_and_lru(db_session: AsyncSession, engine: AsyncEngine) -> None:
+    md = await reflect_all(engine)
+    conn = await db_session.connection()
+    maker = async_sessionmaker(bind=conn, join_transaction_mode="create_savepoint")
+    configs = md.tables["config"]
+    await db_session.execute(
+        configs.insert().values(key="risk", version=1, yaml="a: 1", is_active=True)
+    )
+    cache = ConfigCache(maker, configs, ttl_s=0.05, maxsize=2)
+    active = await cache.get_active("risk")
+    assert active is not None and active["version"] == 1
+    assert cache.peek("risk") == active
+    await asyncio.sleep(0.06)
+    assert cache.peek("risk") is None
+    await cache.get_active("risk")
+    assert cache.stats.expired == 1 and cache.stats.misses == 2
+
+    cache.ttl_s = 60
+    cache.invalidate()
+    for key in ("a", "b", "risk", "c"):
+        await cache.get_active(key)
+    assert cache.stats.evictions == 2 and len(cache) == 2
+    assert cache.peek("risk") is not None and cache.peek("a") is None
+
+
+@pytest.mark.asyncio
+async def test_failed_background_polls_are_counted(
+    engine: AsyncEngine, instrument: tuple[Table, str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    table, _ = instrument
+    cache = InstrumentCache(_maker(engine), table)
+
+    async def broken() -> int:
+        raise OSError("replica went away")
+
+    monkeypatch.setattr(cache, "poll", broken)
+    async with CacheInvalidator(engine, [cache], poll_interval_s=0.01) as inv:
+        await _until(lambda: inv.failures >= 2)
+        assert inv.last_error == "OSError: replica went away"
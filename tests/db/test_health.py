@@ -4,6 +4,13 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 from packages.common.db.health import check_db
+from packages.common.db.instrumentation import (
+    POOL_WAIT_MS,
+    PROBE_MS,
+    InMemorySink,
+    set_metrics_sink,
+)
+from packages.common.db.session import create_engine, pool_metrics
 
 
 @pytest.mark.asyncio
@@ -12,3 +19,24 @@ async def test_health_ok(engine: AsyncEngine) -> None:
     assert health.ok
     assert any(name == "connect" and ok for name, ok, _ in health.checks)
     assert any(name == "alembic" for name, _, _ in health.checks)
+
+
+@pytest.mark.asyncio
+async def test_health_uses_one_connection_and_reports_latency() -> None:
+    eng = create_engine()
+    sink = InMemorySink()
+    previous = set_metrics_sink(sink)
+    try:
+        health = await check_db(eng)
+        assert health.ok
+        metrics = pool_metrics(eng)
+        assert metrics is not None and metrics.checkouts == 1
+        assert set(health.latency_ms) == {"connect", "alembic", "tables"}
+        assert all(ms > 0 for ms in health.latency_ms.values())
+        probe = sink.histogram(PROBE_MS, probe="tables")
+        assert probe is not None and probe.count == 1
+        wait = sink.histogram(POOL_WAIT_MS, profile="test")
+        assert wait is not None and wait.count == 1
+    finally:
+        set_metrics_sink(previous)
+        await eng.dispose()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from packages.common.db.instrument_index import InstrumentIndex, InstrumentIndexHolder
+from packages.common.db.metadata_reflect import reflect_all
+from packages.common.db.repositories.instrument import InstrumentRepository
+
+
+@pytest.mark.asyncio
+async def test_bulk_load_and_lookups(db_session: AsyncSession, engine: AsyncEngine) -> None:
+    md = await reflect_all(engine)
+    repo = InstrumentRepository(db_session, md.tables["instrument"])
+    for token, symbol, tradable in (
+        (300, "TCS", True),
+        (100, "INFY", True),
+        (200, "YESBANK", False),
+    ):
+        await repo.create(
+            {"token": token, "symbol": symbol, "tick_size": "0.05", "is_tradable": tradable}
+        )
+
+    index = await repo.load_index()
+    assert index.symbols == ("INFY", "YESBANK", "TCS")  # ordered by token
+    assert index.id_of("TCS") == 2 and index.token_of("INFY") == 100
+    assert index.symbol_of_token(200) == "YESBANK" and index.id_of_token(999) is None
+    assert index.ids_of_tokens(np.array([300, 999, 100])).tolist() == [2, -1, 0]
+    assert index.tick_size.tolist() == [0.05, 0.05, 0.05]
+    assert index.tradable(["TCS", "INFY", "YESBANK", "NOPE"], ban_list=["INFY"]) == ["TCS"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_swaps_whole_index(db_session: AsyncSession, engine: AsyncEngine) -> None:
+    md = await reflect_all(engine)
+    holder = InstrumentIndexHolder(md.tables["instrument"])
+    before = holder.current
+    assert len(before) == 0
+    await InstrumentRepository(db_session, md.tables["instrument"]).create(
+        {"token": 42, "symbol": "SBIN", "tick_size": "0.05"}
+    )
+    after = await holder.refresh(db_session)
+    assert holder.current is after and "SBIN" in after and "SBIN" not in before
+
+
+def test_rejects_duplicate_tokens() -> None:
+    row = {
+        "id": 1,
+        "token": 7,
+        "symbol": "A",
+        "tick_size": 0.05,
+        "lot_size": 1,
+        "is_tradable": True,
+    }
+    with pytest.raises(ValueError):
+        InstrumentIndex([row, {**row, "id": 2, "symbol": "B"}])
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from packages.common.db.instrumentation import (
+    OPERATION_MS,
+    OPERATION_ROWS,
+    STATEMENT_MS,
+    STATEMENT_ROWS,
+    Histogram,
+    InMemorySink,
+    query_labels,
+    redact_params,
+    set_metrics_sink,
+)
+from packages.common.db.metadata_reflect import reflect_all
+from packages.common.db.repositories.account import AccountRepository
+
+
+@pytest.fixture
+def sink() -> Iterator[InMemorySink]:
+    s = InMemorySink(slow_ms=0)  # log every statement as slow
+    previous = set_metrics_sink(s)
+    try:
+        yield s
+    finally:
+        set_metrics_sink(previous)
+
+
+@pytest.mark.asyncio
+async def test_repository_calls_are_labelled_and_timed(
+    db_session: AsyncSession, engine: AsyncEngine, sink: InMemorySink
+) -> None:
+    md = await reflect_all(engine)
+    repo = AccountRepository(db_session, md.tables["account"])
+    created = await repo.create(
+        {"broker": "ZERODHA", "product": "MIS", "api_key_ref": "secret://kite"}
+    )
+    await repo.get(created["id"])
+    await repo.list(limit=5)
+
+    labels = {"repository": "account", "operation": "create"}
+    stmt = sink.histogram(STATEMENT_MS, **labels)
+    op = sink.histogram(OPERATION_MS, **labels)
+    assert stmt is not None and op is not None and stmt.count == op.count == 1
+    assert op.total >= stmt.total > 0
+    rows = sink.histogram(OPERATION_ROWS, repository="account", operation="get")
+    assert rows is not None and rows.total == 1
+    assert sink.histogram(STATEMENT_ROWS, repository="account", operation="list") is not None
+
+    insert = next(q for q in sink.slow_log if q.labels == labels)
+    assert "INSERT INTO account" in insert.statement
+    assert "secret://kite" not in repr(insert.params) and "<str>" in repr(insert.params)
+
+    with query_labels(repository="adhoc", operation="ping"):
+        await db_session.execute(text("SELECT 1"))
+    assert sink.histogram(STATEMENT_MS, repository="adhoc", operation="ping") is not None
+    assert "db.statement.ms{operation=ping,repository=adhoc}" in sink.snapshot()
+
+
+def test_histogram_quantiles_and_redaction() -> None:
+    h = Histogram()
+    for ms in [0.3] * 90 + [40.0] * 9 + [700.0]:
+        h.observe(ms)
+    assert (h.quantile(0.5), h.quantile(0.95), h.quantile(0.99)) == (0.5, 50, 50)
+    assert h.quantile(1.0) == h.max == 700.0
+    assert h.snapshot()["count"] == 100
+
+    assert redact_params({"pw": "hunter2", "n": 3, "x": None}) == {
+        "pw": "<str>",
+        "n": "<int>",
+        "x": None,
+    }
+    assert redact_params(("a", 1.5)) == ("<str>", "<float>")
+    assert redact_params([("a",), ("b",)]) == [("<str>",), "... 2 rows"]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy import MetaData
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from packages.common.db import metadata_reflect
+from packages.common.db.metadata_reflect import (
+    dump_metadata,
+    load_metadata,
+    reflect_all,
+    restore_metadata,
+)
+
+
+def _ddl(md: MetaData) -> dict[str, list[str]]:
+    """CREATE TABLE / INDEX statements per table, as sorted lines (constraint order varies)."""
+    dialect = postgresql.dialect()
+    out = {}
+    for name, t in md.tables.items():
+        stmts = [str(CreateTable(t).compile(dialect=dialect))]
+        stmts += [str(CreateIndex(ix).compile(dialect=dialect)) for ix in t.indexes]
+        lines = "\n".join(stmts).splitlines()
+        out[name] = sorted(line.strip().rstrip(",") for line in lines)
+    return out
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_reflection(
+    engine: AsyncEngine, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first = await load_metadata(engine, cache_dir=tmp_path)
+    files = list(tmp_path.glob("metadata-*.json"))
+    assert len(files) == 1 and set(first.tables) >= set(metadata_reflect.TABLES)
+    assert json.loads(files[0].read_text())["format"] == metadata_reflect.CACHE_FORMAT
+    assert files[0].stat().st_mode & 0o077 == 0
+
+    async def fail(*_: object, **__: object) -> None:
+        raise AssertionError("reflection should not run on a cache hit")
+
+    monkeypatch.setattr(metadata_reflect, "reflect_all", fail)
+    cached = await load_metadata(engine, cache_dir=tmp_path)
+    assert cached is not first
+    assert _ddl(cached) == _ddl(first)
+
+
+@pytest.mark.asyncio
+async def test_description_round_trips_every_table(engine: AsyncEngine) -> None:
+    md = await reflect_all(engine)
+    restored = restore_metadata(json.loads(json.dumps(dump_metadata(md))))
+    assert _ddl(restored) == _ddl(md)
+    order = restored.tables["order"]
+    where = {str(ix.name): ix.dialect_options["postgresql"]["where"] for ix in order.indexes}
+    assert where["uq_order__broker_order_id"] == "(broker_order_id IS NOT NULL)"
+    assert order.c.status.type.enums[0] == "NEW"  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_head_mismatch_reflects_again(engine: AsyncEngine, tmp_path: Path) -> None:
+    stale = metadata_reflect.cache_path(tmp_path, "not-the-head", ["instrument"])
+    tmp_path.joinpath(stale.name).write_bytes(b"garbage")
+    md = await load_metadata(engine, only=["instrument"], cache_dir=tmp_path)
+    assert list(md.tables) == ["instrument"]
+    assert len(list(tmp_path.glob("metadata-*.json"))) == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_in_a_shared_or_tampered_location_is_ignored(
+    engine: AsyncEngine, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = 0
+    reflect = metadata_reflect.reflect_all
+
+    async def counting(*args: object, **kwargs: object) -> MetaData:
+        nonlocal calls
+        calls += 1
+        return await reflect(*args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(metadata_reflect, "reflect_all", counting)
+
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    await load_metadata(engine, only=["instrument"], cache_dir=shared)
+    await load_metadata(engine, only=["instrument"], cache_dir=shared)
+    assert calls == 2 and not list(shared.iterdir())  # never read, never written
+
+    private = tmp_path / "private"
+    await load_metadata(engine, only=["instrument"], cache_dir=private)
+    assert private.stat().st_mode & 0o777 == 0o700
+    (path,) = private.glob("metadata-*.json")
+    path.chmod(0o666)  # writable by others: could have been replaced
+    await load_metadata(engine, only=["instrument"], cache_dir=private)
+    assert calls == 4
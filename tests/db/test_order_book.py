@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from packages.common.db.metadata_reflect import reflect_all
+from packages.common.db.order_book import OpenOrderBook, verify_open_order_book
+from packages.common.db.repositories.account import AccountRepository
+from packages.common.db.repositories.instrument import InstrumentRepository
+from packages.common.db.repositories.order import OrderRepository
+
+
+@pytest.mark.asyncio
+async def test_book_loads_tracks_and_verifies(
+    db_session: AsyncSession, engine: AsyncEngine
+) -> None:
+    md = await reflect_all(engine)
+    order, instrument = md.tables["order"], md.tables["instrument"]
+    irepo = InstrumentRepository(db_session, instrument)
+    infy = await irepo.create({"token": 1, "symbol": "INFY", "tick_size": "0.05"})
+    tcs = await irepo.create({"token": 2, "symbol": "TCS", "tick_size": "0.05"})
+    acc = await AccountRepository(db_session, md.tables["account"]).create(
+        {"broker": "ZERODHA", "product": "MIS", "api_key_ref": "k"}
+    )
+    repo = OrderRepository(db_session, order)
+
+    async def place(client_id: str, inst: int, status: str, **extra: object) -> dict[str, object]:
+        row = await repo.create(
+            {
+                "account_id": acc["id"],
+                "instrument_id": inst,
+                "client_id": client_id,
+                "side": "BUY",
+                "type": "MARKET",
+                "qty": 5,
+                "status": status,
+                **extra,
+            }
+        )
+        return dict(row)
+
+    parent = await place("p", infy["id"], "OPEN", broker_order_id="B-p")
+    await place("sl", infy["id"], "TRIGGER_PENDING", parent_id=parent["id"])
+    await place("t", tcs["id"], "PENDING")
+    await place("done", tcs["id"], "FILLED")
+
+    book = await repo.load_open_book(instrument)
+    assert len(book) == 3 and sorted(book.symbols()) == ["INFY", "TCS"]
+    assert {o["client_id"] for o in book.for_symbol("INFY")} == {"p", "sl"}
+    parent_id = parent["id"]
+    assert isinstance(parent_id, UUID)
+    assert book.by_broker_order_id("B-p") == book.get(parent_id)
+    assert [o["client_id"] for o in book.children(parent_id)] == ["sl"]
+    assert (await verify_open_order_book(book, db_session, order, instrument)).ok
+
+    # incremental changes: ack with broker id, fill, new order (symbol from instrument_id)
+    t = book.by_client_id("t")
+    assert t is not None
+    acked = await repo.update(t["id"], {"status": "OPEN", "broker_order_id": "B-t"})
+    assert acked and book.apply(acked)
+    assert book.by_broker_order_id("B-t") is not None and not book.apply(acked)
+    filled = await repo.update(parent_id, {"status": "FILLED"})
+    assert filled and book.apply(filled)
+    assert book.by_client_id("p") is None and book.by_broker_order_id("B-p") is None
+    assert book.children(parent_id)[0]["client_id"] == "sl"
+    assert book.apply(await place("n", tcs["id"], "NEW")) is False
+    assert book.apply(await place("o", tcs["id"], "OPEN"))
+    assert [o["client_id"] for o in book.for_symbol("TCS")] == ["t", "o"]
+    assert (await verify_open_order_book(book, db_session, order, instrument)).ok
+
+    # drift is reported
+    sl = book.by_client_id("sl")
+    assert sl is not None
+    await repo.update(sl["id"], {"qty": 7})
+    book.discard(book.for_symbol("TCS")[0]["id"])
+    diff = await verify_open_order_book(book, db_session, order, instrument)
+    assert diff.missing == [t["id"]] and diff.extra == []
+    assert diff.changed[sl["id"]]["qty"] == (5, 7)
+
+
+def test_apply_requires_symbol_for_unknown_instrument() -> None:
+    book = OpenOrderBook()
+    row = {"id": UUID(int=1), "client_id": "c", "instrument_id": 9, "status": "OPEN"}
+    with pytest.raises(ValueError):
+        book.apply(row)
+    assert OpenOrderBook([row], symbols={9: "SBIN"}).for_symbol("SBIN")[0]["id"] == UUID(int=1)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import re
+from dataclasses import replace
+from datetime import UTC, date, datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from packages.common.db.metadata_reflect import reflect_all
+from packages.common.db.partitions import (
+    POLICIES,
+    ensure_partitions,
+    expire_partitions,
+    list_partitions,
+)
+from packages.common.db.repositories.account import AccountRepository
+from packages.common.db.repositories.base import BaseRepository
+from packages.common.db.repositories.instrument import InstrumentRepository
+
+
+async def _home(conn: AsyncConnection, table: str, id_: int | str) -> str:
+    res = await conn.execute(
+        text(f"SELECT tableoid::regclass::text FROM {table} WHERE id = :id"), {"id": id_}
+    )
+    return str(res.scalar_one())
+
+
+@pytest.mark.asyncio
+async def test_new_partition_takes_rows_from_default_and_prunes(
+    db_session: AsyncSession, engine: AsyncEngine
+) -> None:
+    md = await reflect_all(engine)
+    inst = await InstrumentRepository(db_session, md.tables["instrument"]).create(
+        {"token": 901, "symbol": "PART", "tick_size": "0.05"}
+    )
+    sig = await BaseRepository(db_session, md.tables["signal"]).create(
+        {
+            "ts": datetime(2030, 1, 2, 4, 0, tzinfo=UTC),
+            "instrument_id": inst["id"],
+            "side": "LONG",
+            "horizon_seconds": 600,
+            "score": 0.7,
+        }
+    )
+    conn = await db_session.connection()
+    assert await _home(conn, "signal", sig["id"]) == "signal_default"
+
+    policy = replace(POLICIES["signal"], premake=0)
+    assert await ensure_partitions(conn, policy, date(2030, 1, 2)) == ["signal_p20300102"]
+    assert await ensure_partitions(conn, policy, date(2030, 1, 2)) == []
+    assert await _home(conn, "signal", sig["id"]) == "signal_p20300102"
+
+    plan = await conn.execute(
+        text(
+            "EXPLAIN SELECT * FROM signal "
+            "WHERE ts >= '2030-01-02 00:00+00' AND ts < '2030-01-03 00:00+00'"
+        )
+    )
+    scanned = set(re.findall(r" on (signal\w*)", "\n".join(r[0] for r in plan)))
+    assert scanned == {"signal_p20300102"}
+
+
+@pytest.mark.asyncio
+async def test_expiry_drops_or_detaches(db_session: AsyncSession) -> None:
+    conn = await db_session.connection()
+    signal = replace(POLICIES["signal"], premake=2)
+    await ensure_partitions(conn, signal, date(2030, 1, 2))
+    expired = await expire_partitions(conn, signal, date(2030, 2, 3))  # cutoff 2030-01-04
+    assert {"signal_p20300102", "signal_p20300103"} <= set(expired)
+    names = [p.name for p in await list_partitions(conn, "signal")]
+    assert "signal_p20300104" in names and "signal_p20300103" not in names
+    res = await conn.execute(text("SELECT to_regclass('signal_p20300103')"))
+    assert res.scalar_one() is None
+
+    audit = replace(POLICIES["audit_event"], premake=0)
+    await ensure_partitions(conn, audit, date(2030, 1, 15))
+    assert "audit_event_p203001" in await expire_partitions(conn, audit, date(2031, 2, 1))
+    assert "audit_event_p203001" not in [p.name for p in await list_partitions(conn, "audit_event")]
+    res = await conn.execute(text("SELECT to_regclass('audit_event_p203001')::text"))
+    assert res.scalar_one() == "audit_event_p203001"
+
+
+@pytest.mark.asyncio
+async def test_audit_triggers_apply_to_partitions(db_session: AsyncSession) -> None:
+    conn = await db_session.connection()
+    insert = text(
+        "INSERT INTO audit_event (ts, actor_type, action, entity_type, entity_id) "
+        "VALUES (:ts, 'system', 'test', 'order', '1') RETURNING id, hash"
+    )
+    early = (await conn.execute(insert, {"ts": datetime(2030, 3, 10, tzinfo=UTC)})).one()
+    assert await _home(conn, "audit_event", early.id) == "audit_event_default"
+
+    policy = replace(POLICIES["audit_event"], premake=0)
+    await ensure_partitions(conn, policy, date(2030, 3, 1))
+    res = await conn.execute(text("SELECT hash FROM audit_event WHERE id = :id"), {"id": early.id})
+    assert res.scalar_one() == early.hash
+    assert await _home(conn, "audit_event", early.id) == "audit_event_p203003"
+
+    late = (await conn.execute(insert, {"ts": datetime(2030, 3, 20, tzinfo=UTC)})).one()
+    assert late.hash and late.hash != early.hash
+    assert await _home(conn, "audit_event", late.id) == "audit_event_p203003"
+    with pytest.raises(DBAPIError, match="immutable"):
+        async with conn.begin_nested():
+            await conn.execute(
+                text("UPDATE audit_event SET reason = 'x' WHERE id = :id"), {"id": late.id}
+            )
+    with pytest.raises(DBAPIError, match="immutable"):
+        async with conn.begin_nested():
+            await conn.execute(text("DELETE FROM audit_event_default"))
+            await conn.execute(text("DELETE FROM audit_event_p203003"))
+
+
+@pytest.mark.asyncio
+async def test_order_signal_reference_survives_partitioning(
+    db_session: AsyncSession, engine: AsyncEngine
+) -> None:
+    md = await reflect_all(engine)
+    acc = await AccountRepository(db_session, md.tables["account"]).create(
+        {"broker": "ZERODHA", "product": "MIS", "api_key_ref": "k"}
+    )
+    inst = await InstrumentRepository(db_session, md.tables["instrument"]).create(
+        {"token": 902, "symbol": "SREF", "tick_size": "0.05"}
+    )
+    sig = await BaseRepository(db_session, md.tables["signal"]).create(
+        {
+            "ts": datetime(2030, 1, 2, 4, 0, tzinfo=UTC),
+            "instrument_id": inst["id"],
+            "side": "LONG",
+            "horizon_seconds": 600,
+            "score": 0.7,
+        }
+    )
+    orders = BaseRepository(db_session, md.tables["order"])
+
+    def order(client_id: str, signal_id: object) -> dict[str, object]:
+        return {
+            "account_id": acc["id"],
+            "instrument_id": inst["id"],
+            "signal_id": signal_id,
+            "client_id": client_id,
+            "side": "BUY",
+            "type": "LIMIT",
+            "qty": 1,
+        }
+
+    await orders.create(order("sref-1", sig["id"]))
+    conn = await db_session.connection()
+    with pytest.raises(DBAPIError, match="fk_order__signal"):
+        async with conn.begin_nested():
+            await orders.create(order("sref-2", uuid4()))
+    with pytest.raises(DBAPIError, match="fk_order__signal"):
+        async with conn.begin_nested():
+            await conn.execute(text("DELETE FROM signal WHERE id = :id"), {"id": sig["id"]})
+
+    # moving the referenced row out of the default partition and expiring it both work
+    policy = replace(POLICIES["signal"], premake=0)
+    await ensure_partitions(conn, policy, date(2030, 1, 2))
+    assert await _home(conn, "signal", sig["id"]) == "signal_p20300102"
+    assert "signal_p20300102" in await expire_partitions(conn, policy, date(2030, 2, 3))
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from packages.common.db.metadata_reflect import reflect_all
+from packages.common.db.pnl_rollup import pick_step, pnl_series, refresh_rollups, source_for
+from packages.common.db.repositories.base import BaseRepository
+from packages.common.db.repositories.instrument import InstrumentRepository
+
+T0 = datetime(2031, 3, 3, 3, 45, tzinfo=UTC)  # 09:15 IST
+
+
+def test_step_and_source_selection() -> None:
+    year = (T0, T0 + timedelta(days=365))
+    assert pick_step(*year) == timedelta(days=1) and source_for(timedelta(days=1)) == "1d"
+    assert pick_step(T0, T0 + timedelta(hours=6)) == timedelta(minutes=1)
+    assert source_for(timedelta(days=7)) == "1d" and source_for(timedelta(hours=2)) == "1h"
+    assert source_for(timedelta(minutes=15)) == "5m" and source_for(timedelta(minutes=1)) is None
+
+
+@pytest.mark.asyncio
+async def test_rollups_track_minutes_and_answer_series(
+    db_session: AsyncSession, engine: AsyncEngine
+) -> None:
+    md = await reflect_all(engine)
+    irepo = InstrumentRepository(db_session, md.tables["instrument"])
+    a = (await irepo.create({"token": 71, "symbol": "ROLLA", "tick_size": "0.05"}))["id"]
+    b = (await irepo.create({"token": 72, "symbol": "ROLLB", "tick_size": "0.05"}))["id"]
+    minutes = BaseRepository(db_session, md.tables["pnl_minute"])
+
+    rows = []
+    for day in range(2):
+        for i in range(375):  # 09:15-15:30 IST
+            ts = T0 + timedelta(days=day, minutes=i)
+            for inst in (a, b):
+                rows.append(
+                    {
+                        "ts": ts,
+                        "instrument_id": inst,
+                        "realized": 1,
+                        "unrealized": i,
+                        "fees": "0.5",
+                        "turnover": 10,
+                    }
+                )
+    # write-behind style batches; COPY fires the statement trigger as well
+    await minutes.create_many(rows[:700], returning=False)
+    await minutes.copy_in(rows[700:])
+    await minutes.create_many(  # unattributed account-level minute
+        [
+            {
+                "ts": T0,
+                "instrument_id": None,
+                "realized": 5,
+                "unrealized": 0,
+                "fees": 0,
+                "turnover": 0,
+            }
+        ],
+        returning=False,
+    )
+
+    end = T0 + timedelta(days=2)
+    daily = await pnl_series(db_session, T0, end, timedelta(days=1), instrument_id=a)
+    assert [d["realized"] for d in daily] == [375, 375]
+    assert daily[0]["unrealized"] == 374 and daily[0]["minutes"] == 375
+    assert daily[0]["bucket"] == datetime(2031, 3, 2, 18, 30, tzinfo=UTC)  # IST midnight
+
+    account = await pnl_series(db_session, T0, end, timedelta(days=1))
+    assert account[0]["realized"] == 2 * 375 + 5 and account[0]["unrealized"] == 2 * 374
+    assert account[0]["fees"] == Decimal("375.0")
+
+    # every level and step agrees with aggregating the raw minutes
+    for step in (timedelta(minutes=15), timedelta(hours=2), timedelta(days=1)):
+        fast = await pnl_series(db_session, T0, end, step)
+        slow = await pnl_series(db_session, T0, end, timedelta(minutes=1))
+        assert sum(r["realized"] for r in fast) == sum(r["realized"] for r in slow)
+        assert fast[-1]["unrealized"] == slow[-1]["unrealized"]
+
+    # updates are folded in; a damaged rollup is repaired by a refresh
+    await db_session.execute(
+        text("UPDATE pnl_minute SET realized = 101 WHERE instrument_id = :a AND ts = :ts"),
+        {"a": a, "ts": T0},
+    )
+    daily = await pnl_series(db_session, T0, end, timedelta(days=1), instrument_id=a)
+    assert daily[0]["realized"] == 475
+    await db_session.execute(text("DELETE FROM pnl_rollup WHERE resolution = '5m'"))
+    assert await refresh_rollups(db_session, T0, T0 + timedelta(hours=1), [a]) > 0
+    hourly = await pnl_series(db_session, T0, T0 + timedelta(hours=1), timedelta(minutes=5), a)
+    assert sum(h["realized"] for h in hourly) == 100 + 60
+
+
+@pytest.mark.asyncio
+async def test_deleted_minutes_leave_every_level(
+    db_session: AsyncSession, engine: AsyncEngine
+) -> None:
+    md = await reflect_all(engine)
+    irepo = InstrumentRepository(db_session, md.tables["instrument"])
+    a = (await irepo.create({"token": 73, "symbol": "ROLLC", "tick_size": "0.05"}))["id"]
+    minutes = BaseRepository(db_session, md.tables["pnl_minute"])
+    first, last = T0, T0 + timedelta(minutes=374)
+    await minutes.create_many(
+        [
+            {
+                "ts": T0 + timedelta(minutes=i),
+                "instrument_id": a,
+                "realized": {0: 500, 374: 1000}.get(i, 1),
+                "unrealized": 0,
+                "fees": 0,
+                "turnover": 0,
+            }
+            for i in range(375)
+        ],
+        returning=False,
+    )
+
+    async def totals() -> dict[str, Decimal]:
+        res = await db_session.execute(
+            text(
+                "SELECT resolution, sum(realized) FROM pnl_rollup "
+                "WHERE instrument_id = :a GROUP BY resolution"
+            ),
+            {"a": a},
+        )
+        return {row[0]: row[1] for row in res}
+
+    assert await totals() == {k: Decimal(1873) for k in ("5m", "1h", "1d")}
+    delete = text("DELETE FROM pnl_minute WHERE instrument_id = :a AND ts = :ts")
+    await db_session.execute(delete, {"a": a, "ts": last})  # the newest minute
+    assert await totals() == {k: Decimal(873) for k in ("5m", "1h", "1d")}
+    await db_session.execute(delete, {"a": a, "ts": first})  # the oldest minute
+    assert await totals() == {k: Decimal(373) for k in ("5m", "1h", "1d")}
+    await db_session.execute(text("DELETE FROM pnl_minute WHERE instrument_id = :a"), {"a": a})
+    assert await totals() == {}
+    assert await pnl_series(db_session, T0, T0 + timedelta(days=1), timedelta(days=1)) == []
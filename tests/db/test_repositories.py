@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator, Mapping
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
 import pytest
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from packages.common.db.metadata_reflect import reflect_all
 from packages.common.db.repositories.account import AccountRepository
+from packages.common.db.repositories.base import BaseRepository
 from packages.common.db.repositories.config import ConfigRepository
 from packages.common.db.repositories.instrument import InstrumentRepository
 from packages.common.db.repositories.order import OrderRepository
@@ -74,3 +80,70 @@ async def test_config_active(db_session: AsyncSession, engine: AsyncEngine) -> N
     await crepo.create({"key": "trading", "version": 1, "yaml": "a: 1", "is_active": True})
     active = await crepo.get_active("trading")
     assert active and active["version"] == 1
+
+
+async def _signal_rows(instrument_id: int, n: int) -> AsyncIterator[Mapping[str, Any]]:
+    t0 = datetime(2025, 8, 1, 3, 45, tzinfo=UTC)
+    for i in range(n):
+        yield {
+            "ts": t0 + timedelta(seconds=i),
+            "instrument_id": instrument_id,
+            "side": "LONG" if i % 2 else "SHORT",
+            "horizon_seconds": 600,
+            "score": i / n,
+        }
+
+
+@pytest.mark.asyncio
+async def test_bulk_copy_and_create_many(db_session: AsyncSession, engine: AsyncEngine) -> None:
+    md = await reflect_all(engine)
+    inst = await InstrumentRepository(db_session, md.tables["instrument"]).create(
+        {"token": 777, "symbol": "BULK", "tick_size": "0.05"}
+    )
+    repo = BaseRepository(db_session, md.tables["signal"])
+
+    copied = await repo.copy_in(_signal_rows(inst["id"], 25), chunk_size=10)
+    assert copied == 25
+    rows = [r async for r in _signal_rows(inst["id"], 5)]
+    created = await repo.create_many(rows, chunk_size=2)
+    assert len(created) == 5 and all(r["id"] is not None for r in created)
+    assert [r["score"] for r in created] == [0.0, 0.2, 0.4, 0.6, 0.8]
+    res = await db_session.execute(
+        select(func.count()).where(md.tables["signal"].c.instrument_id == inst["id"])
+    )
+    assert res.scalar_one() == 30
+
+    with pytest.raises(ValueError):
+        await repo.create_many([{"ts": rows[0]["ts"], "symbol": "BULK"}])
+    with pytest.raises(ValueError):
+        await repo.copy_in([rows[0], {"ts": rows[0]["ts"]}])
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_and_streams(db_session: AsyncSession, engine: AsyncEngine) -> None:
+    md = await reflect_all(engine)
+    inst = await InstrumentRepository(db_session, md.tables["instrument"]).create(
+        {"token": 778, "symbol": "PAGE", "tick_size": "0.05"}
+    )
+    signal = md.tables["signal"]
+    repo = BaseRepository(db_session, signal)
+    await repo.copy_in(_signal_rows(inst["id"], 25))
+    mine = signal.c.instrument_id == inst["id"]
+
+    seen: list[float] = []
+    after = None
+    while True:
+        page = await repo.page(
+            limit=10, after=after, order_by=("ts", "id"), descending=True, where=mine
+        )
+        seen += [r["score"] for r in page.rows]
+        if page.next_after is None:
+            break
+        after = page.next_after
+    assert seen == [i / 25 for i in reversed(range(25))]
+
+    streamed = [r["score"] async for r in repo.stream(fetch_size=7, order_by=("ts",), where=mine)]
+    assert streamed == [i / 25 for i in range(25)]
+    batches = [b async for b in repo.stream_columns(fetch_size=10, order_by=("ts",), where=mine)]
+    assert [len(b["score"]) for b in batches] == [10, 10, 5]
+    assert batches[0]["instrument_id"] == [inst["id"]] * 10
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from packages.common.db.metadata_reflect import reflect_all
+from packages.common.db.repositories.account import AccountRepository
+from packages.common.db.routing import (
+    ReplicaMonitor,
+    create_routing_sessionmaker,
+    is_pinned,
+    pin_to_primary,
+)
+from packages.common.db.session import create_read_engine, get_database_url
+
+# One local Postgres stands in for both: the replica engine is told apart by its
+# application_name and its read-only transactions.
+WHO = select(func.current_setting("application_name"))
+
+
+@pytest_asyncio.fixture
+async def replica(monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[AsyncEngine]:
+    monkeypatch.setenv("DATABASE_READ_URL", get_database_url())
+    eng = create_read_engine()
+    assert eng is not None
+    try:
+        yield eng
+    finally:
+        await eng.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_until_a_write(engine: AsyncEngine, replica: AsyncEngine) -> None:
+    md = await reflect_all(engine)
+    monitor = ReplicaMonitor(replica, max_lag_s=1.0)
+    assert await monitor.check() == 0.0 and monitor.usable
+    sessions = create_routing_sessionmaker(engine, replica, monitor)
+
+    async with sessions() as session:
+        assert (await session.execute(WHO)).scalar_one() == "vaayutrade-test-ro"
+        repo = AccountRepository(session, md.tables["account"])
+        acc = await repo.create({"broker": "ZERODHA", "product": "MIS", "api_key_ref": "k"})
+        assert is_pinned(session)
+        # read-your-writes: the uncommitted row is visible, from the primary
+        assert await repo.get(acc["id"]) is not None
+        assert (await session.execute(WHO)).scalar_one() == "vaayutrade-test"
+        await session.rollback()
+
+    async with sessions() as session:
+        assert not is_pinned(session)
+        monitor.update(5.0)  # lagging: reads fall back to the primary
+        assert (await session.execute(WHO)).scalar_one() == "vaayutrade-test"
+        monitor.update(0.0)
+        assert (await session.execute(WHO)).scalar_one() == "vaayutrade-test-ro"
+        pin_to_primary(session)
+        assert (await session.execute(WHO)).scalar_one() == "vaayutrade-test"
+
+
+@pytest.mark.asyncio
+async def test_replica_engine_is_read_only(replica: AsyncEngine) -> None:
+    async with replica.connect() as conn:
+        ro: str = (await conn.execute(text("SHOW default_transaction_read_only"))).scalar_one()
+    assert ro == "on"
+    monitor = ReplicaMonitor(replica, interval_s=0.01, stale_after_s=0.0)
+    assert not monitor.usable  # never checked
+    await monitor.check()
+    assert not monitor.usable  # checked, but already stale
+
+
+@pytest.mark.asyncio
+async def test_no_read_url(monkeypatch: pytest.MonkeyPatch, engine: AsyncEngine) -> None:
+    monkeypatch.delenv("DATABASE_READ_URL", raising=False)
+    assert create_read_engine() is None
+    async with create_routing_sessionmaker(engine)() as session:
+        assert (await session.execute(WHO)).scalar_one() == "vaayutrade-test"
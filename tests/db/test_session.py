@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from packages.common.db.session import (
+    PROFILES,
+    create_engine,
+    get_profile,
+    pool_metrics,
+    warm_up,
+)
+
+
+def test_profile_resolution(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("DB_ENGINE_PROFILE", raising=False)
+    monkeypatch.delenv("SQLALCHEMY_NULLPOOL_FOR_TESTS", raising=False)
+    assert get_profile().name == "test"
+    monkeypatch.setenv("SQLALCHEMY_NULLPOOL_FOR_TESTS", "0")
+    assert get_profile().name == "service"
+    monkeypatch.setenv("DB_ENGINE_PROFILE", "trading-daemon")
+    assert get_profile() is PROFILES["trading-daemon"]
+    with pytest.raises(ValueError):
+        get_profile("nope")
+    kwargs = PROFILES["trading-daemon"].engine_kwargs()
+    assert kwargs["pool_size"] == 4 and kwargs["max_overflow"] == 0
+    assert kwargs["connect_args"]["server_settings"]["statement_timeout"] == "2000"
+
+
+@pytest.mark.asyncio
+async def test_pooled_profile_settings_and_metrics() -> None:
+    engine = create_engine(profile="trading-daemon", pool_size=2, warm_connections=2)
+    try:
+        assert await warm_up(engine) == 2
+        metrics = pool_metrics(engine)
+        assert metrics is not None and metrics.connects == 2 and metrics.in_use == 0
+        async with engine.connect() as conn:
+            assert metrics.in_use == 1
+            name: str = (await conn.execute(text("SHOW application_name"))).scalar_one()
+            timeout: str = (await conn.execute(text("SHOW statement_timeout"))).scalar_one()
+        assert name == "vaayutrade-traderd" and timeout == "2s"
+        assert metrics.connects == 2  # served from the warm pool, no new handshake
+        assert metrics.checkouts == 3 and metrics.max_in_use == 2
+        assert set(metrics.snapshot()) >= {"wait_avg_ms", "wait_max_ms", "in_use"}
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_returns_every_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = create_engine(profile="trading-daemon", pool_size=3, warm_connections=3)
+    real = AsyncEngine.connect
+    calls = 0
+
+    def flaky(self: AsyncEngine) -> AsyncConnection:
+        nonlocal calls
+        calls += 1
+        if calls == 3:
+            raise OSError("connection refused")
+        return real(self)
+
+    monkeypatch.setattr(AsyncEngine, "connect", flaky)
+    try:
+        with pytest.raises(OSError, match="refused"):
+            await asyncio.wait_for(warm_up(engine), timeout=5)
+        metrics = pool_metrics(engine)
+        assert metrics is not None and metrics.connects == 2 and metrics.in_use == 0
+    finally:
+        await engine.dispose()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from packages.common.db.metadata_reflect import reflect_all
+from packages.common.db.repositories.account import AccountRepository
+from packages.common.db.repositories.base import BaseRepository
+from packages.common.db.repositories.instrument import InstrumentRepository
+from packages.common.db.repositories.order import OrderRepository
+from packages.common.db.repositories.upsert import greatest, newer
+
+
+async def _account_and_instrument(db_session: AsyncSession, engine: AsyncEngine) -> tuple[int, int]:
+    md = await reflect_all(engine)
+    acc = await AccountRepository(db_session, md.tables["account"]).create(
+        {"broker": "ZERODHA", "product": "MIS", "api_key_ref": "k"}
+    )
+    ins = await InstrumentRepository(db_session, md.tables["instrument"]).create(
+        {"token": 4321, "symbol": "TCS", "exchange": "NSE", "tick_size": "0.05", "lot_size": 1}
+    )
+    return acc["id"], ins["id"]
+
+
+@pytest.mark.asyncio
+async def test_postbacks_are_idempotent_and_never_regress(
+    db_session: AsyncSession, engine: AsyncEngine
+) -> None:
+    md = await reflect_all(engine)
+    account_id, instrument_id = await _account_and_instrument(db_session, engine)
+    repo = OrderRepository(db_session, md.tables["order"])
+    t0 = datetime(2024, 1, 2, 9, 15, tzinfo=UTC)
+
+    def postback(broker_id: str, status: str, minute: int, **extra: object) -> dict[str, object]:
+        return {
+            "account_id": account_id,
+            "instrument_id": instrument_id,
+            "client_id": f"cid-{broker_id}",
+            "broker_order_id": broker_id,
+            "side": "BUY",
+            "type": "LIMIT",
+            "qty": 10,
+            "status": status,
+            "rejection_reason": extra.get("reason"),
+            "updated_at": t0 + timedelta(minutes=minute),
+        }
+
+    # B1 arrives twice in one batch, out of order; B2 is new
+    first = await repo.apply_postbacks(
+        [postback("B1", "FILLED", 2), postback("B1", "OPEN", 1), postback("B2", "OPEN", 1)]
+    )
+    assert first.outcomes == ["inserted", "inserted", "inserted"]
+    assert first.inserted == 3 and len(first.rows) == 2
+    b1 = await repo.get_by_client_id("cid-B1")
+    assert b1 and b1["status"] == "FILLED" and b1["updated_at"] == t0 + timedelta(minutes=2)
+
+    # replay (skipped), stale status (skipped), progress and a late terminal state
+    second = await repo.apply_postbacks(
+        [
+            postback("B1", "FILLED", 2),
+            postback("B1", "PARTIALLY_FILLED", 1),
+            postback("B2", "CANCELLED", 3, reason="user"),
+            postback("B2", "REJECTED", 4, reason="rms"),
+            postback("B3", "NEW", 0),
+        ]
+    )
+    assert second.outcomes == ["skipped", "skipped", "updated", "updated", "inserted"]
+    b2 = await repo.get_by_client_id("cid-B2")
+    assert b2 and b2["status"] == "CANCELLED"  # first terminal state sticks
+    assert b2["rejection_reason"] == "user" and b2["updated_at"] == t0 + timedelta(minutes=4)
+
+    again = await repo.apply_postbacks([postback("B2", "REJECTED", 4, reason="rms")])
+    assert again.outcomes == ["skipped"] and again.rows == []
+
+
+@pytest.mark.asyncio
+async def test_upsert_generic_rules_and_do_nothing(
+    db_session: AsyncSession, engine: AsyncEngine
+) -> None:
+    md = await reflect_all(engine)
+    account_id, instrument_id = await _account_and_instrument(db_session, engine)
+    order = await OrderRepository(db_session, md.tables["order"]).create(
+        {
+            "account_id": account_id,
+            "instrument_id": instrument_id,
+            "client_id": "cid-x",
+            "side": "BUY",
+            "type": "MARKET",
+            "qty": 10,
+            "status": "OPEN",
+        }
+    )
+    ts = datetime(2024, 1, 2, 9, 16, tzinfo=UTC)
+    fills = BaseRepository(db_session, md.tables["execution"])
+
+    def fill(trade_id: str | None, qty: int) -> dict[str, object]:
+        return {"order_id": order["id"], "ts": ts, "qty": qty, "price": "10", "trade_id": trade_id}
+
+    res = await fills.upsert_many(
+        [fill("T1", 4), fill("T1", 4), fill(None, 1)],
+        "uq_execution__trade_id",
+        on_conflict="nothing",
+    )
+    assert res.outcomes == ["inserted", "inserted", "inserted"]
+    res = await fills.upsert_many(
+        [fill("T1", 4), fill("T2", 6)], "uq_execution__trade_id", on_conflict="nothing"
+    )
+    assert res.outcomes == ["skipped", "inserted"]
+
+    # a re-postback of the same fill stamped with another time is still that fill
+    later = ts + timedelta(seconds=3)
+    res = await fills.upsert_many(
+        [fill("T1", 4) | {"ts": later}], "uq_execution__trade_id", on_conflict="nothing"
+    )
+    assert res.outcomes == ["skipped"]
+
+    # larger quantity wins, price follows the later trade time
+    res = await fills.upsert_many(
+        [fill("T2", 3) | {"price": "11"}, fill("T1", 5) | {"price": "12"}],
+        "uq_execution__trade_id",
+        {"qty": greatest(), "price": newer("ts")},
+    )
+    assert res.outcomes == ["updated", "updated"]
+    got = {r["trade_id"]: (r["qty"], r["price"]) for r in res.rows}
+    assert got == {"T2": (6, Decimal("11")), "T1": (5, Decimal("12"))}
+
+    res = await fills.upsert_many(
+        [fill("T1", 5) | {"ts": later, "price": "13"}],
+        "uq_execution__trade_id",
+        {"qty": greatest(), "price": newer("ts")},
+    )
+    assert res.outcomes == ["updated"] and res.rows[0]["price"] == Decimal("13")
+    execution = md.tables["execution"]
+    n = await db_session.scalar(
+        select(func.count()).select_from(execution).where(execution.c.trade_id == "T1")
+    )
+    assert n == 1
+
+    with pytest.raises(ValueError):
+        await fills.upsert_many([fill("T3", 1)], "no_such_index")
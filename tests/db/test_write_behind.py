@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import Table, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from packages.common.db.metadata_reflect import reflect_all
+from packages.common.db.repositories.instrument import InstrumentRepository
+from packages.common.db.write_behind import (
+    WriteBehindWriter,
+    WriteSink,
+    alert_sink,
+    signal_sink,
+)
+
+T0 = datetime(2025, 8, 1, 3, 45, tzinfo=UTC)
+
+
+def _signal(i: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid4(),
+        ts=T0 + timedelta(seconds=i),
+        symbol="WB",
+        score=i / 10,
+        horizon=10,
+        side="BUY" if i % 2 else "SELL",
+        conf=0.6,
+        features_ref=None,
+    )
+
+
+async def _setup(
+    db_session: AsyncSession, engine: AsyncEngine
+) -> tuple[async_sessionmaker[AsyncSession], Table, WriteSink]:
+    md = await reflect_all(engine)
+    inst = await InstrumentRepository(db_session, md.tables["instrument"]).create(
+        {"token": 555, "symbol": "WB", "tick_size": "0.05"}
+    )
+    # writer sessions share the test transaction; each write runs in a savepoint
+    conn = await db_session.connection()
+    maker = async_sessionmaker(bind=conn, join_transaction_mode="create_savepoint")
+    table = md.tables["signal"]
+    return maker, table, signal_sink(table, {"WB": inst["id"]}.get)
+
+
+async def _count(db_session: AsyncSession, table: Table) -> int:
+    res = await db_session.execute(select(func.count()).select_from(table))
+    return int(res.scalar_one())
+
+
+@pytest.mark.asyncio
+async def test_batches_by_size_and_flushes_on_close(
+    db_session: AsyncSession, engine: AsyncEngine
+) -> None:
+    maker, table, sink = await _setup(db_session, engine)
+    before = await _count(db_session, table)
+    writer = WriteBehindWriter(maker, {"signal": sink}, max_batch=3, max_age_s=60)
+    async with writer:
+        for i in range(7):
+            assert writer.offer("signal", _signal(i))
+        for _ in range(100):
+            if writer.metrics["signal"].written == 6:
+                break
+            await asyncio.sleep(0.01)
+        m = writer.metrics["signal"]
+        assert (m.written, m.flushes, m.depth) == (6, 2, 1)
+    assert writer.metrics["signal"].written == 7
+    assert await _count(db_session, table) == before + 7
+    snap = writer.metrics["signal"].snapshot()
+    assert snap["flushes"] == 3 and snap["flush_max_ms"] >= snap["flush_avg_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_overflow_policies(
+    db_session: AsyncSession, engine: AsyncEngine, tmp_path: Path
+) -> None:
+    maker, table, sink = await _setup(db_session, engine)
+    before = await _count(db_session, table)
+
+    drop = WriteBehindWriter(maker, {"signal": sink}, max_batch=2, max_queue=2)
+    sigs = [_signal(i) for i in range(3)]
+    for s in sigs:
+        assert drop.offer("signal", s)
+    assert drop.metrics["signal"].dropped == 1
+    assert [s.id for _, s in drop._queues["signal"]] == [sigs[1].id, sigs[2].id]
+
+    block = WriteBehindWriter(maker, {"signal": sink}, max_batch=2, max_queue=2, overflow="block")
+    assert block.offer("signal", sigs[0]) and block.offer("signal", sigs[1])
+    assert not block.offer("signal", sigs[2])
+    block.start()
+    await asyncio.wait_for(block.put("signal", sigs[2]), timeout=5)
+    await block.close()
+    assert block.metrics["signal"].written == 3
+
+    spill = WriteBehindWriter(
+        maker, {"signal": sink}, max_batch=2, max_queue=2, overflow="spill", spill_dir=tmp_path
+    )
+    for i in range(3, 6):
+        assert spill.offer("signal", _signal(i))
+    assert spill.metrics["signal"].spilled == 1 and spill.spill_path("signal").exists()
+    await spill.close()
+    assert await spill.replay_spill("signal") == 1
+    assert not spill.spill_path("signal").exists()
+    assert await _count(db_session, table) == before + 6
+
+
+@pytest.mark.asyncio
+async def test_failed_writes_are_spilled_not_raised(
+    db_session: AsyncSession, engine: AsyncEngine, tmp_path: Path
+) -> None:
+    md = await reflect_all(engine)
+    conn = await db_session.connection()
+    maker = async_sessionmaker(bind=conn, join_transaction_mode="create_savepoint")
+    writer = WriteBehindWriter(
+        maker,
+        {"alert": alert_sink(md.tables["alert"])},
+        max_batch=10,
+        spill_dir=tmp_path,
+        max_retries=1,
+        retry_backoff_s=0,
+    )
+    bad = SimpleNamespace(ts=T0, type="x", severity="NOPE", payload={"message": "m"})
+    good = SimpleNamespace(ts=T0, type="feed", severity="ERROR", payload={"message": "stale"})
+    writer.offer("alert", bad)
+    assert await writer.flush() == 0
+    m = writer.metrics["alert"]
+    # refused by the database on its own merits: not retried, not spilled for replay
+    assert (m.failures, m.refused, m.spilled, m.written) == (1, 1, 0, 0) and m.last_error
+    assert json.loads(writer.refused_path("alert").read_text())["severity"] == "NOPE"
+
+    writer.offer("alert", good)
+    assert await writer.flush() == 1
+    res = await db_session.execute(
+        select(md.tables["alert"].c.severity).where(md.tables["alert"].c.message == "stale")
+    )
+    assert res.scalar_one() == "CRITICAL"
+
+
+@pytest.mark.asyncio
+async def test_bad_rows_are_isolated_from_their_batch(
+    db_session: AsyncSession, engine: AsyncEngine, tmp_path: Path
+) -> None:
+    maker, table, sink = await _setup(db_session, engine)
+    before = await _count(db_session, table)
+    writer = WriteBehindWriter(maker, {"signal": sink}, max_batch=10, spill_dir=tmp_path)
+    sigs = [_signal(i) for i in range(8)]
+    sigs[5].id, sigs[5].ts = sigs[2].id, sigs[2].ts  # primary key clash inside the batch
+    broken = SimpleNamespace(id=uuid4())  # to_row() raises AttributeError
+    for s in [*sigs[:4], broken, *sigs[4:]]:
+        writer.offer("signal", s)
+    assert await writer.flush() == 7
+    m = writer.metrics["signal"]
+    assert (m.written, m.invalid, m.refused, m.spilled) == (7, 1, 1, 0)
+    assert await _count(db_session, table) == before + 7
+    (refused,) = writer.refused_path("signal").read_text().splitlines()
+    assert json.loads(refused)["id"] == str(sigs[2].id)
+
+
+@pytest.mark.asyncio
+async def test_replay_reads_json_lines_and_quarantines_bad_rows(
+    db_session: AsyncSession, engine: AsyncEngine, tmp_path: Path
+) -> None:
+    maker, table, sink = await _setup(db_session, engine)
+    before = await _count(db_session, table)
+    writer = WriteBehindWriter(maker, {"signal": sink}, spill_dir=tmp_path)
+    good, dup = _signal(1), _signal(2)
+    writer._spill("signal", [sink.to_row(good), sink.to_row(dup), sink.to_row(dup)])
+    with open(writer.spill_path("signal"), "a") as f:
+        f.write('{"id": "not-a-uuid"}\n[1, 2]\n')
+    lines = writer.spill_path("signal").read_text().splitlines()
+    assert json.loads(lines[0])["ts"] == good.ts.isoformat()
+
+    assert await writer.replay_spill("signal") == 2
+    assert await _count(db_session, table) == before + 2
+    assert len(writer.refused_path("signal").read_text().splitlines()) == 3
+    assert writer.metrics["signal"].refused == 3
+    assert not writer.spill_path("signal").exists()
+    assert await writer.replay_spill("signal") == 0